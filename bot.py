@@ -1171,6 +1171,7 @@ Automatski ste dodeljeni odeljenju Uprave sa punim pristupom.
                 query.data == "my_laundry_tasks" or
                 query.data == "my_restaurant_tasks" or
                 query.data == "my_delivery_tasks" or
+                query.data == "my_delivery_tasks_more" or
                 query.data == "my_accounting_tasks" or
                 query.data == "my_repair_tasks" or
                 query.data == "back_to_employee_menu" or
@@ -4226,8 +4227,7 @@ Automatski ste dodeljeni odeljenju Uprave sa punim pristupom.
             
             # Admin Event - Set Event Status
             elif query.data.startswith("admin_event_status_set_"):
-                from database import get_event_by_id, clear_event_notifications
-                from datetime import datetime
+                from database import get_event_by_id, clear_event_notifications, update_event_status
                 
                 # Parse callback data: admin_event_status_set_{event_id}_{new_status}
                 callback_data = query.data.replace("admin_event_status_set_", "")
@@ -4244,12 +4244,7 @@ Automatski ste dodeljeni odeljenju Uprave sa punim pristupom.
                 
                 # Update status in database
                 print(f"🔄 Changing event {event_id} status to: {new_status}")
-                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                self.db.execute_query("""
-                    UPDATE tbl_hotel_events 
-                    SET status = %s, updated_at = %s
-                    WHERE id = %s
-                """, (new_status, now, event_id))
+                update_event_status(self.db, event_id, new_status)
                 print(f"✅ Event {event_id} status updated successfully")
                 
                 # If event is cancelled or completed, clear all notification records
@@ -4954,7 +4949,7 @@ Automatski ste dodeljeni odeljenju Uprave sa punim pristupom.
                     )
             
             elif query.data == "event_skip_notes":
-                from database import create_event, create_event_history, create_event_task
+                from database import create_event, create_event_history_bulk, create_event_task
                 from templates import auto_assign_event_tasks
                 
                 lang = get_user_language(telegram_user_id, self.db)
@@ -4973,8 +4968,7 @@ Automatski ste dodeljeni odeljenju Uprave sa punim pristupom.
                     if event_id:
                         # Create event history records for each department in template
                         departments = template.get('departments', ['Reception', 'Kitchen', 'Housekeeping'])
-                        for dept in departments:
-                            create_event_history(self.db, event_id, dept, 'T-2')
+                        create_event_history_bulk(self.db, [(event_id, dept, 'T-2') for dept in departments])
                         
                         # Use AI-based task assignment
                         event_type = event_data.get('event_type', 'custom')
@@ -12693,11 +12687,19 @@ Izaberite novi kapacitet (1-20):"""
             # ============================================================
             
             # My delivery tasks (for drivers)
-            elif query.data == "my_delivery_tasks":
+            elif query.data in ("my_delivery_tasks", "my_delivery_tasks_more"):
                 telegram_user_id = query.from_user.id
                 
-                from database import get_delivery_tasks_by_assignee
-                tasks = get_delivery_tasks_by_assignee(self.db, str(telegram_user_id))
+                from database import get_delivery_tasks_summary, count_delivery_tasks_by_assignee
+                
+                # Keyset pages: "more" continues after the last task shown
+                if query.data == "my_delivery_tasks":
+                    context.user_data.pop('driver_tasks_after', None)
+                after = context.user_data.get('driver_tasks_after')
+                per_page = 20
+                tasks = get_delivery_tasks_summary(self.db, str(telegram_user_id), limit=per_page + 1, after=after)
+                has_more = len(tasks) > per_page
+                tasks = tasks[:per_page]
                 
                 if not tasks:
                     text = f"{get_text('my_tasks_driver_title', lang)}\n\n"
@@ -12707,12 +12709,13 @@ Izaberite novi kapacitet (1-20):"""
                     await query.edit_message_text(text, reply_markup=reply_markup)
                     return
                 
-                text = f"{get_text('my_tasks_driver_title', lang)} ({len(tasks)})\n\n"
+                total = count_delivery_tasks_by_assignee(self.db, str(telegram_user_id))
+                text = f"{get_text('my_tasks_driver_title', lang)} ({total})\n\n"
                 text += "━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
                 
                 keyboard = []
                 for task in tasks:
-                    task_id, description, due_date, due_time, status, assigned_at, accepted_at, completed_at, assigned_by_name = task
+                    task_id, description, status = task['id'], task['description'], task['status']
                     
                     status_emoji = {"Pending": "📋", "Accepted": "🔄"}.get(status, "❓")
                     
@@ -12720,6 +12723,11 @@ Izaberite novi kapacitet (1-20):"""
                     button_text = f"{status_emoji} #{task_id} - {short_desc}"
                     keyboard.append([InlineKeyboardButton(button_text, callback_data=f"driver_task_{task_id}")])
                 
+                if has_more:
+                    last = tasks[-1]
+                    context.user_data['driver_tasks_after'] = (last['status'], last['assigned_at'], last['id'])
+                    keyboard.append([InlineKeyboardButton(get_text('next', lang) + " ▶️", callback_data="my_delivery_tasks_more")])
+                
                 keyboard.append([InlineKeyboardButton(f"🔙 {get_text('back', lang)}", callback_data="emp_work_menu")])
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 await query.edit_message_text(text, reply_markup=reply_markup)
@@ -12762,18 +12770,18 @@ Izaberite novi kapacitet (1-20):"""
             elif query.data.startswith("driver_accept_"):
                 task_id = int(query.data.replace("driver_accept_", ""))
                 
-                from database import accept_delivery_task, get_delivery_task_by_id
+                from database import accept_delivery_task, get_delivery_task_status
                 
                 # Check current task status
-                task = get_delivery_task_by_id(self.db, task_id)
-                if not task:
+                task_status = get_delivery_task_status(self.db, task_id)
+                if not task_status:
                     try:
                         await query.answer(f"❌ {get_text('task_not_found', lang)}", show_alert=True)
                     except:
                         pass
                     return
                 
-                if task['status'] == 'Accepted':
+                if task_status == 'Accepted':
                     try:
                         await query.answer(get_text('already_accepted_task', lang), show_alert=True)
                     except:
@@ -12781,7 +12789,7 @@ Izaberite novi kapacitet (1-20):"""
                     context.user_data['callback_query_data'] = 'emp_work_menu'
                     await self.button_handler(update, context)
                     return
-                elif task['status'] == 'Completed':
+                elif task_status == 'Completed':
                     try:
                         await query.answer(get_text('already_completed_task', lang), show_alert=True)
                     except:
@@ -12789,9 +12797,9 @@ Izaberite novi kapacitet (1-20):"""
                     context.user_data['callback_query_data'] = 'emp_work_menu'
                     await self.button_handler(update, context)
                     return
-                elif task['status'] != 'Pending':
+                elif task_status != 'Pending':
                     try:
-                        await query.answer(get_text('task_already_status', lang).format(status=task['status']), show_alert=True)
+                        await query.answer(get_text('task_already_status', lang).format(status=task_status), show_alert=True)
                     except:
                         pass
                     context.user_data['callback_query_data'] = 'emp_work_menu'
@@ -12929,13 +12937,13 @@ Izaberite novi kapacitet (1-20):"""
             
             # Accounting Assignment - Step 1: Select accountant
             elif query.data == "emp_assign_accounting":
-                from database import get_accountants, create_accounting_tasks_table
+                from database import get_accountant_ids_names, create_accounting_tasks_table
                 lang = get_user_language(query.from_user.id, self.db)
                 
                 # Ensure table exists
                 create_accounting_tasks_table(self.db)
                 
-                accountants = get_accountants(self.db)
+                accountants = get_accountant_ids_names(self.db)
                 
                 if not accountants:
                     text = f"{get_text('assign_accounting_title', lang)}\n\n"
@@ -12957,16 +12965,9 @@ Izaberite novi kapacitet (1-20):"""
                 
                 keyboard = []
                 for acct in accountants:
-                    emp_id, name, dept, work_role = acct
-                    # Get telegram_user_id for this accountant
-                    acct_info = self.db.execute_query(
-                        "SELECT telegram_user_id FROM tbl_employeer WHERE employee_id = %s",
-                        (emp_id,)
-                    )
-                    if acct_info:
-                        tg_id = acct_info[0][0]
-                        role_text = f" ({work_role})" if work_role else ""
-                        keyboard.append([InlineKeyboardButton(f"💰 {name}{role_text}", callback_data=f"acct_emp_{tg_id}")])
+                    tg_id, name, work_role = acct
+                    role_text = f" ({work_role})" if work_role else ""
+                    keyboard.append([InlineKeyboardButton(f"💰 {name}{role_text}", callback_data=f"acct_emp_{tg_id}")])
                 
                 keyboard.append([InlineKeyboardButton(get_text('back', lang), callback_data="emp_work_menu")])
                 reply_markup = InlineKeyboardMarkup(keyboard)
@@ -13246,9 +13247,8 @@ Izaberite novi kapacitet (1-20):"""
                 
                 keyboard = []
                 for task in tasks:
-                    # Query returns 14 columns: id, description, due_date, due_time, status, assigned_at, 
-                    # accepted_at, completed_at, assigned_by_name, category, amount, vendor_name, invoice_number, payment_method
-                    task_id, description, due_date, due_time, status, assigned_at, accepted_at, completed_at, assigned_by_name, category, amount, vendor_name, invoice_number, payment_method = task
+                    # Query returns 3 columns: id, description preview (first 60 chars), status
+                    task_id, description, status = task
                     
                     status_emoji = {"Pending": "📋", "Accepted": "🔄"}.get(status, "❓")
                     
@@ -20271,8 +20271,17 @@ Imate pun pristup svim funkcijama sistema."""
                         
                         report_notes = context.user_data.get('accounting_report', {}).get('notes', '')
                         
-                        if complete_accounting_task(self.db, task_id, report_notes, file_id, file_type):
-                            task = get_accounting_task_by_id(self.db, task_id)
+                        if not complete_accounting_task(self.db, task_id, report_notes, file_id, file_type):
+                            await update.message.reply_text(
+                                "❌ Greška pri završavanju zadatka",
+                                reply_markup=InlineKeyboardMarkup([[
+                                    InlineKeyboardButton("🔙 Nazad", callback_data="my_accounting_tasks")
+                                ]])
+                            )
+                            context.user_data.pop('awaiting_accounting_report_media', None)
+                            context.user_data.pop('accounting_report', None)
+                            return
+                        task = get_accounting_task_by_id(self.db, task_id)
                         
                         telegram_user_id = update.message.from_user.id
                         reporter_info = self.db.get_employee_info(telegram_user_id)
@@ -21644,7 +21653,7 @@ Dobićete obaveštenje kada bude potvrđena."""
             
             # ========== EVENT CREATION (Template-based 7 steps) ==========
             if context.user_data.get('creating_event'):
-                from database import create_event, create_event_history, create_event_task
+                from database import create_event, create_event_history_bulk, create_event_task
                 from templates import get_event_input_step, auto_assign_event_tasks
                 
                 lang = get_user_language(telegram_user_id, self.db)
@@ -21807,8 +21816,7 @@ Dobićete obaveštenje kada bude potvrđena."""
                     if event_id:
                         # Create event history records for each department in template
                         departments = template.get('departments', ['Reception', 'Kitchen', 'Housekeeping'])
-                        for dept in departments:
-                            create_event_history(self.db, event_id, dept, 'T-2')
+                        create_event_history_bulk(self.db, [(event_id, dept, 'T-2') for dept in departments])
                         
                         # Use AI-based task assignment
                         event_type = event_data.get('event_type', 'custom')
@@ -26041,8 +26049,8 @@ Izaberite odeljenje za novog zaposlenog:""",
         - Event Day: Critical mode - 07:00 or later, every 1 hour until READY confirmed
         """
         from database import (get_events_for_alarm, get_todays_events, get_event_history, 
-                              get_unconfirmed_event_history, create_event_history, get_event_by_id,
-                              should_send_alarm, update_alarm_sent_time)
+                              get_unconfirmed_event_history, create_event_history_bulk, get_event_by_id,
+                              departments_needing_alarm, release_alarm_claim)
         import asyncio
         from datetime import datetime, timedelta
         
@@ -26080,15 +26088,19 @@ Izaberite odeljenje za novog zaposlenog:""",
                     
                     # Get unconfirmed departments
                     unconfirmed = get_unconfirmed_event_history(self.db, event_id, 'T-2')
+                    # Departments whose last alarm is older than 6 hours (one query for all)
+                    due_depts = departments_needing_alarm(self.db, event_id, 'T-2',
+                                                          [dept for _, dept in unconfirmed], 21600)
                     
                     for dept_id, dept in unconfirmed:
-                        # Check if enough time has passed since last alarm (6 hours)
-                        if should_send_alarm(self.db, event_id, 'T-2', dept, 21600):
+                        if dept in due_depts:
                             sent_count = await self.send_event_alarm(event_id, dept, 'T-2', t2_notified_users[event_id])
                             if sent_count > 0:
-                                update_alarm_sent_time(self.db, event_id, 'T-2', dept)
                                 t2_alarm_count += sent_count
                                 print(f"📢 T-2 alarm sent: Event '{event_name}' to {dept} ({sent_count} users)")
+                            else:
+                                # Nobody was reached: retry on the next check
+                                release_alarm_claim(self.db, event_id, 'T-2', dept, due_depts[dept])
                 
                 if t2_alarm_count > 0:
                     print(f"✅ Sent {t2_alarm_count} T-2 alarm(s)")
@@ -26111,21 +26123,24 @@ Izaberite odeljenje za novog zaposlenog:""",
                     t1_depts = [h[2] for h in existing if h[3] == 'T-1']
                     departments = ['Reception', 'Kitchen', 'Housekeeping', 'Warehouse', 'Management']
                     
-                    for dept in departments:
-                        if dept not in t1_depts:
-                            create_event_history(self.db, event_id, dept, 'T-1')
+                    create_event_history_bulk(self.db, [(event_id, dept, 'T-1')
+                                                        for dept in departments if dept not in t1_depts])
                     
                     # Get unconfirmed departments
                     unconfirmed = get_unconfirmed_event_history(self.db, event_id, 'T-1')
+                    # Departments whose last alarm is older than 3 hours (one query for all)
+                    due_depts = departments_needing_alarm(self.db, event_id, 'T-1',
+                                                          [dept for _, dept in unconfirmed], 10800)
                     
                     for dept_id, dept in unconfirmed:
-                        # Check if enough time has passed since last alarm (3 hours)
-                        if should_send_alarm(self.db, event_id, 'T-1', dept, 10800):
+                        if dept in due_depts:
                             sent_count = await self.send_event_alarm(event_id, dept, 'T-1', t1_notified_users[event_id])
                             if sent_count > 0:
-                                update_alarm_sent_time(self.db, event_id, 'T-1', dept)
                                 t1_alarm_count += sent_count
                                 print(f"🔔 T-1 alarm sent: Event '{event_name}' to {dept} ({sent_count} users)")
+                            else:
+                                # Nobody was reached: retry on the next check
+                                release_alarm_claim(self.db, event_id, 'T-1', dept, due_depts[dept])
                 
                 if t1_alarm_count > 0:
                     print(f"✅ Sent {t1_alarm_count} T-1 alarm(s)")
@@ -26153,22 +26168,25 @@ Izaberite odeljenje za novog zaposlenog:""",
                         day_depts = [h[2] for h in existing if h[3] == 'event_day']
                         departments = ['Reception', 'Kitchen', 'Housekeeping', 'Warehouse', 'Management']
                         
-                        for dept in departments:
-                            if dept not in day_depts:
-                                create_event_history(self.db, event_id, dept, 'event_day')
+                        create_event_history_bulk(self.db, [(event_id, dept, 'event_day')
+                                                            for dept in departments if dept not in day_depts])
                         
                         # Get unconfirmed departments
                         unconfirmed = get_unconfirmed_event_history(self.db, event_id, 'event_day')
                         unconfirmed_depts = []
+                        # Departments whose last alarm is older than 1 hour (one query for all)
+                        due_depts = departments_needing_alarm(self.db, event_id, 'event_day',
+                                                              [dept for _, dept in unconfirmed], 3600)
                         
                         for dept_id, dept in unconfirmed:
-                            # Check if enough time has passed since last alarm (1 hour)
-                            if should_send_alarm(self.db, event_id, 'event_day', dept, 3600):
+                            if dept in due_depts:
                                 sent_count = await self.send_event_alarm(event_id, dept, 'event_day', today_notified_users[event_id])
                                 if sent_count > 0:
-                                    update_alarm_sent_time(self.db, event_id, 'event_day', dept)
                                     today_alarm_count += sent_count
                                     print(f"🚨 Critical alarm sent: Event '{event_name}' to {dept} ({sent_count} users)")
+                                else:
+                                    # Nobody was reached: retry on the next check
+                                    release_alarm_claim(self.db, event_id, 'event_day', dept, due_depts[dept])
                                 
                                 # Track for escalation if after 10:00
                                 if current_hour >= 10:
@@ -1,10 +1,24 @@
+import csv
+import io
+import logging
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
+import psycopg2.pool
 import os
 import sys
+import threading
+import time
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
 from typing import Optional
 import os
 
+logger = logging.getLogger(__name__)
+
 class DatabaseManager:
     """Hotel Management Database Manager Class"""
     
@@ -18,6 +32,7 @@ class DatabaseManager:
         - DB_NAME
         - DB_USER
         - DB_PASSWORD
+        - DB_POOL_MIN / DB_POOL_MAX (connection pool size, default 2/10)
         """
         self.db_host = os.getenv('DB_HOST', 'localhost')
         self.db_port = os.getenv('DB_PORT', '5432')
@@ -26,6 +41,12 @@ class DatabaseManager:
         self.db_password = os.getenv('DB_PASSWORD', 'postgres')
         self.connection: Optional[psycopg2.extensions.connection] = None
         self.cursor: Optional[psycopg2.extensions.cursor] = None
+        self.pool_min = int(os.getenv('DB_POOL_MIN', '2'))
+        self.pool_max = int(os.getenv('DB_POOL_MAX', '10'))
+        self.pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        # Names of server-side prepared statements per connection; weak keys, so an
+        # entry goes away with its connection and is never inherited by a new one
+        self._prepared_statements = weakref.WeakKeyDictionary()
     
     def connect(self) -> bool:
         """
@@ -34,6 +55,7 @@ class DatabaseManager:
         Returns:
             Connection success status
         """
+        global _repair_priority_rank_missing
         try:
             self.connection = psycopg2.connect(
                 host=self.db_host,
@@ -43,6 +65,21 @@ class DatabaseManager:
                 password=self.db_password
             )
             self.cursor = self.connection.cursor(cursor_factory=psycopg2.extras.DictCursor)
+            self.pool = psycopg2.pool.ThreadedConnectionPool(
+                self.pool_min,
+                self.pool_max,
+                host=self.db_host,
+                port=self.db_port,
+                database=self.db_name,
+                user=self.db_user,
+                password=self.db_password
+            )
+            # Prepared statements live in the server session, so a new connection starts empty
+            self._prepared_statements = weakref.WeakKeyDictionary()
+            # Schema checks are cached per process; a fresh connection may point at another database
+            _known_tables.clear()
+            _existing_tables.clear()
+            _repair_priority_rank_missing = False
             print(f"Database connection successful: {self.db_name}@{self.db_host}:{self.db_port}")
             return True
         except psycopg2.Error as e:
@@ -51,8 +88,12 @@ class DatabaseManager:
     
     def disconnect(self):
         """Close database connection"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
         if self.connection:
             self.connection.close()
+            self._prepared_statements = weakref.WeakKeyDictionary()
             print("Database connection closed")
     
     def execute_query(self, query: str, params: tuple = ()):
@@ -76,6 +117,74 @@ class DatabaseManager:
             print(f"Query execution error: {e}")
             return None
     
+    @contextmanager
+    def pooled_cursor(self, cursor_factory=None, name: str = None, autocommit: bool = False):
+        """
+        Borrow a connection from the pool and yield a cursor on it
+        
+        Commits when the block exits normally, rolls back on exception and
+        always hands the connection back to the pool.
+        
+        Args:
+            cursor_factory: Optional psycopg2 cursor class (e.g. RealDictCursor)
+            name: Optional name to get a server-side cursor that fetches rows
+                  in batches of cursor.itersize instead of all at once
+            autocommit: Run each statement on its own, without the BEGIN/COMMIT
+                        envelope; for single-statement reads (not with name)
+        """
+        conn = self.pool.getconn()
+        if autocommit:
+            conn.autocommit = True
+        try:
+            with conn.cursor(name=name, cursor_factory=cursor_factory) as cur:
+                yield cur
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if not conn.closed and autocommit:
+                conn.autocommit = False
+            self.pool.putconn(conn, close=bool(conn.closed))
+    
+    def dict_cursor(self):
+        """
+        Create a cursor that returns rows as dicts keyed by column name
+        
+        Returns:
+            psycopg2 RealDictCursor on the current connection
+        """
+        return self.connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    
+    def execute_prepared(self, name: str, query: str, params: tuple = (), cursor=None):
+        """
+        Execute a named server-side prepared statement
+        
+        The statement is PREPAREd once per connection on first use; later calls
+        only send EXECUTE, so PostgreSQL skips parsing and planning.
+        
+        Args:
+            name: Prepared statement name
+            query: SQL query using $1, $2, ... placeholders
+            params: Query parameters (in placeholder order)
+            cursor: Cursor to execute on (defaults to the shared cursor)
+            
+        Returns:
+            The cursor, ready for fetchone()/fetchall()
+        """
+        cursor = cursor or self.cursor
+        prepared = self._prepared_statements.setdefault(cursor.connection, set())
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {query}")
+            prepared.add(name)
+        if params:
+            placeholders = ', '.join(['%s'] * len(params))
+            cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+        return cursor
+    
     def create_tables(self):
         """Create basic tables"""
         try:
@@ -108,6 +217,13 @@ class DatabaseManager:
                 )
             """)
             
+            # Expression index for the case-insensitive department lookups
+            # (get_drivers, get_technical_employees, get_restaurant_employees, get_employees_by_department_name, ...)
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_employeer_department_lower
+                ON tbl_employeer (LOWER(department))
+            """)
+            
             # Room table
             self.cursor.execute("""
                 CREATE TABLE IF NOT EXISTS rooms (
@@ -366,6 +482,28 @@ class DatabaseManager:
                 )
             """)
             
+            # Borrowed-vehicle listings filter on status and show the newest first
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vehicle_usage_status
+                ON tbl_vehicle_usage (status, borrowed_at DESC)
+            """)
+            # Probed per vehicle by the "is it borrowed?" anti-join in get_available_vehicles
+            # and the active-usage lookup; only the few Borrowed rows are indexed
+            self.cursor.execute("DROP INDEX IF EXISTS idx_vehicle_usage_status_vid")
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vehicle_usage_borrowed_vid
+                ON tbl_vehicle_usage (vehicle_id) WHERE status = 'Borrowed'
+            """)
+            # Usage history pages (keyset on borrowed_at), overall and per vehicle
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vehicle_usage_borrowed_at
+                ON tbl_vehicle_usage (borrowed_at DESC, id DESC)
+            """)
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vehicle_usage_vid_borrowed
+                ON tbl_vehicle_usage (vehicle_id, borrowed_at DESC)
+            """)
+            
             # Clean history table
             self.cursor.execute("""
                 CREATE TABLE IF NOT EXISTS tbl_clean_history (
@@ -541,6 +679,13 @@ class DatabaseManager:
                     CHECK (alarm_type IN ('T-2', 'T-1', 'event_day'))
                 )
             """)
+            # Alarm scheduler lookups by (event, alarm, department); the INCLUDE list
+            # answers the sent-time and confirmation checks from the index alone
+            self.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_event_history_lookup
+                ON tbl_hotel_event_history (event_id, alarm_type, department)
+                INCLUDE (id, alarm_sent_at, acknowledged, confirmed, ready_confirmed)
+            """)
             
             # Hotel Event User Notifications table (tracking individual user notifications)
             self.cursor.execute("""
@@ -1067,6 +1212,7 @@ class DatabaseManager:
             """, (new_id, telegram_user_id, name, department, work_role))
             
             self.connection.commit()
+            clear_cache_group('employees')
             print(f"✅ Employee registration successful: {new_id} - {name} ({department}) - Role: {work_role}")
             return new_id
         except psycopg2.Error as e:
@@ -1108,6 +1254,7 @@ class DatabaseManager:
             self.cursor.execute(query, tuple(params))
             
             self.connection.commit()
+            clear_cache_group('employees')
             print(f"✅ Employee updated: {employee_id}")
             return True
         except psycopg2.Error as e:
@@ -1127,6 +1274,7 @@ class DatabaseManager:
         try:
             self.cursor.execute("DELETE FROM tbl_employeer WHERE employee_id = %s", (employee_id,))
             self.connection.commit()
+            clear_cache_group('employees')
             print(f"✅ Employee deleted: {employee_id}")
             return True
         except psycopg2.Error as e:
@@ -3271,6 +3419,7 @@ class DatabaseManager:
                 (name, telegram_user_id)
             )
             self.connection.commit()
+            clear_cache_group('employees')
             return True
         except psycopg2.Error as e:
             print(f"Name update error: {e}")
@@ -3293,6 +3442,7 @@ class DatabaseManager:
                 (department, telegram_user_id)
             )
             self.connection.commit()
+            clear_cache_group('employees')
             return True
         except psycopg2.Error as e:
             print(f"Department update error: {e}")
@@ -3315,6 +3465,7 @@ class DatabaseManager:
                 (work_role, telegram_user_id)
             )
             self.connection.commit()
+            clear_cache_group('employees')
             return True
         except psycopg2.Error as e:
             print(f"Work role update error: {e}")
@@ -3895,6 +4046,103 @@ def get_database_connection() -> DatabaseManager:
     return db_manager
 
 
+# ==================== Result Caching ====================
+
+_cache_groups: dict = {}
+
+# Tables (and helper functions) already created/migrated by this process
+_known_tables: set = set()
+
+# Tables seen to exist by read paths that only need to know they are there
+_existing_tables: set = set()
+
+# tbl_repair_tasks has no generated priority_rank column (PostgreSQL < 12)
+_repair_priority_rank_missing = False
+
+
+def _ttl_cache(ttl: int, maxsize: int = 128, group: str = None):
+    """
+    Cache a db accessor's result in-process for `ttl` seconds
+    
+    The DatabaseManager argument is not part of the cache key. Empty results
+    are not cached, so a failed query is retried on the next call. The wrapped
+    function gets a cache_clear() method; `group` registers it for
+    clear_cache_group().
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(db, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry and entry[0] > now:
+                    return entry[1]
+            result = func(db, *args, **kwargs)
+            if result:
+                with lock:
+                    if len(cache) >= maxsize:
+                        cache.clear()
+                    cache[key] = (now + ttl, result)
+            return result
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_clear = cache_clear
+        if group:
+            _cache_groups.setdefault(group, []).append(wrapper)
+        return wrapper
+    return decorator
+
+
+def clear_cache_group(group: str):
+    """Invalidate every cached accessor registered under `group`"""
+    for func in _cache_groups.get(group, []):
+        func.cache_clear()
+
+
+# ==================== Schema Migrations ====================
+
+def apply_migration(cur, version: str, statements: list) -> bool:
+    """
+    Run schema change statements once per database
+    
+    Applied versions are recorded in schema_migrations. The version row is
+    inserted in the same transaction as the statements, so a failed migration
+    is rolled back together with its marker and retried on the next start.
+    
+    Args:
+        cur: Cursor to run on (caller commits)
+        version: Unique migration name, e.g. '0001_delivery_tasks_indexes'
+        statements: SQL statements to execute in order
+        
+    Returns:
+        True if the migration ran now, False if it was already applied
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cur.execute("""
+        INSERT INTO schema_migrations (version) VALUES (%s)
+        ON CONFLICT (version) DO NOTHING
+        RETURNING version
+    """, (version,))
+    if cur.fetchone() is None:
+        return False
+    for statement in statements:
+        cur.execute(statement)
+    print(f"✅ Migration applied: {version}")
+    return True
+
+
 # ==================== Room Management Functions ====================
 
 def get_all_floors(db: DatabaseManager) -> list:
@@ -6320,49 +6568,89 @@ def get_restaurant_dashboard_view(db: DatabaseManager) -> str:
 
 def create_delivery_tasks_table(db: DatabaseManager):
     """Create the delivery tasks table for driver assignments"""
+    if 'tbl_delivery_tasks' in _known_tables:
+        return True
     try:
-        db.cursor.execute("DROP TABLE IF EXISTS tbl_delivery_tasks")
-        db.cursor.execute("""
-            CREATE TABLE tbl_delivery_tasks (
-                id SERIAL PRIMARY KEY,
-                assignee_id TEXT NOT NULL,
-                assignee_name TEXT NOT NULL,
-                description TEXT NOT NULL,
-                due_date TEXT,
-                due_time TEXT,
-                attachment_file_id TEXT,
-                attachment_type TEXT,
-                status TEXT DEFAULT 'Pending',
-                assigned_by TEXT NOT NULL,
-                assigned_by_name TEXT NOT NULL,
-                assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                accepted_at TIMESTAMP,
-                completed_at TIMESTAMP,
-                report_notes TEXT,
-                report_media_file_id TEXT,
-                report_media_type TEXT
-            )
-        """)
-        db.connection.commit()
-        print("✅ tbl_delivery_tasks table ready")
+        with db.pooled_cursor() as cur:
+            apply_migration(cur, '0002_delivery_status_type', [
+                "CREATE TYPE delivery_status AS ENUM ('Pending', 'Accepted', 'Completed', 'Cancelled')",
+            ])
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS tbl_delivery_tasks (
+                    id SERIAL PRIMARY KEY,
+                    assignee_id TEXT NOT NULL,
+                    assignee_name TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    due_date TEXT,
+                    due_time TEXT,
+                    attachment_file_id TEXT,
+                    attachment_type TEXT,
+                    status delivery_status NOT NULL DEFAULT 'Pending',
+                    assigned_by TEXT NOT NULL,
+                    assigned_by_name TEXT NOT NULL,
+                    assigned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    accepted_at TIMESTAMP,
+                    completed_at TIMESTAMP,
+                    report_notes TEXT,
+                    report_media_file_id TEXT,
+                    report_media_type TEXT
+                )
+            """)
+            apply_migration(cur, '0001_delivery_tasks_indexes', [
+                # Partial index matching the active-task lookup in get_delivery_tasks_by_assignee
+                """
+                CREATE INDEX IF NOT EXISTS idx_delivery_tasks_assignee_active
+                ON tbl_delivery_tasks (assignee_id, assigned_at DESC)
+                WHERE status IN ('Pending', 'Accepted')
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_delivery_tasks_status ON tbl_delivery_tasks (status)",
+            ])
+            # Tables created before the enum existed still have a TEXT status column.
+            # The partial index predicate compares status to text, so rebuild it around the change.
+            apply_migration(cur, '0003_delivery_status_enum_column', [
+                "DROP INDEX IF EXISTS idx_delivery_tasks_assignee_active",
+                "UPDATE tbl_delivery_tasks SET status = 'Pending' WHERE status IS NULL",
+                "ALTER TABLE tbl_delivery_tasks ALTER COLUMN status DROP DEFAULT",
+                "ALTER TABLE tbl_delivery_tasks ALTER COLUMN status TYPE delivery_status USING status::text::delivery_status",
+                "ALTER TABLE tbl_delivery_tasks ALTER COLUMN status SET DEFAULT 'Pending'",
+                "ALTER TABLE tbl_delivery_tasks ALTER COLUMN status SET NOT NULL",
+                """
+                CREATE INDEX idx_delivery_tasks_assignee_active
+                ON tbl_delivery_tasks (assignee_id, assigned_at DESC)
+                WHERE status IN ('Pending', 'Accepted')
+                """,
+            ])
+            apply_migration(cur, '0004_delivery_tasks_active_index_by_status', [
+                "DROP INDEX IF EXISTS idx_delivery_tasks_assignee_active",
+                """
+                CREATE INDEX idx_delivery_tasks_assignee_active
+                ON tbl_delivery_tasks (assignee_id, status, assigned_at DESC, id DESC)
+                WHERE status IN ('Pending', 'Accepted')
+                """,
+            ])
+        _known_tables.add('tbl_delivery_tasks')
+        logger.debug("tbl_delivery_tasks table ready")
         return True
     except Exception as e:
-        print(f"Error creating delivery tasks table: {e}")
+        logger.error("Error creating delivery tasks table: %s", e)
         return False
 
 
+@_ttl_cache(ttl=300, group='employees')
 def get_drivers(db: DatabaseManager) -> list:
     """Get all employees in Transportation department with Driver role"""
     try:
-        results = db.execute_query("""
-            SELECT employee_id, name, department, work_role
-            FROM tbl_employeer
-            WHERE LOWER(department) = 'transportation'
-        """)
-        print(f"✅ Drivers retrieved: {len(results) if results else 0}")
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT employee_id, name, department, work_role
+                FROM tbl_employeer
+                WHERE LOWER(department) = 'transportation'
+            """)
+            results = cur.fetchall()
+        logger.debug("Drivers retrieved: %s", len(results) if results else 0)
         return results if results else []
     except Exception as e:
-        print(f"Error getting drivers: {e}")
+        logger.error("Error getting drivers: %s", e)
         return []
 
 
@@ -6371,105 +6659,265 @@ def create_delivery_task(db: DatabaseManager, assignee_id: str, assignee_name: s
                         assigned_by: str = None, assigned_by_name: str = None,
                         attachment_file_id: str = None, attachment_type: str = None) -> int:
     """Create a new delivery task"""
+    task_ids = create_delivery_tasks_bulk(db, [{
+        'assignee_id': assignee_id, 'assignee_name': assignee_name,
+        'description': description, 'due_date': due_date, 'due_time': due_time,
+        'assigned_by': assigned_by, 'assigned_by_name': assigned_by_name,
+        'attachment_file_id': attachment_file_id, 'attachment_type': attachment_type
+    }])
+    return task_ids[0] if task_ids else None
+
+
+def create_delivery_tasks_bulk(db: DatabaseManager, tasks: list) -> list:
+    """
+    Create several delivery tasks with a single multi-row INSERT
+    
+    Args:
+        tasks: List of dicts with the create_delivery_task keyword arguments
+        
+    Returns:
+        List of created task IDs, empty list on error
+    """
+    if not tasks:
+        return []
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_delivery_tasks 
-            (assignee_id, assignee_name, description, due_date, due_time, 
-             assigned_by, assigned_by_name, attachment_file_id, attachment_type)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (assignee_id, assignee_name, description, due_date, due_time,
-              assigned_by, assigned_by_name, attachment_file_id, attachment_type))
-        task_id = db.cursor.fetchone()[0]
-        db.connection.commit()
-        print(f"✅ Delivery task created: ID {task_id}")
-        return task_id
+        rows = [(t['assignee_id'], t['assignee_name'], t['description'],
+                 t.get('due_date'), t.get('due_time'),
+                 t.get('assigned_by'), t.get('assigned_by_name'),
+                 t.get('attachment_file_id'), t.get('attachment_type'))
+                for t in tasks]
+        with db.pooled_cursor() as cur:
+            results = psycopg2.extras.execute_values(cur, """
+                INSERT INTO tbl_delivery_tasks 
+                (assignee_id, assignee_name, description, due_date, due_time, 
+                 assigned_by, assigned_by_name, attachment_file_id, attachment_type)
+                VALUES %s
+                RETURNING id
+            """, rows, page_size=500, fetch=True)
+        task_ids = [r[0] for r in results]
+        logger.debug("Delivery tasks created: %s", task_ids)
+        return task_ids
     except Exception as e:
-        print(f"Error creating delivery task: {e}")
-        return None
+        logger.error("Error creating delivery tasks: %s", e)
+        return []
 
 
-def get_delivery_tasks_by_assignee(db: DatabaseManager, assignee_id: str) -> list:
-    """Get all pending/accepted delivery tasks for a specific driver"""
+_DELIVERY_IMPORT_COLUMNS = (
+    'assignee_id', 'assignee_name', 'description', 'due_date', 'due_time',
+    'attachment_file_id', 'attachment_type', 'status', 'assigned_by', 'assigned_by_name',
+    'assigned_at', 'accepted_at', 'completed_at',
+    'report_notes', 'report_media_file_id', 'report_media_type'
+)
+
+
+def bulk_import_delivery_tasks(db: DatabaseManager, rows) -> int:
+    """
+    Bulk-load historical/imported delivery tasks with COPY FROM STDIN
+    
+    Args:
+        rows: Iterable of dicts keyed by tbl_delivery_tasks column names.
+              Missing/empty status defaults to 'Pending', assigned_at to now.
+        
+    Returns:
+        Number of imported rows (0 on error)
+    """
+    now = datetime.now()
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    count = 0
+    for row in rows:
+        values = dict(row)
+        values['status'] = values.get('status') or 'Pending'
+        values['assigned_at'] = values.get('assigned_at') or now
+        writer.writerow([r'\N' if values.get(col) is None else values[col]
+                         for col in _DELIVERY_IMPORT_COLUMNS])
+        count += 1
+    if not count:
+        return 0
+    buf.seek(0)
+    
     try:
-        results = db.execute_query("""
-            SELECT id, description, due_date, due_time, status, assigned_at, 
-                   accepted_at, completed_at, assigned_by_name
-            FROM tbl_delivery_tasks
-            WHERE assignee_id = %s AND status IN ('Pending', 'Accepted')
-            ORDER BY 
-                CASE WHEN status = 'Pending' THEN 0 ELSE 1 END,
-                assigned_at DESC
-        """, (assignee_id,))
-        print(f"✅ Driver tasks retrieved: {len(results) if results else 0}")
+        with db.pooled_cursor() as cur:
+            cur.copy_expert(
+                f"COPY tbl_delivery_tasks ({', '.join(_DELIVERY_IMPORT_COLUMNS)}) "
+                r"FROM STDIN WITH (FORMAT csv, NULL '\N')",
+                buf
+            )
+        logger.info("Delivery tasks imported: %s", count)
+        return count
+    except Exception as e:
+        logger.error("Error importing delivery tasks: %s", e)
+        return 0
+
+
+def assign_delivery_task_to_drivers(db: DatabaseManager, drivers: list, description: str,
+                                    due_date: str = None, due_time: str = None,
+                                    assigned_by: str = None, assigned_by_name: str = None,
+                                    attachment_file_id: str = None, attachment_type: str = None) -> list:
+    """
+    Broadcast the same delivery task to several drivers in one round-trip
+    
+    Args:
+        drivers: List of (assignee_id, assignee_name) pairs
+        
+    Returns:
+        List of created task IDs, empty list on error
+    """
+    return create_delivery_tasks_bulk(db, [{
+        'assignee_id': str(assignee_id), 'assignee_name': assignee_name,
+        'description': description, 'due_date': due_date, 'due_time': due_time,
+        'assigned_by': assigned_by, 'assigned_by_name': assigned_by_name,
+        'attachment_file_id': attachment_file_id, 'attachment_type': attachment_type
+    } for assignee_id, assignee_name in drivers])
+
+
+# Active (Pending/Accepted) tasks of one driver, Pending first, newest first,
+# seeking past the (status, assigned_at, id) cursor: $1 assignee, $2-$4 cursor, $5 limit.
+# delivery_status enum order is Pending < Accepted, so ORDER BY status needs no CASE
+# and idx_delivery_tasks_assignee_active returns rows already sorted.
+_DELIVERY_ACTIVE_PAGE_SQL = """
+    FROM tbl_delivery_tasks
+    WHERE assignee_id = $1 AND status IN ('Pending', 'Accepted')
+      AND ($2::delivery_status IS NULL
+           OR status > $2::delivery_status
+           OR (status = $2::delivery_status AND (assigned_at, id) < ($3::timestamp, $4::int)))
+    ORDER BY status, assigned_at DESC, id DESC
+    LIMIT $5
+"""
+
+
+def get_delivery_tasks_by_assignee(db: DatabaseManager, assignee_id: str, limit: int = 20,
+                                   after: tuple = None) -> list:
+    """
+    Get pending/accepted delivery tasks for a specific driver (rows as dicts)
+    
+    Pending tasks come first, newest first within each status. Uses keyset
+    pagination, so each page costs the same regardless of history size.
+    
+    Args:
+        assignee_id: Driver telegram ID
+        limit: Page size
+        after: (status, assigned_at, id) of the last row of the previous page
+        
+    Returns:
+        List of task dicts
+    """
+    after_status, after_assigned_at, after_id = after if after else (None, None, None)
+    try:
+        with db.pooled_cursor(psycopg2.extras.RealDictCursor) as cur:
+            db.execute_prepared('delivery_tasks_by_assignee', """
+                SELECT id, description, due_date, due_time, status, assigned_at, 
+                       accepted_at, completed_at, assigned_by_name
+            """ + _DELIVERY_ACTIVE_PAGE_SQL,
+                (assignee_id, after_status, after_assigned_at, after_id, limit), cursor=cur)
+            results = cur.fetchall()
+        logger.debug("Driver tasks retrieved: %s", len(results) if results else 0)
         return results if results else []
     except Exception as e:
-        print(f"Error getting delivery tasks by assignee: {e}")
+        logger.error("Error getting delivery tasks by assignee: %s", e)
+        return []
+
+
+def get_delivery_tasks_summary(db: DatabaseManager, assignee_id: str, limit: int = 20,
+                              after: tuple = None) -> list:
+    """
+    Get a driver's active delivery tasks for list views (rows as dicts)
+    
+    Same ordering and paging as get_delivery_tasks_by_assignee, but only the
+    columns a task list renders, with the description trimmed server-side.
+    
+    Returns:
+        List of dicts {'id', 'description', 'status', 'due_date', 'assigned_at'}
+    """
+    after_status, after_assigned_at, after_id = after if after else (None, None, None)
+    try:
+        with db.pooled_cursor(psycopg2.extras.RealDictCursor) as cur:
+            db.execute_prepared('delivery_tasks_summary', """
+                SELECT id, LEFT(description, 80) AS description, status, due_date, assigned_at
+            """ + _DELIVERY_ACTIVE_PAGE_SQL,
+                (assignee_id, after_status, after_assigned_at, after_id, limit), cursor=cur)
+            return cur.fetchall()
+    except Exception as e:
+        logger.error("Error getting delivery tasks summary: %s", e)
         return []
 
 
+def count_delivery_tasks_by_assignee(db: DatabaseManager, assignee_id: str) -> int:
+    """Count a driver's active (pending/accepted) delivery tasks"""
+    try:
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('delivery_tasks_active_count', """
+                SELECT COUNT(*) FROM tbl_delivery_tasks
+                WHERE assignee_id = $1 AND status IN ('Pending', 'Accepted')
+            """, (assignee_id,), cursor=cur)
+            return cur.fetchone()[0]
+    except Exception as e:
+        logger.error("Error counting delivery tasks: %s", e)
+        return 0
+
+
+def get_delivery_task_status(db: DatabaseManager, task_id: int) -> str:
+    """Get only the status of a delivery task, or None if it doesn't exist"""
+    try:
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('delivery_task_status', """
+                SELECT status FROM tbl_delivery_tasks WHERE id = $1
+            """, (task_id,), cursor=cur)
+            row = cur.fetchone()
+            return row[0] if row else None
+    except Exception as e:
+        logger.error("Error getting delivery task status: %s", e)
+        return None
+
+
 def get_delivery_task_by_id(db: DatabaseManager, task_id: int) -> dict:
     """Get a specific delivery task by ID"""
     try:
-        result = db.execute_query("""
-            SELECT id, assignee_id, assignee_name, description, due_date, due_time,
-                   attachment_file_id, attachment_type, status, assigned_by, 
-                   assigned_by_name, assigned_at, accepted_at, completed_at,
-                   report_notes, report_media_file_id, report_media_type
-            FROM tbl_delivery_tasks
-            WHERE id = %s
-        """, (task_id,))
-        
-        if result:
-            row = result[0]
-            return {
-                'id': row[0], 'assignee_id': row[1], 'assignee_name': row[2],
-                'description': row[3], 'due_date': row[4], 'due_time': row[5],
-                'attachment_file_id': row[6], 'attachment_type': row[7],
-                'status': row[8], 'assigned_by': row[9], 'assigned_by_name': row[10],
-                'assigned_at': row[11], 'accepted_at': row[12], 'completed_at': row[13],
-                'report_notes': row[14], 'report_media_file_id': row[15], 
-                'report_media_type': row[16]
-            }
-        return None
-    except Exception as e:
-        print(f"Error getting delivery task by ID: {e}")
+        with db.pooled_cursor(psycopg2.extras.RealDictCursor) as cur:
+            db.execute_prepared('delivery_task_by_id', """
+                SELECT id, assignee_id, assignee_name, description, due_date, due_time,
+                       attachment_file_id, attachment_type, status, assigned_by, 
+                       assigned_by_name, assigned_at, accepted_at, completed_at,
+                       report_notes, report_media_file_id, report_media_type
+                FROM tbl_delivery_tasks
+                WHERE id = $1
+            """, (task_id,), cursor=cur)
+            return cur.fetchone()
+    except Exception as e:
+        logger.error("Error getting delivery task by ID: %s", e)
         return None
 
 
 def accept_delivery_task(db: DatabaseManager, task_id: int) -> bool:
     """Accept a delivery task"""
     try:
-        # Check if task is already accepted or completed
-        db.cursor.execute("""
-            SELECT status FROM tbl_delivery_tasks WHERE id = %s
-        """, (task_id,))
-        result = db.cursor.fetchone()
-        
-        if not result:
-            print(f"❌ Delivery task {task_id} not found")
-            return False
+        with db.pooled_cursor() as cur:
+            # Status check and update in one statement, so two drivers can't both accept
+            db.execute_prepared('delivery_task_accept', """
+                UPDATE tbl_delivery_tasks 
+                SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
+                WHERE id = $1 AND status = 'Pending'
+                RETURNING id
+            """, (task_id,), cursor=cur)
+            accepted = cur.fetchone()
             
-        current_status = result[0]
-        if current_status != 'Pending':
-            print(f"⚠️ Delivery task {task_id} already {current_status}")
-            return False
-        
-        db.cursor.execute("""
-            UPDATE tbl_delivery_tasks 
-            SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND status = 'Pending'
-        """, (task_id,))
-        db.connection.commit()
+            if not accepted:
+                # Only on a miss: tell "not found" apart from "already processed"
+                db.execute_prepared('delivery_task_status', """
+                    SELECT status FROM tbl_delivery_tasks WHERE id = $1
+                """, (task_id,), cursor=cur)
+                result = cur.fetchone()
         
-        if db.cursor.rowcount > 0:
-            print(f"✅ Delivery task {task_id} accepted")
+        if accepted:
+            logger.debug("Delivery task %s accepted", task_id)
             return True
+        if not result:
+            logger.info("Delivery task %s not found", task_id)
         else:
-            print(f"⚠️ Delivery task {task_id} was not updated")
-            return False
+            logger.info("Delivery task %s already %s", task_id, result[0])
+        return False
     except Exception as e:
-        print(f"Error accepting delivery task: {e}")
+        logger.error("Error accepting delivery task: %s", e)
         return False
 
 
@@ -6477,17 +6925,23 @@ def complete_delivery_task(db: DatabaseManager, task_id: int, report_notes: str
                           report_media_file_id: str = None, report_media_type: str = None) -> bool:
     """Complete a delivery task with optional report"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_delivery_tasks 
-            SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
-                report_notes = %s, report_media_file_id = %s, report_media_type = %s
-            WHERE id = %s
-        """, (report_notes, report_media_file_id, report_media_type, task_id))
-        db.connection.commit()
-        print(f"✅ Delivery task {task_id} completed")
-        return True
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('delivery_task_complete', """
+                UPDATE tbl_delivery_tasks 
+                SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
+                    report_notes = $1, report_media_file_id = $2, report_media_type = $3
+                WHERE id = $4 AND status <> 'Completed'
+                RETURNING id
+            """, (report_notes, report_media_file_id, report_media_type, task_id), cursor=cur)
+            completed = cur.fetchone() is not None
+        
+        if completed:
+            logger.debug("Delivery task %s completed", task_id)
+        else:
+            logger.info("Delivery task %s not found or already completed", task_id)
+        return completed
     except Exception as e:
-        print(f"Error completing delivery task: {e}")
+        logger.error("Error completing delivery task: %s", e)
         return False
 
 
@@ -6510,19 +6964,55 @@ def upgrade_hotel_accounts_table(db: DatabaseManager):
             'closed_by_name': "TEXT",
             'is_closed': "BOOLEAN DEFAULT FALSE",
         }
-        for col_name, col_def in new_cols.items():
-            try:
-                db.cursor.execute(
-                    f"ALTER TABLE tbl_hotel_accounts ADD COLUMN IF NOT EXISTS {col_name} {col_def}"
-                )
-                db.connection.commit()
-            except Exception:
-                db.connection.rollback()
-        print("tbl_hotel_accounts upgraded")
-        return True
+        clauses = ", ".join(
+            f"ADD COLUMN IF NOT EXISTS {col_name} {col_def}" for col_name, col_def in new_cols.items()
+        )
+        try:
+            db.cursor.execute(f"ALTER TABLE tbl_hotel_accounts {clauses}")
+            db.connection.commit()
+        except Exception:
+            db.connection.rollback()
+            # Fall back to one column at a time so one bad column doesn't block the rest
+            for col_name, col_def in new_cols.items():
+                try:
+                    db.cursor.execute(
+                        f"ALTER TABLE tbl_hotel_accounts ADD COLUMN IF NOT EXISTS {col_name} {col_def}"
+                    )
+                    db.connection.commit()
+                except Exception:
+                    db.connection.rollback()
     except Exception as e:
         print(f"Error upgrading hotel accounts: {e}")
         return False
+    
+    # The unique index keeps one row per day for record_financial_transaction
+    # and turns the "latest balances" ORDER BY date DESC LIMIT 1
+    # lookups into a one-row backward index scan. Rows sharing a date are left
+    # for an operator to resolve; they are never merged or deleted here.
+    try:
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT date, COUNT(*) FROM tbl_hotel_accounts
+                WHERE date IS NOT NULL
+                GROUP BY date
+                HAVING COUNT(*) > 1
+                ORDER BY date
+            """)
+            duplicates = cur.fetchall()
+            if duplicates:
+                listed = ", ".join(f"{d} ({n} rows)" for d, n in duplicates)
+                print(f"⚠️ tbl_hotel_accounts has several rows for: {listed}. "
+                      f"Keep one row per date, then restart to add the unique date index.")
+                return False
+            apply_migration(cur, '0005_hotel_accounts_unique_date', [
+                "DROP INDEX IF EXISTS idx_hotel_accounts_date_desc",
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_hotel_accounts_date ON tbl_hotel_accounts (date)",
+            ])
+    except Exception as e:
+        print(f"Error adding unique date index to tbl_hotel_accounts: {e}")
+        return False
+    print("tbl_hotel_accounts upgraded")
+    return True
 
 
 def create_financial_transactions_table(db: DatabaseManager):
@@ -6549,332 +7039,449 @@ def create_financial_transactions_table(db: DatabaseManager):
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+
+        # Indexes for the date-filtered summaries, newest-first listings and the missing-proof count
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fintx_date_type_cat
+            ON tbl_financial_transactions(transaction_date, transaction_type, category)
+            INCLUDE (amount)
+        """)
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fintx_created_id
+            ON tbl_financial_transactions(created_at DESC, id DESC)
+        """)
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fintx_no_proof
+            ON tbl_financial_transactions(created_at DESC)
+            WHERE attachment_file_id IS NULL
+        """)
         db.connection.commit()
+        _ensure_record_fin_tx_function(db)
         print("tbl_financial_transactions table ready")
         return True
     except Exception as e:
+        db.connection.rollback()
         print(f"Error creating financial transactions table: {e}")
         return False
 
 
+def _register_decimal_json(cur):
+    """Decode json results on `cur` with numbers as Decimal, matching NUMERIC columns"""
+    import json
+    from decimal import Decimal
+    psycopg2.extras.register_default_json(cur, loads=lambda s: json.loads(s, parse_float=Decimal))
+
+
+@_ttl_cache(ttl=30, group='finance')
 def get_hotel_finance_summary(db: DatabaseManager):
     """Get current hotel financial summary from latest accounts + transactions"""
     try:
-        # Get today's transaction totals
-        db.cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), 0) as today_income,
-                COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END), 0) as today_expense,
-                COUNT(*) as today_count
-            FROM tbl_financial_transactions
-            WHERE transaction_date = CURRENT_DATE
-        """)
-        today = db.cursor.fetchone()
+        with db.pooled_cursor() as cur:
+            # Get today's transaction totals
+            cur.execute("""
+                SELECT 
+                    COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), 0) as today_income,
+                    COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END), 0) as today_expense,
+                    COUNT(*) as today_count
+                FROM tbl_financial_transactions
+                WHERE transaction_date = CURRENT_DATE
+            """)
+            today = cur.fetchone()
         
-        # Get this month totals
-        db.cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), 0) as month_income,
-                COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END), 0) as month_expense,
-                COUNT(*) as month_count
-            FROM tbl_financial_transactions
-            WHERE DATE_TRUNC('month', transaction_date) = DATE_TRUNC('month', CURRENT_DATE)
-        """)
-        month = db.cursor.fetchone()
-        
-        # Get category breakdown for today
-        db.cursor.execute("""
-            SELECT category, transaction_type,
-                   COUNT(*) as cnt, SUM(amount) as total
-            FROM tbl_financial_transactions
-            WHERE transaction_date = CURRENT_DATE
-            GROUP BY category, transaction_type
-            ORDER BY total DESC
-        """)
-        today_categories = db.cursor.fetchall()
+            # Get this month totals
+            cur.execute("""
+                SELECT 
+                    COALESCE(SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE 0 END), 0) as month_income,
+                    COALESCE(SUM(CASE WHEN transaction_type = 'expense' THEN amount ELSE 0 END), 0) as month_expense,
+                    COUNT(*) as month_count
+                FROM tbl_financial_transactions
+                WHERE transaction_date >= DATE_TRUNC('month', CURRENT_DATE)
+                  AND transaction_date < DATE_TRUNC('month', CURRENT_DATE) + INTERVAL '1 month'
+            """)
+            month = cur.fetchone()
+        
+            # Top categories for today, returned as one JSON array of dicts
+            _register_decimal_json(cur)
+            cur.execute("""
+                SELECT COALESCE(json_agg(c), '[]'::json)
+                FROM (
+                    SELECT category, transaction_type,
+                           COUNT(*) as cnt, SUM(amount) as total
+                    FROM tbl_financial_transactions
+                    WHERE transaction_date = CURRENT_DATE
+                    GROUP BY category, transaction_type
+                    ORDER BY total DESC
+                    LIMIT 6
+                ) c
+            """)
+            today_categories = cur.fetchone()[0]
         
-        # Get latest hotel_accounts record for balances
-        db.cursor.execute("""
-            SELECT cash_balance, bank_balance, total_revenue, total_expenses, net_profit
-            FROM tbl_hotel_accounts
-            ORDER BY date DESC LIMIT 1
-        """)
-        balances = db.cursor.fetchone()
+            # Get latest hotel_accounts record for balances
+            cur.execute("""
+                SELECT cash_balance, bank_balance, total_revenue, total_expenses, net_profit
+                FROM tbl_hotel_accounts
+                ORDER BY date DESC LIMIT 1
+            """)
+            balances = cur.fetchone()
         
-        return {
-            'today_income': float(today[0]) if today else 0,
-            'today_expense': float(today[1]) if today else 0,
-            'today_count': today[2] if today else 0,
-            'month_income': float(month[0]) if month else 0,
-            'month_expense': float(month[1]) if month else 0,
-            'month_count': month[2] if month else 0,
-            'today_categories': today_categories or [],
-            'cash_balance': float(balances[0]) if balances and balances[0] else 0,
-            'bank_balance': float(balances[1]) if balances and balances[1] else 0,
-            'total_revenue': float(balances[2]) if balances and balances[2] else 0,
-            'total_expenses': float(balances[3]) if balances and balances[3] else 0,
-            'net_profit': float(balances[4]) if balances and balances[4] else 0,
-        }
+            return {
+                'today_income': today[0] if today else 0,
+                'today_expense': today[1] if today else 0,
+                'today_count': today[2] if today else 0,
+                'month_income': month[0] if month else 0,
+                'month_expense': month[1] if month else 0,
+                'month_count': month[2] if month else 0,
+                'today_categories': today_categories or [],
+                'cash_balance': balances[0] if balances and balances[0] else 0,
+                'bank_balance': balances[1] if balances and balances[1] else 0,
+                'total_revenue': balances[2] if balances and balances[2] else 0,
+                'total_expenses': balances[3] if balances and balances[3] else 0,
+                'net_profit': balances[4] if balances and balances[4] else 0,
+            }
     except Exception as e:
         print(f"Error getting finance summary: {e}")
         return None
 
 
+# Create today's tbl_hotel_accounts row, carrying over the latest balances.
+# NOT EXISTS instead of ON CONFLICT (date): the unique date index is skipped
+# while duplicate dates await an operator, and recording must keep working.
+_FIN_ACCOUNT_ENSURE_TODAY_SQL = """
+    INSERT INTO tbl_hotel_accounts (date, Room_Revenue, Food_Beverage_Revenue,
+        Purchasing_Product_Revenue, Utilities_Expenses, Total_amount,
+        cash_balance, bank_balance, total_revenue, total_expenses, net_profit, created_at)
+    SELECT CURRENT_DATE, 0, 0, 0, 0, 0,
+        COALESCE(prev.cash_balance, 0), COALESCE(prev.bank_balance, 0),
+        0, 0, 0, CURRENT_DATE
+    FROM (SELECT 1) seed
+    LEFT JOIN (
+        SELECT cash_balance, bank_balance
+        FROM tbl_hotel_accounts ORDER BY date DESC LIMIT 1
+    ) prev ON TRUE
+    WHERE NOT EXISTS (SELECT 1 FROM tbl_hotel_accounts WHERE date = CURRENT_DATE)
+"""
+
+# Apply one transaction's balance and category deltas to today's row
+# ($1 amount, $2 amount as integer, $3 category, $4 payment method, $5 type)
+_FIN_ACCOUNT_APPLY_TX_SQL = """
+    UPDATE tbl_hotel_accounts
+    SET cash_balance = COALESCE(cash_balance, 0)
+            + CASE WHEN d.to_cash THEN d.sign * d.amount ELSE 0 END,
+        bank_balance = COALESCE(bank_balance, 0)
+            + CASE WHEN d.to_cash THEN 0 ELSE d.sign * d.amount END,
+        total_revenue = COALESCE(total_revenue, 0)
+            + CASE WHEN d.sign = 1 THEN d.amount ELSE 0 END,
+        total_expenses = COALESCE(total_expenses, 0)
+            + CASE WHEN d.sign = -1 THEN d.amount ELSE 0 END,
+        net_profit = COALESCE(net_profit, 0) + d.sign * d.amount,
+        Total_amount = COALESCE(Total_amount, 0)
+            + CASE WHEN d.sign = 1 THEN d.amount ELSE 0 END,
+        Room_Revenue = COALESCE(Room_Revenue, 0)
+            + CASE WHEN d.sign = 1 AND d.category = 'room_revenue' THEN d.amount_int ELSE 0 END,
+        Food_Beverage_Revenue = COALESCE(Food_Beverage_Revenue, 0)
+            + CASE WHEN d.sign = 1 AND d.category = 'food_beverage' THEN d.amount_int ELSE 0 END,
+        Purchasing_Product_Revenue = COALESCE(Purchasing_Product_Revenue, 0)
+            + CASE WHEN d.sign = -1 AND d.category = 'purchase' THEN d.amount_int ELSE 0 END,
+        Utilities_Expenses = COALESCE(Utilities_Expenses, 0)
+            + CASE WHEN d.sign = -1 AND d.category = 'utilities' THEN d.amount_int ELSE 0 END
+    FROM (
+        SELECT $1::numeric AS amount,
+               $2::integer AS amount_int,
+               $3::text AS category,
+               $4::text IN ('cash', 'mixed') AS to_cash,
+               CASE $5::text WHEN 'income' THEN 1 WHEN 'expense' THEN -1 ELSE 0 END AS sign
+    ) d
+    WHERE date = CURRENT_DATE
+"""
+
+
+def _ensure_record_fin_tx_function(db: DatabaseManager):
+    """
+    Create record_fin_tx(), which records a transaction and updates today's account row
+    
+    Runs in its own pooled transaction and is only marked as known once that
+    transaction has committed, so a later rollback cannot hide a missing function.
+    """
+    if 'record_fin_tx' in _known_tables:
+        return
+    with db.pooled_cursor() as cur:
+        cur.execute(f"""
+            CREATE OR REPLACE FUNCTION record_fin_tx(
+                p_amount NUMERIC, p_amount_int INTEGER, p_category TEXT,
+                p_payment_method TEXT, p_type TEXT, p_description TEXT,
+                p_reference_number TEXT, p_vendor_client TEXT,
+                p_recorded_by BIGINT, p_recorded_by_name TEXT,
+                p_attachment_file_id TEXT, p_attachment_type TEXT, p_notes TEXT
+            ) RETURNS INTEGER AS $fn$
+            DECLARE
+                v_id INTEGER;
+            BEGIN
+                INSERT INTO tbl_financial_transactions
+                (transaction_date, transaction_type, category, description, amount,
+                 payment_method, reference_number, vendor_client,
+                 recorded_by, recorded_by_name, attachment_file_id, attachment_type, notes)
+                VALUES (CURRENT_DATE, p_type, p_category, p_description, p_amount,
+                        p_payment_method, p_reference_number, p_vendor_client,
+                        p_recorded_by, p_recorded_by_name, p_attachment_file_id, p_attachment_type, p_notes)
+                RETURNING id INTO v_id;
+            
+                -- Other types change no account column: skip the row write entirely
+                IF p_type NOT IN ('income', 'expense') THEN
+                    RETURN v_id;
+                END IF;
+            
+                -- $1-$5 are p_amount .. p_type, matching the shared account statements
+                {_FIN_ACCOUNT_APPLY_TX_SQL};
+                IF NOT FOUND THEN
+                    BEGIN
+                        {_FIN_ACCOUNT_ENSURE_TODAY_SQL};
+                    EXCEPTION WHEN unique_violation THEN
+                        -- A concurrent call created today's row first
+                        NULL;
+                    END;
+                    {_FIN_ACCOUNT_APPLY_TX_SQL};
+                END IF;
+            
+                RETURN v_id;
+            END;
+            $fn$ LANGUAGE plpgsql
+        """)
+    _known_tables.add('record_fin_tx')
+
+
 def record_financial_transaction(db: DatabaseManager, data: dict):
     """Record a new financial transaction and update hotel accounts"""
+    from decimal import Decimal
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_financial_transactions 
-            (transaction_date, transaction_type, category, description, amount,
-             payment_method, reference_number, vendor_client,
-             recorded_by, recorded_by_name, attachment_file_id, attachment_type, notes)
-            VALUES (CURRENT_DATE, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            data['transaction_type'],
-            data['category'],
-            data['description'],
-            data['amount'],
-            data.get('payment_method', 'cash'),
-            data.get('reference_number'),
-            data.get('vendor_client'),
-            data['recorded_by'],
-            data['recorded_by_name'],
-            data.get('attachment_file_id'),
-            data.get('attachment_type'),
-            data.get('notes')
-        ))
-        tx_id = db.cursor.fetchone()[0]
-        
-        # Update hotel_accounts balance
-        amount = float(data['amount'])
+        amount = Decimal(str(data['amount']))
         pay_method = data.get('payment_method', 'cash')
         tx_type = data['transaction_type']
         
-        # Check if today's account record exists
-        db.cursor.execute("SELECT id FROM tbl_hotel_accounts WHERE date = CURRENT_DATE")
-        account = db.cursor.fetchone()
-        
-        if not account:
-            # Create today's record by copying yesterday's balances
-            db.cursor.execute("""
-                INSERT INTO tbl_hotel_accounts (date, Room_Revenue, Food_Beverage_Revenue, 
-                    Purchasing_Product_Revenue, Utilities_Expenses, Total_amount,
-                    cash_balance, bank_balance, total_revenue, total_expenses, net_profit, created_at)
-                SELECT CURRENT_DATE, 0, 0, 0, 0, 0,
-                    COALESCE(cash_balance, 0), COALESCE(bank_balance, 0),
-                    0, 0, 0, CURRENT_DATE
-                FROM tbl_hotel_accounts ORDER BY date DESC LIMIT 1
-            """)
-            # If no previous record exists at all
-            db.cursor.execute("SELECT id FROM tbl_hotel_accounts WHERE date = CURRENT_DATE")
-            account = db.cursor.fetchone()
-            if not account:
-                db.cursor.execute("""
-                    INSERT INTO tbl_hotel_accounts (date, Room_Revenue, Food_Beverage_Revenue,
-                        Purchasing_Product_Revenue, Utilities_Expenses, Total_amount,
-                        cash_balance, bank_balance, total_revenue, total_expenses, net_profit, created_at)
-                    VALUES (CURRENT_DATE, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, CURRENT_DATE)
-                """)
-        
-        # Update balances
-        if tx_type == 'income':
-            if pay_method in ('cash', 'mixed'):
-                db.cursor.execute("""
-                    UPDATE tbl_hotel_accounts 
-                    SET cash_balance = COALESCE(cash_balance, 0) + %s,
-                        total_revenue = COALESCE(total_revenue, 0) + %s,
-                        net_profit = COALESCE(net_profit, 0) + %s,
-                        Total_amount = COALESCE(Total_amount, 0) + %s
-                    WHERE date = CURRENT_DATE
-                """, (amount, amount, amount, amount))
-            else:
-                db.cursor.execute("""
-                    UPDATE tbl_hotel_accounts 
-                    SET bank_balance = COALESCE(bank_balance, 0) + %s,
-                        total_revenue = COALESCE(total_revenue, 0) + %s,
-                        net_profit = COALESCE(net_profit, 0) + %s,
-                        Total_amount = COALESCE(Total_amount, 0) + %s
-                    WHERE date = CURRENT_DATE
-                """, (amount, amount, amount, amount))
-            
-            # Update category-specific columns
-            cat = data['category']
-            if cat == 'room_revenue':
-                db.cursor.execute("UPDATE tbl_hotel_accounts SET Room_Revenue = COALESCE(Room_Revenue,0) + %s WHERE date = CURRENT_DATE", (int(amount),))
-            elif cat == 'food_beverage':
-                db.cursor.execute("UPDATE tbl_hotel_accounts SET Food_Beverage_Revenue = COALESCE(Food_Beverage_Revenue,0) + %s WHERE date = CURRENT_DATE", (int(amount),))
-        
-        elif tx_type == 'expense':
-            if pay_method in ('cash', 'mixed'):
-                db.cursor.execute("""
-                    UPDATE tbl_hotel_accounts 
-                    SET cash_balance = COALESCE(cash_balance, 0) - %s,
-                        total_expenses = COALESCE(total_expenses, 0) + %s,
-                        net_profit = COALESCE(net_profit, 0) - %s
-                    WHERE date = CURRENT_DATE
-                """, (amount, amount, amount))
-            else:
-                db.cursor.execute("""
-                    UPDATE tbl_hotel_accounts 
-                    SET bank_balance = COALESCE(bank_balance, 0) - %s,
-                        total_expenses = COALESCE(total_expenses, 0) + %s,
-                        net_profit = COALESCE(net_profit, 0) - %s
-                    WHERE date = CURRENT_DATE
-                """, (amount, amount, amount))
-            
-            cat = data['category']
-            if cat == 'purchase':
-                db.cursor.execute("UPDATE tbl_hotel_accounts SET Purchasing_Product_Revenue = COALESCE(Purchasing_Product_Revenue,0) + %s WHERE date = CURRENT_DATE", (int(amount),))
-            elif cat == 'utilities':
-                db.cursor.execute("UPDATE tbl_hotel_accounts SET Utilities_Expenses = COALESCE(Utilities_Expenses,0) + %s WHERE date = CURRENT_DATE", (int(amount),))
-        
-        db.connection.commit()
+        _ensure_record_fin_tx_function(db)
+        # Transaction insert and account update run server-side in one round-trip
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('fin_record_tx', """
+                SELECT record_fin_tx($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+            """, (
+                amount,
+                int(amount),
+                data['category'],
+                pay_method,
+                tx_type,
+                data['description'],
+                data.get('reference_number'),
+                data.get('vendor_client'),
+                data['recorded_by'],
+                data['recorded_by_name'],
+                data.get('attachment_file_id'),
+                data.get('attachment_type'),
+                data.get('notes')
+            ), cursor=cur)
+            tx_id = cur.fetchone()[0]
+        
+        clear_cache_group('finance')
         print(f"✅ Financial transaction recorded: #{tx_id} ({tx_type}: {amount})")
         return tx_id
     except Exception as e:
-        db.connection.rollback()
         print(f"Error recording financial transaction: {e}")
         return None
 
 
-def get_financial_transactions(db: DatabaseManager, period='today', category=None, limit=20):
-    """Get financial transactions filtered by period and category"""
-    try:
-        where = []
-        params = []
-        
-        if period == 'today':
-            where.append("transaction_date = CURRENT_DATE")
-        elif period == 'week':
-            where.append("transaction_date >= CURRENT_DATE - INTERVAL '7 days'")
-        elif period == 'month':
-            where.append("transaction_date >= CURRENT_DATE - INTERVAL '30 days'")
+def _fintx_row_to_dict(r) -> dict:
+    """Map a tbl_financial_transactions list row to the dict callers expect"""
+    return {
+        'id': r[0], 'date': r[1], 'type': r[2], 'category': r[3],
+        'description': r[4], 'amount': r[5], 'payment_method': r[6],
+        'vendor_client': r[7], 'recorded_by': r[8], 'created_at': r[9]
+    }
+
+
+def get_financial_transactions(db: DatabaseManager, period='today', category=None, limit=20,
+                               after: tuple = None):
+    """
+    Get financial transactions filtered by period and category, newest first
+    
+    Uses keyset pagination, so later pages cost the same as the first one.
+    
+    Args:
+        period: 'today', 'week' or 'month' (anything else means all time)
+        category: Optional category filter
+        limit: Page size
+        after: (created_at, id) of the last row of the previous page
         
+    Returns:
+        List of transaction dicts
+    """
+    # Days back from CURRENT_DATE; None means no date filter
+    days_back = {'today': 0, 'week': 7, 'month': 30}.get(period)
+    after_created_at, after_id = after if after else (None, None)
+    try:
+        # Only the filters in use go into the WHERE clause, so each shape gets
+        # its own prepared statement (and plan) that can use the keyset index
+        conditions, params, shape = [], [], ''
+        if days_back is not None:
+            params.append(days_back)
+            conditions.append(f"transaction_date >= CURRENT_DATE - ${len(params)}::int")
+            shape += 'd'
         if category:
-            where.append("category = %s")
             params.append(category)
-        
-        where_clause = "WHERE " + " AND ".join(where) if where else ""
+            conditions.append(f"category = ${len(params)}::text")
+            shape += 'c'
+        if after_created_at is not None:
+            params.extend((after_created_at, after_id))
+            conditions.append(f"(created_at, id) < (${len(params) - 1}::timestamp, ${len(params)}::int)")
+            shape += 'k'
         params.append(limit)
-        
-        db.cursor.execute(f"""
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with db.pooled_cursor() as cur:
+            db.execute_prepared(f'fin_transactions_page_{shape or "all"}', f"""
+                SELECT id, transaction_date, transaction_type, category, description,
+                       amount, payment_method, vendor_client, recorded_by_name, created_at
+                FROM tbl_financial_transactions
+                {where_clause}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ${len(params)}
+            """, tuple(params), cursor=cur)
+            rows = cur.fetchall()
+        
+        return [_fintx_row_to_dict(r) for r in rows]
+    except Exception as e:
+        print(f"Error getting transactions: {e}")
+        return []
+
+
+def stream_financial_transactions(db: DatabaseManager, period='month', category=None,
+                                  chunk_size: int = 1000):
+    """
+    Yield financial transactions, newest first, without loading them all at once
+    
+    Meant for exports/reports over long periods; UI lists should keep using
+    the paginated get_financial_transactions. Rows come from a server-side
+    cursor in batches of `chunk_size`, so memory use stays flat.
+    
+    Args:
+        period: 'today', 'week' or 'month' (anything else means all time)
+        category: Optional category filter
+        chunk_size: Rows fetched per network round-trip
+        
+    Yields:
+        Transaction dicts (same keys as get_financial_transactions)
+    """
+    days_back = {'today': 0, 'week': 7, 'month': 30}.get(period)
+    conditions = []
+    params = []
+    if days_back is not None:
+        conditions.append("transaction_date >= CURRENT_DATE - %s")
+        params.append(days_back)
+    if category:
+        conditions.append("category = %s")
+        params.append(category)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with db.pooled_cursor(name='fintx_stream') as cur:
+        cur.itersize = chunk_size
+        cur.execute(f"""
             SELECT id, transaction_date, transaction_type, category, description,
                    amount, payment_method, vendor_client, recorded_by_name, created_at
             FROM tbl_financial_transactions
             {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s
+            ORDER BY created_at DESC, id DESC
         """, tuple(params))
-        
-        rows = db.cursor.fetchall()
-        return [{
-            'id': r[0], 'date': r[1], 'type': r[2], 'category': r[3],
-            'description': r[4], 'amount': float(r[5]), 'payment_method': r[6],
-            'vendor_client': r[7], 'recorded_by': r[8], 'created_at': r[9]
-        } for r in rows]
-    except Exception as e:
-        print(f"Error getting transactions: {e}")
-        return []
+        for r in cur:
+            yield _fintx_row_to_dict(r)
+
+
+def _dashboard_balances(cur):
+    """Latest account balances for get_admin_finance_dashboard"""
+    cur.execute("""
+        SELECT cash_balance, bank_balance, total_revenue, total_expenses, net_profit, date
+        FROM tbl_hotel_accounts 
+        ORDER BY date DESC LIMIT 1
+    """)
+    return cur.fetchone()
+
+
+def _dashboard_totals(cur):
+    """Today/week/month totals and missing-proof count for get_admin_finance_dashboard"""
+    # Today/week/month summaries and the missing-proof count in one scan.
+    # Summed from the raw transactions: back-dated and seeded rows never pass
+    # through record_fin_tx, so the tbl_hotel_accounts rollups can miss them.
+    cur.execute("""
+        SELECT
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'income' AND transaction_date = CURRENT_DATE), 0) as today_income,
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'expense' AND transaction_date = CURRENT_DATE), 0) as today_expense,
+            COUNT(*) FILTER (WHERE transaction_date = CURRENT_DATE) as today_count,
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'income' AND transaction_date >= CURRENT_DATE - INTERVAL '7 days'), 0) as week_income,
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'expense' AND transaction_date >= CURRENT_DATE - INTERVAL '7 days'), 0) as week_expense,
+            COUNT(*) FILTER (WHERE transaction_date >= CURRENT_DATE - INTERVAL '7 days') as week_count,
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'income' AND transaction_date >= DATE_TRUNC('month', CURRENT_DATE)), 0) as month_income,
+            COALESCE(SUM(amount) FILTER (WHERE transaction_type = 'expense' AND transaction_date >= DATE_TRUNC('month', CURRENT_DATE)), 0) as month_expense,
+            COUNT(*) FILTER (WHERE transaction_date >= DATE_TRUNC('month', CURRENT_DATE)) as month_count,
+            (SELECT COUNT(*) FROM tbl_financial_transactions
+             WHERE attachment_file_id IS NULL) as no_proof_count
+        FROM tbl_financial_transactions
+        WHERE transaction_date >= LEAST(CURRENT_DATE - INTERVAL '7 days', DATE_TRUNC('month', CURRENT_DATE))
+    """)
+    return cur.fetchone()
+
+
+def _dashboard_recent(cur):
+    """Last 10 transactions for get_admin_finance_dashboard, as one JSON array"""
+    _register_decimal_json(cur)
+    cur.execute("""
+        SELECT COALESCE(json_agg(t ORDER BY t.created_at DESC), '[]'::json)
+        FROM (
+            SELECT id, transaction_date AS date, transaction_type AS type, category,
+                   description, amount, payment_method, recorded_by_name AS recorded_by,
+                   attachment_file_id IS NOT NULL AS has_proof, created_at
+            FROM tbl_financial_transactions
+            ORDER BY created_at DESC
+            LIMIT 10
+        ) t
+    """)
+    return cur.fetchone()[0]
 
 
+@_ttl_cache(ttl=30, group='finance')
 def get_admin_finance_dashboard(db: DatabaseManager):
     """Get comprehensive finance dashboard for admin - includes balances, recent transactions, and pending proofs"""
     try:
-        # Get current balances from latest account record
-        db.cursor.execute("""
-            SELECT cash_balance, bank_balance, total_revenue, total_expenses, net_profit, date
-            FROM tbl_hotel_accounts 
-            ORDER BY date DESC LIMIT 1
-        """)
-        balance_row = db.cursor.fetchone()
+        # One pooled connection and one snapshot for all three queries
+        with db.pooled_cursor() as cur:
+            balance_row = _dashboard_balances(cur)
+            totals = _dashboard_totals(cur)
+            recent_transactions = _dashboard_recent(cur)
         
         balances = {
-            'cash_balance': float(balance_row[0]) if balance_row and balance_row[0] else 0,
-            'bank_balance': float(balance_row[1]) if balance_row and balance_row[1] else 0,
-            'total_balance': float(balance_row[0] or 0) + float(balance_row[1] or 0) if balance_row else 0,
-            'total_revenue': float(balance_row[2]) if balance_row and balance_row[2] else 0,
-            'total_expenses': float(balance_row[3]) if balance_row and balance_row[3] else 0,
-            'net_profit': float(balance_row[4]) if balance_row and balance_row[4] else 0,
+            'cash_balance': balance_row[0] if balance_row and balance_row[0] else 0,
+            'bank_balance': balance_row[1] if balance_row and balance_row[1] else 0,
+            'total_balance': (balance_row[0] or 0) + (balance_row[1] or 0) if balance_row else 0,
+            'total_revenue': balance_row[2] if balance_row and balance_row[2] else 0,
+            'total_expenses': balance_row[3] if balance_row and balance_row[3] else 0,
+            'net_profit': balance_row[4] if balance_row and balance_row[4] else 0,
             'last_update': balance_row[5] if balance_row else None
         }
-        
-        # Get today's summary
-        db.cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type='income' THEN amount END), 0) as today_income,
-                COALESCE(SUM(CASE WHEN transaction_type='expense' THEN amount END), 0) as today_expense,
-                COUNT(*) as today_count
-            FROM tbl_financial_transactions
-            WHERE transaction_date = CURRENT_DATE
-        """)
-        today = db.cursor.fetchone()
         today_summary = {
-            'income': float(today[0]) if today else 0,
-            'expense': float(today[1]) if today else 0,
-            'count': today[2] if today else 0
+            'income': totals[0],
+            'expense': totals[1],
+            'count': totals[2]
         }
-        
-        # Get this week's summary
-        db.cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type='income' THEN amount END), 0) as week_income,
-                COALESCE(SUM(CASE WHEN transaction_type='expense' THEN amount END), 0) as week_expense,
-                COUNT(*) as week_count
-            FROM tbl_financial_transactions
-            WHERE transaction_date >= CURRENT_DATE - INTERVAL '7 days'
-        """)
-        week = db.cursor.fetchone()
         week_summary = {
-            'income': float(week[0]) if week else 0,
-            'expense': float(week[1]) if week else 0,
-            'count': week[2] if week else 0
+            'income': totals[3],
+            'expense': totals[4],
+            'count': totals[5]
         }
-        
-        # Get this month's summary
-        db.cursor.execute("""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type='income' THEN amount END), 0) as month_income,
-                COALESCE(SUM(CASE WHEN transaction_type='expense' THEN amount END), 0) as month_expense,
-                COUNT(*) as month_count
-            FROM tbl_financial_transactions
-            WHERE transaction_date >= DATE_TRUNC('month', CURRENT_DATE)
-        """)
-        month = db.cursor.fetchone()
         month_summary = {
-            'income': float(month[0]) if month else 0,
-            'expense': float(month[1]) if month else 0,
-            'count': month[2] if month else 0
+            'income': totals[6],
+            'expense': totals[7],
+            'count': totals[8]
         }
         
-        # Get transactions without proof (attachment)
-        db.cursor.execute("""
-            SELECT COUNT(*) FROM tbl_financial_transactions 
-            WHERE attachment_file_id IS NULL
-        """)
-        no_proof_count = db.cursor.fetchone()[0]
-        
-        # Get recent transactions (last 10)
-        db.cursor.execute("""
-            SELECT id, transaction_date, transaction_type, category, description,
-                   amount, payment_method, recorded_by_name, attachment_file_id, created_at
-            FROM tbl_financial_transactions
-            ORDER BY created_at DESC
-            LIMIT 10
-        """)
-        recent_rows = db.cursor.fetchall()
-        recent_transactions = [{
-            'id': r[0], 'date': r[1], 'type': r[2], 'category': r[3],
-            'description': r[4], 'amount': float(r[5]), 'payment_method': r[6],
-            'recorded_by': r[7], 'has_proof': r[8] is not None, 'created_at': r[9]
-        } for r in recent_rows]
-        
         return {
             'balances': balances,
             'today': today_summary,
             'week': week_summary,
             'month': month_summary,
-            'no_proof_count': no_proof_count,
+            'no_proof_count': totals[9],
             'recent_transactions': recent_transactions
         }
     except Exception as e:
@@ -6885,26 +7492,27 @@ def get_admin_finance_dashboard(db: DatabaseManager):
 def get_transaction_detail(db: DatabaseManager, tx_id: int):
     """Get detailed transaction info including attachment"""
     try:
-        db.cursor.execute("""
-            SELECT id, transaction_date, transaction_type, category, description,
-                   amount, payment_method, reference_number, vendor_client,
-                   recorded_by, recorded_by_name, attachment_file_id, attachment_type, 
-                   notes, created_at
-            FROM tbl_financial_transactions
-            WHERE id = %s
-        """, (tx_id,))
-        row = db.cursor.fetchone()
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT id, transaction_date, transaction_type, category, description,
+                       amount, payment_method, reference_number, vendor_client,
+                       recorded_by, recorded_by_name, attachment_file_id, attachment_type, 
+                       notes, created_at
+                FROM tbl_financial_transactions
+                WHERE id = %s
+            """, (tx_id,))
+            row = cur.fetchone()
         
-        if row:
-            return {
-                'id': row[0], 'date': row[1], 'type': row[2], 'category': row[3],
-                'description': row[4], 'amount': float(row[5]), 'payment_method': row[6],
-                'reference_number': row[7], 'vendor_client': row[8],
-                'recorded_by': row[9], 'recorded_by_name': row[10],
-                'attachment_file_id': row[11], 'attachment_type': row[12],
-                'notes': row[13], 'created_at': row[14]
-            }
-        return None
+            if row:
+                return {
+                    'id': row[0], 'date': row[1], 'type': row[2], 'category': row[3],
+                    'description': row[4], 'amount': row[5], 'payment_method': row[6],
+                    'reference_number': row[7], 'vendor_client': row[8],
+                    'recorded_by': row[9], 'recorded_by_name': row[10],
+                    'attachment_file_id': row[11], 'attachment_type': row[12],
+                    'notes': row[13], 'created_at': row[14]
+                }
+            return None
     except Exception as e:
         print(f"Error getting transaction detail: {e}")
         return None
@@ -6913,37 +7521,38 @@ def get_transaction_detail(db: DatabaseManager, tx_id: int):
 def get_finance_daily_report(db: DatabaseManager, date=None):
     """Get daily financial report for a specific date"""
     try:
-        date_filter = "CURRENT_DATE" if not date else "%s"
-        params = (date,) if date else ()
-        
-        db.cursor.execute(f"""
-            SELECT 
-                COALESCE(SUM(CASE WHEN transaction_type='income' THEN amount END), 0) as total_income,
-                COALESCE(SUM(CASE WHEN transaction_type='expense' THEN amount END), 0) as total_expense,
-                COUNT(CASE WHEN transaction_type='income' THEN 1 END) as income_count,
-                COUNT(CASE WHEN transaction_type='expense' THEN 1 END) as expense_count
-            FROM tbl_financial_transactions
-            WHERE transaction_date = {date_filter}
-        """, params)
-        summary = db.cursor.fetchone()
+        with db.pooled_cursor() as cur:
+            date_filter = "CURRENT_DATE" if not date else "%s"
+            params = (date,) if date else ()
         
-        db.cursor.execute(f"""
-            SELECT category, transaction_type, COUNT(*) as cnt, SUM(amount) as total
-            FROM tbl_financial_transactions
-            WHERE transaction_date = {date_filter}
-            GROUP BY category, transaction_type
-            ORDER BY total DESC
-        """, params)
-        categories = db.cursor.fetchall()
+            cur.execute(f"""
+                SELECT 
+                    COALESCE(SUM(CASE WHEN transaction_type='income' THEN amount END), 0) as total_income,
+                    COALESCE(SUM(CASE WHEN transaction_type='expense' THEN amount END), 0) as total_expense,
+                    COUNT(CASE WHEN transaction_type='income' THEN 1 END) as income_count,
+                    COUNT(CASE WHEN transaction_type='expense' THEN 1 END) as expense_count
+                FROM tbl_financial_transactions
+                WHERE transaction_date = {date_filter}
+            """, params)
+            summary = cur.fetchone()
+        
+            cur.execute(f"""
+                SELECT category, transaction_type, COUNT(*) as cnt, SUM(amount) as total
+                FROM tbl_financial_transactions
+                WHERE transaction_date = {date_filter}
+                GROUP BY category, transaction_type
+                ORDER BY total DESC
+            """, params)
+            categories = cur.fetchall()
         
-        return {
-            'total_income': float(summary[0]),
-            'total_expense': float(summary[1]),
-            'income_count': summary[2],
-            'expense_count': summary[3],
-            'net': float(summary[0]) - float(summary[1]),
-            'categories': categories
-        }
+            return {
+                'total_income': summary[0],
+                'total_expense': summary[1],
+                'income_count': summary[2],
+                'expense_count': summary[3],
+                'net': summary[0] - summary[1],
+                'categories': categories
+            }
     except Exception as e:
         print(f"Error getting daily report: {e}")
         return None
@@ -7005,16 +7614,17 @@ def insert_sample_financial_data(db: DatabaseManager):
             ('2026-02-08', 'expense', 'purchase', 'Fresh flowers lobby decoration', 8000, 'cash', 'PO-2026-006', 'Flower Shop Ana', 8261255116, 'Sven'),
         ]
         
-        for row in sample_data:
-            db.cursor.execute("""
-                INSERT INTO tbl_financial_transactions 
-                (transaction_date, transaction_type, category, description, amount,
-                 payment_method, reference_number, vendor_client, recorded_by, recorded_by_name)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, row)
-        
-        db.connection.commit()
-        
+        # Seed data can be re-inserted after a crash, so don't wait for the WAL flush
+        db.cursor.execute("SET LOCAL synchronous_commit = off")
+
+        # Send all sample rows in one multi-row INSERT instead of one round-trip per row
+        psycopg2.extras.execute_values(db.cursor, """
+            INSERT INTO tbl_financial_transactions
+            (transaction_date, transaction_type, category, description, amount,
+             payment_method, reference_number, vendor_client, recorded_by, recorded_by_name)
+            VALUES %s
+        """, sample_data, page_size=100)
+
         # Update hotel_accounts with calculated balances
         # Set initial balance for Feb 1
         db.cursor.execute("""
@@ -7025,6 +7635,7 @@ def insert_sample_financial_data(db: DatabaseManager):
             ON CONFLICT DO NOTHING
         """)
         db.connection.commit()
+        clear_cache_group('finance')
         
         print(f"Sample financial data inserted: {len(sample_data)} transactions")
     except Exception as e:
@@ -7065,9 +7676,9 @@ def create_accounting_tasks_table(db: DatabaseManager):
                 payment_method TEXT DEFAULT 'cash'
             )
         """)
-        db.connection.commit()
         
-        # Add new columns if table already exists
+        # Add new columns if table already exists; a savepoint per column keeps one
+        # failed ALTER from aborting the rest of the setup transaction
         new_cols = {
             'category': "TEXT DEFAULT 'other'",
             'amount': "DECIMAL(12,2) DEFAULT 0",
@@ -7076,29 +7687,50 @@ def create_accounting_tasks_table(db: DatabaseManager):
             'payment_method': "TEXT DEFAULT 'cash'"
         }
         for col_name, col_def in new_cols.items():
+            db.cursor.execute("SAVEPOINT add_accounting_column")
             try:
                 db.cursor.execute(
                     f"ALTER TABLE tbl_accounting_tasks ADD COLUMN IF NOT EXISTS {col_name} {col_def}"
                 )
-                db.connection.commit()
             except Exception:
-                db.connection.rollback()
-        
+                db.cursor.execute("ROLLBACK TO SAVEPOINT add_accounting_column")
+
+        # Indexes for the period summaries/history, the open-task list per assignee and category filters
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_acc_tasks_assigned_at
+            ON tbl_accounting_tasks(assigned_at DESC, status)
+            INCLUDE (category, amount, payment_method)
+        """)
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_acc_tasks_assignee_status
+            ON tbl_accounting_tasks(assignee_id, status, assigned_at DESC)
+            WHERE status IN ('Pending', 'Accepted')
+        """)
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_acc_tasks_cat
+            ON tbl_accounting_tasks(category, assigned_at)
+        """)
+        db.connection.commit()
+
         print("tbl_accounting_tasks table ready")
         return True
     except Exception as e:
+        db.connection.rollback()
         print(f"Error creating accounting tasks table: {e}")
         return False
 
 
+@_ttl_cache(ttl=300, group='employees')
 def get_accountants(db: DatabaseManager) -> list:
     """Get all employees in Accounting department"""
     try:
-        results = db.execute_query("""
-            SELECT employee_id, name, department, work_role
-            FROM tbl_employeer
-            WHERE LOWER(department) = 'accounting'
-        """)
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT employee_id, name, department, work_role
+                FROM tbl_employeer
+                WHERE LOWER(department) = 'accounting'
+            """)
+            results = cur.fetchall()
         print(f"✅ Accountants retrieved: {len(results) if results else 0}")
         return results if results else []
     except Exception as e:
@@ -7106,6 +7738,27 @@ def get_accountants(db: DatabaseManager) -> list:
         return []
 
 
+@_ttl_cache(ttl=300, group='employees')
+def get_accountant_ids_names(db: DatabaseManager) -> list:
+    """
+    Get the fields needed to list accountants for task assignment
+    
+    Returns:
+        List of (telegram_user_id, name, work_role) tuples
+    """
+    try:
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT telegram_user_id, name, work_role
+                FROM tbl_employeer
+                WHERE LOWER(department) = 'accounting'
+            """)
+            return cur.fetchall()
+    except Exception as e:
+        print(f"Error getting accountant ids: {e}")
+        return []
+
+
 def create_accounting_task(db: DatabaseManager, assignee_id: str, assignee_name: str, 
                           description: str, due_date: str = None, due_time: str = None,
                           assigned_by: str = None, assigned_by_name: str = None,
@@ -7115,18 +7768,18 @@ def create_accounting_task(db: DatabaseManager, assignee_id: str, assignee_name:
                           payment_method: str = 'cash') -> int:
     """Create a new accounting task with financial details"""
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_accounting_tasks 
-            (assignee_id, assignee_name, description, due_date, due_time, 
-             assigned_by, assigned_by_name, attachment_file_id, attachment_type,
-             category, amount, vendor_name, invoice_number, payment_method)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (assignee_id, assignee_name, description, due_date, due_time,
-              assigned_by, assigned_by_name, attachment_file_id, attachment_type,
-              category, amount, vendor_name, invoice_number, payment_method))
-        task_id = db.cursor.fetchone()[0]
-        db.connection.commit()
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('accounting_task_create', """
+                INSERT INTO tbl_accounting_tasks 
+                (assignee_id, assignee_name, description, due_date, due_time, 
+                 assigned_by, assigned_by_name, attachment_file_id, attachment_type,
+                 category, amount, vendor_name, invoice_number, payment_method)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+                RETURNING id
+            """, (assignee_id, assignee_name, description, due_date, due_time,
+                  assigned_by, assigned_by_name, attachment_file_id, attachment_type,
+                  category, amount, vendor_name, invoice_number, payment_method), cursor=cur)
+            task_id = cur.fetchone()[0]
         print(f"Accounting task created: ID {task_id}")
         return task_id
     except Exception as e:
@@ -7135,18 +7788,21 @@ def create_accounting_task(db: DatabaseManager, assignee_id: str, assignee_name:
 
 
 def get_accounting_tasks_by_assignee(db: DatabaseManager, assignee_id: str) -> list:
-    """Get all pending/accepted accounting tasks for a specific accountant"""
+    """
+    Get all pending/accepted accounting tasks for a specific accountant
+    
+    Returns:
+        List of (id, description preview, status) tuples for the task list
+    """
     try:
-        results = db.execute_query("""
-            SELECT id, description, due_date, due_time, status, assigned_at, 
-                   accepted_at, completed_at, assigned_by_name,
-                   category, amount, vendor_name, invoice_number, payment_method
-            FROM tbl_accounting_tasks
-            WHERE assignee_id = %s AND status IN ('Pending', 'Accepted')
-            ORDER BY 
-                CASE WHEN status = 'Pending' THEN 0 ELSE 1 END,
-                assigned_at DESC
-        """, (assignee_id,))
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('accounting_tasks_by_assignee', """
+                SELECT id, LEFT(description, 60) AS description, status
+                FROM tbl_accounting_tasks
+                WHERE assignee_id = $1 AND status IN ('Pending', 'Accepted')
+                ORDER BY status = 'Pending' DESC, assigned_at DESC
+            """, (assignee_id,), cursor=cur)
+            results = cur.fetchall()
         return results if results else []
     except Exception as e:
         print(f"Error getting accounting tasks by assignee: {e}")
@@ -7156,33 +7812,20 @@ def get_accounting_tasks_by_assignee(db: DatabaseManager, assignee_id: str) -> l
 def get_accounting_task_by_id(db: DatabaseManager, task_id: int) -> dict:
     """Get a specific accounting task by ID"""
     try:
-        result = db.execute_query("""
-            SELECT id, assignee_id, assignee_name, description, due_date, due_time,
-                   attachment_file_id, attachment_type, status, assigned_by, 
-                   assigned_by_name, assigned_at, accepted_at, completed_at,
-                   report_notes, report_media_file_id, report_media_type,
-                   category, amount, vendor_name, invoice_number, payment_method
-            FROM tbl_accounting_tasks
-            WHERE id = %s
-        """, (task_id,))
-        
-        if result:
-            row = result[0]
-            return {
-                'id': row[0], 'assignee_id': row[1], 'assignee_name': row[2],
-                'description': row[3], 'due_date': row[4], 'due_time': row[5],
-                'attachment_file_id': row[6], 'attachment_type': row[7],
-                'status': row[8], 'assigned_by': row[9], 'assigned_by_name': row[10],
-                'assigned_at': row[11], 'accepted_at': row[12], 'completed_at': row[13],
-                'report_notes': row[14], 'report_media_file_id': row[15], 
-                'report_media_type': row[16],
-                'category': row[17] if len(row) > 17 else 'other',
-                'amount': float(row[18]) if len(row) > 18 and row[18] else 0,
-                'vendor_name': row[19] if len(row) > 19 else None,
-                'invoice_number': row[20] if len(row) > 20 else None,
-                'payment_method': row[21] if len(row) > 21 else 'cash'
-            }
-        return None
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            db.execute_prepared('accounting_task_by_id', """
+                SELECT id, assignee_id, assignee_name, description, due_date, due_time,
+                       attachment_file_id, attachment_type, status, assigned_by, 
+                       assigned_by_name, assigned_at, accepted_at, completed_at,
+                       report_notes, report_media_file_id, report_media_type,
+                       category, COALESCE(amount, 0)::float8 AS amount,
+                       vendor_name, invoice_number, payment_method
+                FROM tbl_accounting_tasks
+                WHERE id = $1
+            """, (task_id,), cursor=cur)
+            row = cur.fetchone()
+        
+        return row
     except Exception as e:
         print(f"Error getting accounting task by ID: {e}")
         return None
@@ -7191,33 +7834,31 @@ def get_accounting_task_by_id(db: DatabaseManager, task_id: int) -> dict:
 def accept_accounting_task(db: DatabaseManager, task_id: int) -> bool:
     """Accept an accounting task"""
     try:
-        db.cursor.execute("""
-            SELECT status FROM tbl_accounting_tasks WHERE id = %s
-        """, (task_id,))
-        result = db.cursor.fetchone()
-        
-        if not result:
-            print(f"❌ Accounting task {task_id} not found")
-            return False
+        with db.pooled_cursor() as cur:
+            # Status check and update in one statement
+            db.execute_prepared('accounting_task_accept', """
+                UPDATE tbl_accounting_tasks 
+                SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
+                WHERE id = $1 AND status = 'Pending'
+                RETURNING id
+            """, (task_id,), cursor=cur)
+            accepted = cur.fetchone()
             
-        current_status = result[0]
-        if current_status != 'Pending':
-            print(f"⚠️ Accounting task {task_id} already {current_status}")
-            return False
-        
-        db.cursor.execute("""
-            UPDATE tbl_accounting_tasks 
-            SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND status = 'Pending'
-        """, (task_id,))
-        db.connection.commit()
+            if not accepted:
+                # Only on a miss: tell "not found" apart from "already processed"
+                db.execute_prepared('accounting_task_status', """
+                    SELECT status FROM tbl_accounting_tasks WHERE id = $1
+                """, (task_id,), cursor=cur)
+                result = cur.fetchone()
         
-        if db.cursor.rowcount > 0:
+        if accepted:
             print(f"✅ Accounting task {task_id} accepted")
             return True
+        if not result:
+            print(f"❌ Accounting task {task_id} not found")
         else:
-            print(f"⚠️ Accounting task {task_id} was not updated")
-            return False
+            print(f"⚠️ Accounting task {task_id} already {result[0]}")
+        return False
     except Exception as e:
         print(f"Error accepting accounting task: {e}")
         return False
@@ -7227,13 +7868,20 @@ def complete_accounting_task(db: DatabaseManager, task_id: int, report_notes: st
                             report_media_file_id: str = None, report_media_type: str = None) -> bool:
     """Complete an accounting task with optional report"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_accounting_tasks 
-            SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
-                report_notes = %s, report_media_file_id = %s, report_media_type = %s
-            WHERE id = %s
-        """, (report_notes, report_media_file_id, report_media_type, task_id))
-        db.connection.commit()
+        with db.pooled_cursor() as cur:
+            # Only open tasks can be completed; RETURNING tells whether a row was updated
+            db.execute_prepared('accounting_task_complete', """
+                UPDATE tbl_accounting_tasks 
+                SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
+                    report_notes = $1, report_media_file_id = $2, report_media_type = $3
+                WHERE id = $4 AND status IN ('Pending', 'Accepted')
+                RETURNING id
+            """, (report_notes, report_media_file_id, report_media_type, task_id), cursor=cur)
+            completed = cur.fetchone()
+        
+        if not completed:
+            print(f"⚠️ Accounting task {task_id} not found or already completed")
+            return False
         print(f"✅ Accounting task {task_id} completed")
         return True
     except Exception as e:
@@ -7241,6 +7889,36 @@ def complete_accounting_task(db: DatabaseManager, task_id: int, report_notes: st
         return False
 
 
+@lru_cache(maxsize=8)
+def _period_range(period: str, day) -> Optional[tuple]:
+    """
+    Date window and label for a daily/weekly/monthly report containing day
+    
+    Returns:
+        (start_date, end_date, period_label) with 'YYYY-MM-DD' bounds (end exclusive),
+        or None for an unknown period
+    """
+    if period == 'daily':
+        start, end = day, day + timedelta(days=1)
+        period_label = f"Danas ({day.strftime('%d.%m.%Y')})"
+    elif period == 'weekly':
+        # Start of week (Monday)
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=7)
+        period_label = f"Ova nedelja ({start.strftime('%d.%m')} - {(end - timedelta(days=1)).strftime('%d.%m.%Y')})"
+    elif period == 'monthly':
+        start = day.replace(day=1)
+        # First day of next month
+        if day.month == 12:
+            end = day.replace(year=day.year+1, month=1, day=1)
+        else:
+            end = day.replace(month=day.month+1, day=1)
+        period_label = f"Ovaj mesec ({day.strftime('%B %Y')})"
+    else:
+        return None
+    return start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'), period_label
+
+
 def get_accounting_tasks_summary(db: DatabaseManager, period: str = 'daily') -> dict:
     """
     Get accounting tasks summary with financial analysis
@@ -7252,76 +7930,47 @@ def get_accounting_tasks_summary(db: DatabaseManager, period: str = 'daily') ->
     Returns:
         Summary dict with totals by category, status counts, amounts
     """
-    from datetime import datetime, timedelta
-    
     try:
-        today = datetime.now()
-        
-        if period == 'daily':
-            start_date = today.strftime('%Y-%m-%d')
-            end_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-        elif period == 'weekly':
-            start_of_week = today - timedelta(days=today.weekday())
-            start_date = start_of_week.strftime('%Y-%m-%d')
-            end_date = (start_of_week + timedelta(days=7)).strftime('%Y-%m-%d')
-        else:  # monthly
-            start_date = today.replace(day=1).strftime('%Y-%m-%d')
-            if today.month == 12:
-                end_date = today.replace(year=today.year+1, month=1, day=1).strftime('%Y-%m-%d')
-            else:
-                end_date = today.replace(month=today.month+1, day=1).strftime('%Y-%m-%d')
+        # Anything other than daily/weekly is reported as monthly
+        range_period = period if period in ('daily', 'weekly') else 'monthly'
+        start_date, end_date, _ = _period_range(range_period, date.today())
+        
+        # Status, category, payment method and overall totals from one GROUPING SETS scan;
+        # GROUPING(col) = 0 marks the pivot a row belongs to, the () set is the grand total
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                SELECT status, category, method,
+                       GROUPING(status), GROUPING(category), GROUPING(method),
+                       COUNT(*), COALESCE(SUM(amount), 0)::float8,
+                       COUNT(*) FILTER (WHERE status = 'Completed'),
+                       COALESCE(SUM(amount) FILTER (WHERE status = 'Completed'), 0)::float8
+                FROM (
+                    SELECT status, COALESCE(category, 'other') as category,
+                           COALESCE(payment_method, 'cash') as method, amount
+                    FROM tbl_accounting_tasks
+                    WHERE assigned_at >= %s AND assigned_at < %s
+                ) w
+                GROUP BY GROUPING SETS ((status), (category), (method), ())
+                ORDER BY 8 DESC
+            """, (start_date, end_date))
+            rows = cur.fetchall()
         
-        # Status counts
-        db.cursor.execute("""
-            SELECT status, COUNT(*) as cnt
-            FROM tbl_accounting_tasks 
-            WHERE assigned_at >= %s AND assigned_at < %s
-            GROUP BY status
-        """, (start_date, end_date))
         status_counts = {}
-        for row in db.cursor.fetchall():
-            status_counts[row[0]] = row[1]
-        
-        # Category totals
-        db.cursor.execute("""
-            SELECT COALESCE(category, 'other'), COUNT(*), COALESCE(SUM(amount), 0)
-            FROM tbl_accounting_tasks
-            WHERE assigned_at >= %s AND assigned_at < %s
-            GROUP BY COALESCE(category, 'other')
-            ORDER BY COALESCE(SUM(amount), 0) DESC
-        """, (start_date, end_date))
         category_data = []
-        for row in db.cursor.fetchall():
-            category_data.append({
-                'category': row[0],
-                'count': row[1],
-                'total_amount': float(row[2]) if row[2] else 0
-            })
-        
-        # Overall totals
-        db.cursor.execute("""
-            SELECT COUNT(*), COALESCE(SUM(amount), 0)
-            FROM tbl_accounting_tasks
-            WHERE assigned_at >= %s AND assigned_at < %s
-        """, (start_date, end_date))
-        row = db.cursor.fetchone()
-        total_tasks = row[0] if row else 0
-        total_amount = float(row[1]) if row and row[1] else 0
-        
-        # Payment method breakdown
-        db.cursor.execute("""
-            SELECT COALESCE(payment_method, 'cash'), COUNT(*), COALESCE(SUM(amount), 0)
-            FROM tbl_accounting_tasks
-            WHERE assigned_at >= %s AND assigned_at < %s AND status = 'Completed'
-            GROUP BY COALESCE(payment_method, 'cash')
-        """, (start_date, end_date))
         payment_data = []
-        for row in db.cursor.fetchall():
-            payment_data.append({
-                'method': row[0],
-                'count': row[1],
-                'total': float(row[2]) if row[2] else 0
-            })
+        total_tasks, total_amount = 0, 0
+        for (status, category, method, status_rolled, category_rolled, method_rolled,
+             count, amount, completed_count, completed_amount) in rows:
+            if not status_rolled:
+                status_counts[status] = count
+            elif not category_rolled:
+                category_data.append({'category': category, 'count': count, 'total_amount': amount})
+            elif not method_rolled:
+                # Payment breakdown only covers completed tasks
+                if completed_count:
+                    payment_data.append({'method': method, 'count': completed_count, 'total': completed_amount})
+            else:
+                total_tasks, total_amount = count, amount
         
         return {
             'period': period,
@@ -7343,197 +7992,210 @@ def get_accounting_tasks_history(db: DatabaseManager, start_date: str = None,
                                  limit: int = 20) -> list:
     """Get accounting tasks history with filters"""
     try:
-        query = """
-            SELECT id, assignee_name, description, due_date, due_time, status,
-                   assigned_at, completed_at, assigned_by_name,
-                   category, amount, vendor_name, invoice_number, payment_method
-            FROM tbl_accounting_tasks
-            WHERE 1=1
-        """
-        params = []
-        
+        # Only the filters in use go into the WHERE clause; one prepared statement per shape
+        conditions, params, shape = [], [], ''
         if start_date:
-            query += " AND assigned_at >= %s"
             params.append(start_date)
+            conditions.append(f"assigned_at >= ${len(params)}::timestamp")
+            shape += 's'
         if end_date:
-            query += " AND assigned_at < %s"
             params.append(end_date)
+            conditions.append(f"assigned_at < ${len(params)}::timestamp")
+            shape += 'e'
         if category:
-            query += " AND category = %s"
             params.append(category)
-        
-        query += " ORDER BY assigned_at DESC LIMIT %s"
+            conditions.append(f"category = ${len(params)}::text")
+            shape += 'c'
         params.append(limit)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            db.execute_prepared(f'accounting_tasks_history_{shape or "all"}', f"""
+                SELECT id, assignee_name, description, due_date, due_time, status,
+                       assigned_at, completed_at, assigned_by_name,
+                       category, COALESCE(amount, 0)::float8 AS amount,
+                       vendor_name, invoice_number, payment_method
+                FROM tbl_accounting_tasks
+                {where_clause}
+                ORDER BY assigned_at DESC
+                LIMIT ${len(params)}
+            """, tuple(params), cursor=cur)
+            tasks = cur.fetchall()
         
-        results = db.execute_query(query, tuple(params))
-        
-        tasks = []
-        if results:
-            for row in results:
-                tasks.append({
-                    'id': row[0], 'assignee_name': row[1], 'description': row[2],
-                    'due_date': row[3], 'due_time': row[4], 'status': row[5],
-                    'assigned_at': row[6], 'completed_at': row[7],
-                    'assigned_by_name': row[8], 'category': row[9],
-                    'amount': float(row[10]) if row[10] else 0,
-                    'vendor_name': row[11], 'invoice_number': row[12],
-                    'payment_method': row[13]
-                })
         return tasks
     except Exception as e:
         print(f"Error getting accounting history: {e}")
         return []
 
 
+_ACCOUNTING_SEED_COLUMNS = (
+    'assignee_id', 'assignee_name', 'description', 'due_date', 'due_time',
+    'status', 'assigned_by', 'assigned_by_name', 'assigned_at', 'accepted_at',
+    'completed_at', 'report_notes', 'category', 'amount', 'vendor_name',
+    'invoice_number', 'payment_method'
+)
+
+
+# Sample accounting tasks for February 2026; the ids/names repeat on every row, so intern them once
+_SAMPLE_ACCOUNTANT_ID = sys.intern("7836819730")
+_SAMPLE_ACCOUNTANT_NAME = sys.intern("CPN")
+_SAMPLE_ASSIGNER_ID = sys.intern("8541474860")
+_SAMPLE_ASSIGNER_NAME = sys.intern("Jovan")
+
+_SAMPLE_ACCOUNTING_TASKS = (
+    # Feb 1 - Supplier invoice
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Supplier invoice - ABC Food d.o.o.", 
+     "2026-02-02", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-01 09:00:00", "2026-02-01 09:15:00", "2026-02-01 14:30:00",
+     "Invoice verified and processed", "invoice", 125000.00, 
+     "ABC Food d.o.o.", "INV-2026-0201", "bank_transfer"),
+    
+    # Feb 1 - Petty cash
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Petty cash - Office supplies",
+     "2026-02-01", "12:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-01 10:00:00", "2026-02-01 10:05:00", "2026-02-01 11:30:00",
+     "Receipt collected and filed", "petty_cash", 3500.00,
+     "Papirnica Beograd", None, "cash"),
+    
+    # Feb 2 - Utility bill
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Electricity bill - January 2026",
+     "2026-02-05", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-02 08:30:00", "2026-02-02 08:45:00", "2026-02-02 10:00:00",
+     "Payment processed via bank", "utility", 87500.00,
+     "EPS Distribucija", "EPS-JAN-2026", "bank_transfer"),
+    
+    # Feb 2 - Guest deposit
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Guest deposit - Room 205 check-in",
+     "2026-02-02", "14:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-02 13:00:00", "2026-02-02 13:05:00", "2026-02-02 13:30:00",
+     "Deposit received and recorded", "deposit", 15000.00,
+     None, "DEP-0205-0202", "cash"),
+    
+    # Feb 3 - Supplier payment
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Cleaning supplies - Hemija Plus",
+     "2026-02-04", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-03 09:00:00", "2026-02-03 09:10:00", "2026-02-03 15:00:00",
+     "Invoice paid, goods received", "supplier", 45000.00,
+     "Hemija Plus d.o.o.", "INV-HP-1234", "bank_transfer"),
+    
+    # Feb 3 - Receipt recording
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Restaurant daily revenue recording",
+     "2026-02-03", "22:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-03 20:00:00", "2026-02-03 20:05:00", "2026-02-03 21:30:00",
+     "Daily revenue reconciled", "receipt", 230000.00,
+     None, "RCV-0203", "cash"),
+    
+    # Feb 4 - Tax payment
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] VAT payment - Q4 2025",
+     "2026-02-10", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-04 09:00:00", "2026-02-04 09:30:00", "2026-02-04 11:00:00",
+     "Tax payment submitted to PU", "tax", 450000.00,
+     "Poreska Uprava", "PDV-Q4-2025", "bank_transfer"),
+    
+    # Feb 4 - Refund processing
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Guest refund - Room 301 early checkout",
+     "2026-02-04", "15:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-04 12:00:00", "2026-02-04 12:10:00", "2026-02-04 14:00:00",
+     "Refund processed to guest card", "refund", 8500.00,
+     None, "REF-0301-0204", "card"),
+    
+    # Feb 5 - Salary payment
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Staff salary - January 2026 Reception",
+     "2026-02-05", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-05 09:00:00", "2026-02-05 09:15:00", "2026-02-05 16:00:00",
+     "Salaries transferred for 5 employees", "salary", 750000.00,
+     None, "SAL-JAN-REC", "bank_transfer"),
+    
+    # Feb 5 - Supplier invoice
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Laundry chemicals - Clean Pro",
+     "2026-02-07", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-05 14:00:00", "2026-02-05 14:10:00", "2026-02-05 16:30:00",
+     "Invoice received, scheduled for payment", "invoice", 32000.00,
+     "Clean Pro d.o.o.", "INV-CP-5678", "bank_transfer"),
+    
+    # Feb 6 - Audit task
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Monthly cash audit - January 2026",
+     "2026-02-07", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-06 09:00:00", "2026-02-06 09:20:00", "2026-02-06 17:00:00",
+     "Cash count verified, report submitted", "audit", 0,
+     None, "AUD-JAN-2026", None),
+    
+    # Feb 6 - Bank transaction
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Bank reconciliation - weekly",
+     "2026-02-06", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-06 14:00:00", "2026-02-06 14:10:00", "2026-02-06 16:00:00",
+     "All transactions reconciled", "bank", 0,
+     "Komercijalna Banka", "BNK-W05-2026", "bank_transfer"),
+    
+    # Feb 7 - Receipt 
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Weekend room revenue recording",
+     "2026-02-07", "22:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-07 20:00:00", "2026-02-07 20:05:00", "2026-02-07 21:00:00",
+     "Weekend revenue entered", "receipt", 185000.00,
+     None, "RCV-0207", "mixed"),
+    
+    # Feb 7 - Supplier payment
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Kitchen supplies - Maxi Gastro",
+     "2026-02-08", "17:00", "Completed", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-07 10:00:00", "2026-02-07 10:15:00", "2026-02-07 14:00:00",
+     "Payment processed", "supplier", 67000.00,
+     "Maxi Gastro d.o.o.", "INV-MG-9012", "bank_transfer"),
+    
+    # Feb 8 - Pending tasks
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Water bill - January 2026",
+     "2026-02-10", "17:00", "Pending", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-08 08:00:00", None, None,
+     None, "utility", 42000.00,
+     "BVK Beograd", "BVK-JAN-2026", "bank_transfer"),
+    
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Staff salary - January 2026 Housekeeping",
+     "2026-02-08", "17:00", "Accepted", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-08 08:30:00", "2026-02-08 08:45:00", None,
+     None, "salary", 620000.00,
+     None, "SAL-JAN-HSK", "bank_transfer"),
+    
+    # Feb 8 - Financial report
+    (_SAMPLE_ACCOUNTANT_ID, _SAMPLE_ACCOUNTANT_NAME, "[SAMPLE] Weekly financial report - W5 2026",
+     "2026-02-09", "12:00", "Pending", _SAMPLE_ASSIGNER_ID, _SAMPLE_ASSIGNER_NAME,
+     "2026-02-08 09:00:00", None, None,
+     None, "report", 0,
+     None, "RPT-W05-2026", None),
+)
+
+
 def insert_sample_accounting_data(db: DatabaseManager) -> bool:
     """Insert sample accounting data from February 1, 2026 for analysis"""
     try:
-        # Check if sample data already exists
-        db.cursor.execute("""
-            SELECT COUNT(*) FROM tbl_accounting_tasks 
-            WHERE assigned_at >= '2026-02-01' AND assigned_at < '2026-02-09'
-            AND description LIKE '%[SAMPLE]%'
-        """)
-        count = db.cursor.fetchone()[0]
-        if count > 0:
-            print(f"Sample data already exists ({count} records)")
-            return True
-        
-        sample_tasks = [
-            # Feb 1 - Supplier invoice
-            ("7836819730", "CPN", "[SAMPLE] Supplier invoice - ABC Food d.o.o.", 
-             "2026-02-02", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-01 09:00:00", "2026-02-01 09:15:00", "2026-02-01 14:30:00",
-             "Invoice verified and processed", "invoice", 125000.00, 
-             "ABC Food d.o.o.", "INV-2026-0201", "bank_transfer"),
-            
-            # Feb 1 - Petty cash
-            ("7836819730", "CPN", "[SAMPLE] Petty cash - Office supplies",
-             "2026-02-01", "12:00", "Completed", "8541474860", "Jovan",
-             "2026-02-01 10:00:00", "2026-02-01 10:05:00", "2026-02-01 11:30:00",
-             "Receipt collected and filed", "petty_cash", 3500.00,
-             "Papirnica Beograd", None, "cash"),
-            
-            # Feb 2 - Utility bill
-            ("7836819730", "CPN", "[SAMPLE] Electricity bill - January 2026",
-             "2026-02-05", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-02 08:30:00", "2026-02-02 08:45:00", "2026-02-02 10:00:00",
-             "Payment processed via bank", "utility", 87500.00,
-             "EPS Distribucija", "EPS-JAN-2026", "bank_transfer"),
-            
-            # Feb 2 - Guest deposit
-            ("7836819730", "CPN", "[SAMPLE] Guest deposit - Room 205 check-in",
-             "2026-02-02", "14:00", "Completed", "8541474860", "Jovan",
-             "2026-02-02 13:00:00", "2026-02-02 13:05:00", "2026-02-02 13:30:00",
-             "Deposit received and recorded", "deposit", 15000.00,
-             None, "DEP-0205-0202", "cash"),
-            
-            # Feb 3 - Supplier payment
-            ("7836819730", "CPN", "[SAMPLE] Cleaning supplies - Hemija Plus",
-             "2026-02-04", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-03 09:00:00", "2026-02-03 09:10:00", "2026-02-03 15:00:00",
-             "Invoice paid, goods received", "supplier", 45000.00,
-             "Hemija Plus d.o.o.", "INV-HP-1234", "bank_transfer"),
-            
-            # Feb 3 - Receipt recording
-            ("7836819730", "CPN", "[SAMPLE] Restaurant daily revenue recording",
-             "2026-02-03", "22:00", "Completed", "8541474860", "Jovan",
-             "2026-02-03 20:00:00", "2026-02-03 20:05:00", "2026-02-03 21:30:00",
-             "Daily revenue reconciled", "receipt", 230000.00,
-             None, "RCV-0203", "cash"),
-            
-            # Feb 4 - Tax payment
-            ("7836819730", "CPN", "[SAMPLE] VAT payment - Q4 2025",
-             "2026-02-10", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-04 09:00:00", "2026-02-04 09:30:00", "2026-02-04 11:00:00",
-             "Tax payment submitted to PU", "tax", 450000.00,
-             "Poreska Uprava", "PDV-Q4-2025", "bank_transfer"),
-            
-            # Feb 4 - Refund processing
-            ("7836819730", "CPN", "[SAMPLE] Guest refund - Room 301 early checkout",
-             "2026-02-04", "15:00", "Completed", "8541474860", "Jovan",
-             "2026-02-04 12:00:00", "2026-02-04 12:10:00", "2026-02-04 14:00:00",
-             "Refund processed to guest card", "refund", 8500.00,
-             None, "REF-0301-0204", "card"),
-            
-            # Feb 5 - Salary payment
-            ("7836819730", "CPN", "[SAMPLE] Staff salary - January 2026 Reception",
-             "2026-02-05", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-05 09:00:00", "2026-02-05 09:15:00", "2026-02-05 16:00:00",
-             "Salaries transferred for 5 employees", "salary", 750000.00,
-             None, "SAL-JAN-REC", "bank_transfer"),
-            
-            # Feb 5 - Supplier invoice
-            ("7836819730", "CPN", "[SAMPLE] Laundry chemicals - Clean Pro",
-             "2026-02-07", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-05 14:00:00", "2026-02-05 14:10:00", "2026-02-05 16:30:00",
-             "Invoice received, scheduled for payment", "invoice", 32000.00,
-             "Clean Pro d.o.o.", "INV-CP-5678", "bank_transfer"),
-            
-            # Feb 6 - Audit task
-            ("7836819730", "CPN", "[SAMPLE] Monthly cash audit - January 2026",
-             "2026-02-07", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-06 09:00:00", "2026-02-06 09:20:00", "2026-02-06 17:00:00",
-             "Cash count verified, report submitted", "audit", 0,
-             None, "AUD-JAN-2026", None),
-            
-            # Feb 6 - Bank transaction
-            ("7836819730", "CPN", "[SAMPLE] Bank reconciliation - weekly",
-             "2026-02-06", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-06 14:00:00", "2026-02-06 14:10:00", "2026-02-06 16:00:00",
-             "All transactions reconciled", "bank", 0,
-             "Komercijalna Banka", "BNK-W05-2026", "bank_transfer"),
-            
-            # Feb 7 - Receipt 
-            ("7836819730", "CPN", "[SAMPLE] Weekend room revenue recording",
-             "2026-02-07", "22:00", "Completed", "8541474860", "Jovan",
-             "2026-02-07 20:00:00", "2026-02-07 20:05:00", "2026-02-07 21:00:00",
-             "Weekend revenue entered", "receipt", 185000.00,
-             None, "RCV-0207", "mixed"),
-            
-            # Feb 7 - Supplier payment
-            ("7836819730", "CPN", "[SAMPLE] Kitchen supplies - Maxi Gastro",
-             "2026-02-08", "17:00", "Completed", "8541474860", "Jovan",
-             "2026-02-07 10:00:00", "2026-02-07 10:15:00", "2026-02-07 14:00:00",
-             "Payment processed", "supplier", 67000.00,
-             "Maxi Gastro d.o.o.", "INV-MG-9012", "bank_transfer"),
-            
-            # Feb 8 - Pending tasks
-            ("7836819730", "CPN", "[SAMPLE] Water bill - January 2026",
-             "2026-02-10", "17:00", "Pending", "8541474860", "Jovan",
-             "2026-02-08 08:00:00", None, None,
-             None, "utility", 42000.00,
-             "BVK Beograd", "BVK-JAN-2026", "bank_transfer"),
-            
-            ("7836819730", "CPN", "[SAMPLE] Staff salary - January 2026 Housekeeping",
-             "2026-02-08", "17:00", "Accepted", "8541474860", "Jovan",
-             "2026-02-08 08:30:00", "2026-02-08 08:45:00", None,
-             None, "salary", 620000.00,
-             None, "SAL-JAN-HSK", "bank_transfer"),
-            
-            # Feb 8 - Financial report
-            ("7836819730", "CPN", "[SAMPLE] Weekly financial report - W5 2026",
-             "2026-02-09", "12:00", "Pending", "8541474860", "Jovan",
-             "2026-02-08 09:00:00", None, None,
-             None, "report", 0,
-             None, "RPT-W05-2026", None),
-        ]
-        
-        for task in sample_tasks:
-            db.cursor.execute("""
-                INSERT INTO tbl_accounting_tasks 
-                (assignee_id, assignee_name, description, due_date, due_time,
-                 status, assigned_by, assigned_by_name, assigned_at, accepted_at, 
-                 completed_at, report_notes, category, amount, vendor_name, 
-                 invoice_number, payment_method)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, task)
+        with db.pooled_cursor() as cur:
+            # Check if sample data already exists
+            cur.execute("""
+                SELECT COUNT(*) FROM tbl_accounting_tasks 
+                WHERE assigned_at >= '2026-02-01' AND assigned_at < '2026-02-09'
+                AND description LIKE '%[SAMPLE]%'
+            """)
+            count = cur.fetchone()[0]
+            if count > 0:
+                print(f"Sample data already exists ({count} records)")
+                return True
+            
+            # The check and the load share one transaction with a single commit at the end;
+            # seed data can be re-inserted after a crash, so don't wait for the WAL flush
+            cur.execute("SET LOCAL synchronous_commit = off")
+            
+            # Stream all sample rows through one COPY instead of INSERT statements
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for task in _SAMPLE_ACCOUNTING_TASKS:
+                writer.writerow([r'\N' if value is None else value for value in task])
+            buf.seek(0)
+            cur.copy_expert(
+                f"COPY tbl_accounting_tasks ({', '.join(_ACCOUNTING_SEED_COLUMNS)}) "
+                r"FROM STDIN WITH (FORMAT csv, NULL '\N')",
+                buf
+            )
         
-        db.connection.commit()
-        print(f"Sample accounting data inserted: {len(sample_tasks)} records")
+        print(f"Sample accounting data inserted: {len(_SAMPLE_ACCOUNTING_TASKS)} records")
         return True
     except Exception as e:
-        db.connection.rollback()
         print(f"Error inserting sample data: {e}")
         return False
 
@@ -7554,11 +8216,7 @@ def get_department_task_stats(db: DatabaseManager, department: str, period: str
     Returns:
         Dictionary with task statistics
     """
-    from datetime import datetime, timedelta
-    
     try:
-        today = datetime.now()
-        
         # Determine table and date field based on department
         table_map = {
             'Laundry': ('tbl_laundry_tasks', 'assigned_at'),
@@ -7572,73 +8230,66 @@ def get_department_task_stats(db: DatabaseManager, department: str, period: str
         
         table_name, date_field = table_map[department]
         
-        # Check if table exists (PostgreSQL)
-        db.cursor.execute("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' AND table_name = %s
-            )
-        """, (table_name,))
-        if not db.cursor.fetchone()[0]:
-            return {'total': 0, 'pending': 0, 'accepted': 0, 'completed': 0, 'tasks': [], 'period_label': ''}
-        
         # Calculate date range based on period
-        if period == 'daily':
-            start_date = today.strftime('%Y-%m-%d')
-            end_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-            period_label = f"Danas ({today.strftime('%d.%m.%Y')})"
-        elif period == 'weekly':
-            # Start of week (Monday)
-            start_of_week = today - timedelta(days=today.weekday())
-            end_of_week = start_of_week + timedelta(days=7)
-            start_date = start_of_week.strftime('%Y-%m-%d')
-            end_date = end_of_week.strftime('%Y-%m-%d')
-            period_label = f"Ova nedelja ({start_of_week.strftime('%d.%m')} - {(end_of_week - timedelta(days=1)).strftime('%d.%m.%Y')})"
-        elif period == 'monthly':
-            start_date = today.replace(day=1).strftime('%Y-%m-%d')
-            # First day of next month
-            if today.month == 12:
-                end_date = today.replace(year=today.year+1, month=1, day=1).strftime('%Y-%m-%d')
-            else:
-                end_date = today.replace(month=today.month+1, day=1).strftime('%Y-%m-%d')
-            period_label = f"Ovaj mesec ({today.strftime('%B %Y')})"
-        else:
+        period_range = _period_range(period, date.today())
+        if period_range is None:
             return None
-        
-        # Get task counts by status
-        db.cursor.execute(f"""
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) as pending,
-                SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) as accepted,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed
-            FROM {table_name}
-            WHERE DATE({date_field}) >= %s AND DATE({date_field}) < %s
-        """, (start_date, end_date))
-        
-        row = db.cursor.fetchone()
-        total, pending, accepted, completed = row if row else (0, 0, 0, 0)
-        
-        # Get recent tasks (up to 10)
-        db.cursor.execute(f"""
-            SELECT id, assignee_name, description, status, {date_field}, completed_at
-            FROM {table_name}
-            WHERE DATE({date_field}) >= %s AND DATE({date_field}) < %s
-            ORDER BY {date_field} DESC
-            LIMIT 10
-        """, (start_date, end_date))
+        start_date, end_date, period_label = period_range
+        
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            # Check if table exists (PostgreSQL); a positive answer is remembered for the process
+            if table_name not in _existing_tables:
+                cur.execute("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_schema = 'public' AND table_name = %s
+                    ) AS present
+                """, (table_name,))
+                if not cur.fetchone()['present']:
+                    return {'total': 0, 'pending': 0, 'accepted': 0, 'completed': 0, 'tasks': [], 'period_label': ''}
+                _existing_tables.add(table_name)
+            
+            # Status counts and the 10 most recent tasks from one scan of the window;
+            # every row repeats the counts, and an empty window still yields one row
+            cur.execute(f"""
+                WITH w AS (
+                    SELECT id, assignee_name,
+                           CASE WHEN length(description) > 30
+                                THEN left(description, 30) || '...'
+                                ELSE description END AS description,
+                           status, {date_field} AS ts, completed_at
+                    FROM {table_name}
+                    WHERE {date_field} >= %s AND {date_field} < %s
+                ), c AS (
+                    SELECT 
+                        COUNT(*) as total,
+                        COUNT(*) FILTER (WHERE status = 'Pending') as pending,
+                        COUNT(*) FILTER (WHERE status = 'Accepted') as accepted,
+                        COUNT(*) FILTER (WHERE status = 'Completed') as completed
+                    FROM w
+                )
+                SELECT c.total, c.pending, c.accepted, c.completed,
+                       r.id, r.assignee_name AS assignee, r.description, r.status,
+                       r.ts AS assigned_at, r.completed_at
+                FROM c
+                LEFT JOIN LATERAL (
+                    SELECT * FROM w ORDER BY ts DESC LIMIT 10
+                ) r ON TRUE
+            """, (start_date, end_date))
+            rows = cur.fetchall()
+        
+        total, pending, accepted, completed = (
+            (rows[0]['total'], rows[0]['pending'], rows[0]['accepted'], rows[0]['completed'])
+            if rows else (0, 0, 0, 0)
+        )
         
         tasks = []
-        for task in db.cursor.fetchall():
-            task_id, assignee, desc, status, assigned_at, completed_at = task
-            tasks.append({
-                'id': task_id,
-                'assignee': assignee,
-                'description': desc[:30] + '...' if len(desc) > 30 else desc,
-                'status': status,
-                'assigned_at': assigned_at,
-                'completed_at': completed_at
-            })
+        for task in rows:
+            if task['id'] is None:
+                continue
+            for key in ('total', 'pending', 'accepted', 'completed'):
+                del task[key]
+            tasks.append(task)
         
         return {
             'total': total or 0,
@@ -7656,55 +8307,38 @@ def get_department_task_stats(db: DatabaseManager, department: str, period: str
 
 def get_clean_history_stats(db: DatabaseManager, period: str = 'daily') -> dict:
     """Get cleaning statistics by period"""
-    from datetime import datetime, timedelta
-    
     try:
-        today = datetime.now()
-        
-        if period == 'daily':
-            start_date = today.strftime('%Y-%m-%d')
-            end_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
-            period_label = f"Danas ({today.strftime('%d.%m.%Y')})"
-        elif period == 'weekly':
-            start_of_week = today - timedelta(days=today.weekday())
-            end_of_week = start_of_week + timedelta(days=7)
-            start_date = start_of_week.strftime('%Y-%m-%d')
-            end_date = end_of_week.strftime('%Y-%m-%d')
-            period_label = f"Ova nedelja ({start_of_week.strftime('%d.%m')} - {(end_of_week - timedelta(days=1)).strftime('%d.%m.%Y')})"
-        elif period == 'monthly':
-            start_date = today.replace(day=1).strftime('%Y-%m-%d')
-            if today.month == 12:
-                end_date = today.replace(year=today.year+1, month=1, day=1).strftime('%Y-%m-%d')
-            else:
-                end_date = today.replace(month=today.month+1, day=1).strftime('%Y-%m-%d')
-            period_label = f"Ovaj mesec ({today.strftime('%B %Y')})"
-        else:
+        period_range = _period_range(period, date.today())
+        if period_range is None:
             return None
+        start_date, end_date, period_label = period_range
         
-        # Get cleaning counts
-        db.cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(DISTINCT cleaned_by) as cleaners,
-                COUNT(DISTINCT room_number) as rooms_cleaned
-            FROM tbl_clean_history
-            WHERE DATE(created_at) >= %s AND DATE(created_at) < %s
-        """, (start_date, end_date))
-        
-        row = db.cursor.fetchone()
-        total, cleaners, rooms = row if row else (0, 0, 0)
-        
-        # Get recent cleaning records
-        db.cursor.execute("""
-            SELECT id, room_number, cleaned_by_name, clean_type, created_at
-            FROM tbl_clean_history
-            WHERE DATE(created_at) >= %s AND DATE(created_at) < %s
-            ORDER BY created_at DESC
-            LIMIT 10
-        """, (start_date, end_date))
+        with db.pooled_cursor() as cur:
+            # Get cleaning counts
+            cur.execute("""
+                SELECT 
+                    COUNT(*) as total,
+                    COUNT(DISTINCT cleaned_by) as cleaners,
+                    COUNT(DISTINCT room_number) as rooms_cleaned
+                FROM tbl_clean_history
+                WHERE created_at >= %s AND created_at < %s
+            """, (start_date, end_date))
+            
+            row = cur.fetchone()
+            total, cleaners, rooms = row if row else (0, 0, 0)
+            
+            # Get recent cleaning records
+            cur.execute("""
+                SELECT id, room_number, cleaned_by_name, clean_type, created_at
+                FROM tbl_clean_history
+                WHERE created_at >= %s AND created_at < %s
+                ORDER BY created_at DESC
+                LIMIT 10
+            """, (start_date, end_date))
+            recent = cur.fetchall()
         
         records = []
-        for record in db.cursor.fetchall():
+        for record in recent:
             rec_id, room, cleaner, clean_type, created_at = record
             records.append({
                 'id': rec_id,
@@ -7762,22 +8396,71 @@ def create_repair_tasks_table(db: DatabaseManager):
         """)
         db.connection.commit()
         
-        # Add proof columns if they don't exist (for existing tables)
-        try:
-            db.cursor.execute("ALTER TABLE tbl_repair_tasks ADD COLUMN IF NOT EXISTS proof_media_type TEXT")
-            db.connection.commit()
-        except:
-            pass
-        try:
-            db.cursor.execute("ALTER TABLE tbl_repair_tasks ADD COLUMN IF NOT EXISTS proof_file_id TEXT")
-            db.connection.commit()
-        except:
-            pass
+        # Add proof columns only on tables created before they were part of the schema
+        db.cursor.execute("""
+            SELECT column_name 
+            FROM information_schema.columns 
+            WHERE table_name = 'tbl_repair_tasks'
+        """)
+        columns = {col['column_name'] for col in db.cursor.fetchall()}
+        for column in ('proof_media_type', 'proof_file_id'):
+            if column not in columns:
+                db.cursor.execute(f"ALTER TABLE tbl_repair_tasks ADD COLUMN IF NOT EXISTS {column} TEXT")
+                print(f"✅ {column} column added to tbl_repair_tasks")
+        
+        # Sortable priority so the open-task list can be read in index order.
+        # Generated columns need PostgreSQL 12+; older servers keep the CASE ordering.
+        has_priority_rank = 'priority_rank' in columns
+        if not has_priority_rank:
+            db.cursor.execute("SAVEPOINT repair_priority_rank")
+            try:
+                db.cursor.execute("""
+                    ALTER TABLE tbl_repair_tasks ADD COLUMN IF NOT EXISTS priority_rank SMALLINT
+                    GENERATED ALWAYS AS (
+                        CASE priority WHEN 'Urgent' THEN 1 WHEN 'High' THEN 2 WHEN 'Normal' THEN 3 ELSE 4 END
+                    ) STORED
+                """)
+                db.cursor.execute("RELEASE SAVEPOINT repair_priority_rank")
+                has_priority_rank = True
+                print("✅ priority_rank column added to tbl_repair_tasks")
+            except psycopg2.Error as e:
+                db.cursor.execute("ROLLBACK TO SAVEPOINT repair_priority_rank")
+                print(f"⚠️ Could not add priority_rank to tbl_repair_tasks, keeping CASE ordering: {e}")
+        
+        # Indexes for the open-task list per technician, status listings and the period stats
+        if has_priority_rank:
+            # Same open-status predicate with (assignee_id, status) as its prefix,
+            # so it serves every lookup the narrower index did
+            db.cursor.execute("DROP INDEX IF EXISTS idx_repair_assignee_status")
+            db.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_repair_assignee_priority
+                ON tbl_repair_tasks(assignee_id, status, priority_rank, due_date, due_time)
+                WHERE status IN ('Pending', 'Accepted')
+            """)
+        else:
+            db.cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_repair_assignee_status
+                ON tbl_repair_tasks(assignee_id, status)
+                WHERE status IN ('Pending', 'Accepted')
+            """)
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_repair_status_assigned_at
+            ON tbl_repair_tasks(status, assigned_at DESC)
+        """)
+        # get_repair_task_stats filters on an assigned_at range, not DATE(assigned_at)
+        db.cursor.execute("DROP INDEX IF EXISTS idx_repair_assigned_at_date")
+        db.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_repair_assigned_at
+            ON tbl_repair_tasks(assigned_at)
+        """)
+        db.connection.commit()
             
         print("✅ tbl_repair_tasks table ready")
         return True
     except Exception as e:
         print(f"Error creating repair tasks table: {e}")
+        if db.connection:
+            db.connection.rollback()
         return False
 
 
@@ -7787,12 +8470,13 @@ def get_technical_employees(db: DatabaseManager) -> list:
         result = db.execute_query("""
             SELECT telegram_user_id, employee_id, name, work_role 
             FROM tbl_employeer 
-            WHERE department = 'Technical' OR department = 'technical'
+            WHERE LOWER(department) = 'technical'
             ORDER BY name
+            LIMIT 100
         """)
         return result if result else []
     except Exception as e:
-        print(f"Error getting technical employees: {e}")
+        logger.error("Error getting technical employees: %s", e)
         return []
 
 
@@ -7802,40 +8486,89 @@ def create_repair_task(db: DatabaseManager, room_id: int, room_number: str, floo
                        proof_required: int, assigned_by: int, assigned_by_name: str) -> int:
     """Create a new repair task"""
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_repair_tasks 
-            (room_id, room_number, floor, assignee_id, assignee_name, description,
-             repair_type, priority, due_date, due_time, proof_required, 
-             assigned_by, assigned_by_name, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'Pending')
-            RETURNING id
-        """, (room_id, room_number, floor, assignee_id, assignee_name, description,
-              repair_type, priority, due_date, due_time, proof_required, 
-              assigned_by, assigned_by_name))
-        task_id = db.cursor.fetchone()[0]
-        db.connection.commit()
-        print(f"✅ Repair task created: ID {task_id}, Room {room_number}")
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('repair_task_create', """
+                INSERT INTO tbl_repair_tasks 
+                (room_id, room_number, floor, assignee_id, assignee_name, description,
+                 repair_type, priority, due_date, due_time, proof_required, 
+                 assigned_by, assigned_by_name, status)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, 'Pending')
+                RETURNING id
+            """, (room_id, room_number, floor, assignee_id, assignee_name, description,
+                  repair_type, priority, due_date, due_time, proof_required, 
+                  assigned_by, assigned_by_name), cursor=cur)
+            task_id = cur.fetchone()[0]
+        clear_cache_group('repairs')
+        logger.debug("Repair task created: ID %s, Room %s", task_id, room_number)
         return task_id
     except Exception as e:
-        print(f"Error creating repair task: {e}")
+        logger.error("Error creating repair task: %s", e)
         return None
 
 
+def create_repair_tasks_bulk(db: DatabaseManager, rows: list) -> list:
+    """
+    Create several repair tasks with a single multi-row INSERT
+    
+    Args:
+        rows: List of tuples in create_repair_task argument order
+              (room_id ... assigned_by_name)
+        
+    Returns:
+        List of created task IDs, empty list on error
+    """
+    if not rows:
+        return []
+    try:
+        with db.pooled_cursor() as cur:
+            results = psycopg2.extras.execute_values(cur, """
+                INSERT INTO tbl_repair_tasks 
+                (room_id, room_number, floor, assignee_id, assignee_name, description,
+                 repair_type, priority, due_date, due_time, proof_required, 
+                 assigned_by, assigned_by_name)
+                VALUES %s
+                RETURNING id
+            """, rows, page_size=100, fetch=True)
+        task_ids = [r[0] for r in results]
+        clear_cache_group('repairs')
+        logger.debug("Repair tasks created: %s", task_ids)
+        return task_ids
+    except Exception as e:
+        logger.error("Error creating repair tasks: %s", e)
+        return []
+
+
+_REPAIR_PENDING_SQL = """
+    SELECT id, room_id, room_number, floor, description, repair_type, priority,
+           due_date, due_time, proof_required, assigned_by_name, assigned_at, status
+    FROM tbl_repair_tasks 
+    WHERE assignee_id = $1 AND status IN ('Pending', 'Accepted')
+    ORDER BY {priority_order}, due_date ASC, due_time ASC
+"""
+
+
 def get_pending_repair_tasks(db: DatabaseManager, assignee_id: int) -> list:
     """Get pending repair tasks for an employee"""
+    global _repair_priority_rank_missing
     try:
-        result = db.execute_query("""
-            SELECT id, room_id, room_number, floor, description, repair_type, priority,
-                   due_date, due_time, proof_required, assigned_by_name, assigned_at, status
-            FROM tbl_repair_tasks 
-            WHERE assignee_id = %s AND status IN ('Pending', 'Accepted')
-            ORDER BY 
-                CASE priority WHEN 'Urgent' THEN 1 WHEN 'High' THEN 2 WHEN 'Normal' THEN 3 ELSE 4 END,
-                due_date ASC, due_time ASC
-        """, (assignee_id,))
+        # Tables without the generated priority_rank column (PostgreSQL < 12) sort with CASE
+        if not _repair_priority_rank_missing:
+            try:
+                with db.pooled_cursor(autocommit=True) as cur:
+                    db.execute_prepared('repair_tasks_pending', _REPAIR_PENDING_SQL.format(
+                        priority_order="priority_rank"), (assignee_id,), cursor=cur)
+                    result = cur.fetchall()
+                return result if result else []
+            except psycopg2.errors.UndefinedColumn:
+                _repair_priority_rank_missing = True
+        with db.pooled_cursor(autocommit=True) as cur:
+            db.execute_prepared('repair_tasks_pending_case', _REPAIR_PENDING_SQL.format(
+                priority_order="CASE priority WHEN 'Urgent' THEN 1 WHEN 'High' THEN 2 WHEN 'Normal' THEN 3 ELSE 4 END"),
+                (assignee_id,), cursor=cur)
+            result = cur.fetchall()
         return result if result else []
     except Exception as e:
-        print(f"Error getting pending repair tasks: {e}")
+        logger.error("Error getting pending repair tasks: %s", e)
         return []
 
 
@@ -7859,39 +8592,43 @@ def get_all_repair_tasks(db: DatabaseManager, status: str = None) -> list:
             """)
         return result if result else []
     except Exception as e:
-        print(f"Error getting repair tasks: {e}")
+        logger.error("Error getting repair tasks: %s", e)
         return []
 
 
 def get_repair_task_by_id(db: DatabaseManager, task_id: int) -> tuple:
     """Get repair task by ID"""
     try:
-        result = db.execute_query("""
-            SELECT id, room_id, room_number, floor, assignee_id, assignee_name, 
-                   description, repair_type, priority, due_date, due_time, 
-                   proof_required, proof_path, status, assigned_by, assigned_by_name,
-                   assigned_at, accepted_at, completed_at, report_notes
-            FROM tbl_repair_tasks 
-            WHERE id = %s
-        """, (task_id,))
-        return result[0] if result else None
+        with db.pooled_cursor(autocommit=True) as cur:
+            db.execute_prepared('repair_task_by_id', """
+                SELECT id, room_id, room_number, floor, assignee_id, assignee_name, 
+                       description, repair_type, priority, due_date, due_time, 
+                       proof_required, proof_path, status, assigned_by, assigned_by_name,
+                       assigned_at, accepted_at, completed_at, report_notes
+                FROM tbl_repair_tasks 
+                WHERE id = $1
+                LIMIT 1
+            """, (task_id,), cursor=cur)
+            return cur.fetchone()
     except Exception as e:
-        print(f"Error getting repair task: {e}")
+        logger.error("Error getting repair task: %s", e)
         return None
 
 
 def accept_repair_task(db: DatabaseManager, task_id: int) -> bool:
     """Accept a repair task"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_repair_tasks 
-            SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
-            WHERE id = %s AND status = 'Pending'
-        """, (task_id,))
-        db.connection.commit()
-        return db.cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error accepting repair task: {e}")
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('repair_task_accept', """
+                UPDATE tbl_repair_tasks 
+                SET status = 'Accepted', accepted_at = CURRENT_TIMESTAMP
+                WHERE id = $1 AND status = 'Pending'
+            """, (task_id,), cursor=cur)
+            accepted = cur.rowcount > 0
+        clear_cache_group('repairs')
+        return accepted
+    except Exception as e:
+        logger.error("Error accepting repair task: %s", e)
         return False
 
 
@@ -7900,517 +8637,280 @@ def complete_repair_task(db: DatabaseManager, task_id: int, report_notes: str =
                          proof_file_id: str = None) -> bool:
     """Complete a repair task with optional proof media"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_repair_tasks 
-            SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
-                report_notes = %s, proof_path = %s, proof_media_type = %s, proof_file_id = %s
-            WHERE id = %s AND status = 'Accepted'
-        """, (report_notes, proof_path, proof_media_type, proof_file_id, task_id))
-        db.connection.commit()
-        return db.cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error completing repair task: {e}")
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('repair_task_complete', """
+                UPDATE tbl_repair_tasks 
+                SET status = 'Completed', completed_at = CURRENT_TIMESTAMP,
+                    report_notes = $1, proof_path = $2, proof_media_type = $3, proof_file_id = $4
+                WHERE id = $5 AND status = 'Accepted'
+            """, (report_notes, proof_path, proof_media_type, proof_file_id, task_id), cursor=cur)
+            completed = cur.rowcount > 0
+        clear_cache_group('repairs')
+        return completed
+    except Exception as e:
+        logger.error("Error completing repair task: %s", e)
         return False
 
 
-def get_repair_tasks_summary(db: DatabaseManager) -> dict:
-    """Get summary of repair tasks"""
+@_ttl_cache(ttl=5, group='repairs')
+def _get_repair_tasks_summary(db: DatabaseManager) -> dict:
+    """Count repair tasks per status; empty on error so the failure is not cached"""
     try:
-        pending = db.execute_query(
-            "SELECT COUNT(*) FROM tbl_repair_tasks WHERE status = 'Pending'"
-        )[0][0]
-        accepted = db.execute_query(
-            "SELECT COUNT(*) FROM tbl_repair_tasks WHERE status = 'Accepted'"
-        )[0][0]
-        completed = db.execute_query(
-            "SELECT COUNT(*) FROM tbl_repair_tasks WHERE status = 'Completed'"
-        )[0][0]
-        total = db.execute_query(
-            "SELECT COUNT(*) FROM tbl_repair_tasks"
-        )[0][0]
-        return {
-            'pending': pending or 0,
-            'accepted': accepted or 0,
-            'completed': completed or 0,
-            'total': total or 0
-        }
+        # One scan bucketed by status instead of a COUNT(*) per status
+        with db.pooled_cursor(autocommit=True) as cur:
+            cur.execute("SELECT status, COUNT(*) FROM tbl_repair_tasks GROUP BY status")
+            rows = cur.fetchall()
+        
+        summary = {'pending': 0, 'accepted': 0, 'completed': 0, 'total': 0}
+        for status, count in rows:
+            key = (status or '').lower()
+            if key in summary:
+                summary[key] = count
+            summary['total'] += count
+        return summary
     except Exception as e:
-        print(f"Error getting repair tasks summary: {e}")
-        return {'pending': 0, 'accepted': 0, 'completed': 0, 'total': 0}
+        logger.error("Error getting repair tasks summary: %s", e)
+        return {}
+
+
+def get_repair_tasks_summary(db: DatabaseManager) -> dict:
+    """Get summary of repair tasks"""
+    return _get_repair_tasks_summary(db) or {'pending': 0, 'accepted': 0, 'completed': 0, 'total': 0}
+
+
+# Repair stats windows: period -> (first day of the window for a given day, label format)
+_REPAIR_STATS_PERIODS = {
+    'daily': (lambda day: day, "Danas ({start:%Y-%m-%d})"),
+    'weekly': (lambda day: day - timedelta(days=day.weekday()), "Ova nedelja (od {start:%Y-%m-%d})"),
+    'monthly': (lambda day: day.replace(day=1), "Ovaj mesec ({start:%B %Y})"),
+}
 
 
 def get_repair_task_stats(db: DatabaseManager, period: str = 'daily') -> dict:
     """Get repair task statistics by period"""
     try:
-        from datetime import datetime, timedelta
-        
-        now = datetime.now()
-        if period == 'daily':
-            date_filter = now.strftime('%Y-%m-%d')
-            period_label = f"Danas ({date_filter})"
-            where_clause = "DATE(assigned_at) = %s"
-        elif period == 'weekly':
-            week_start = now - timedelta(days=now.weekday())
-            date_filter = week_start.strftime('%Y-%m-%d')
-            period_label = f"Ova nedelja (od {date_filter})"
-            where_clause = "DATE(assigned_at) >= %s"
-        else:  # monthly
-            date_filter = now.strftime('%Y-%m-01')
-            period_label = f"Ovaj mesec ({now.strftime('%B %Y')})"
-            where_clause = "DATE(assigned_at) >= %s"
-        
-        total = db.execute_query(f"""
-            SELECT COUNT(*) FROM tbl_repair_tasks WHERE {where_clause}
-        """, (date_filter,))[0][0]
-        
-        pending = db.execute_query(f"""
-            SELECT COUNT(*) FROM tbl_repair_tasks 
-            WHERE {where_clause} AND status = 'Pending'
-        """, (date_filter,))[0][0]
-        
-        accepted = db.execute_query(f"""
-            SELECT COUNT(*) FROM tbl_repair_tasks 
-            WHERE {where_clause} AND status = 'Accepted'
-        """, (date_filter,))[0][0]
-        
-        completed = db.execute_query(f"""
-            SELECT COUNT(*) FROM tbl_repair_tasks 
-            WHERE {where_clause} AND status = 'Completed'
-        """, (date_filter,))[0][0]
-        
-        tasks = db.execute_query(f"""
-            SELECT id, assignee_name, description, status 
-            FROM tbl_repair_tasks 
-            WHERE {where_clause}
-            ORDER BY assigned_at DESC
-            LIMIT 10
-        """, (date_filter,))
-        
+        window_start, label_format = _REPAIR_STATS_PERIODS.get(period, _REPAIR_STATS_PERIODS['monthly'])
+        today = date.today()
+        start = window_start(today)
+        period_label = label_format.format(start=start)
+        
+        with db.pooled_cursor(autocommit=True) as cur:
+            # Status breakdown ('c' rows) and the 10 latest tasks ('r' rows) in one round trip
+            cur.execute("""
+                WITH w AS (
+                    SELECT id, assignee_name, description, status, assigned_at
+                    FROM tbl_repair_tasks 
+                    WHERE assigned_at >= %s AND assigned_at < %s
+                )
+                SELECT 'c' AS kind, NULL::int AS id, NULL AS assignee_name,
+                       NULL AS desc_short, status, COUNT(*) AS n
+                FROM w
+                GROUP BY status
+                UNION ALL
+                (SELECT 'r', id, assignee_name,
+                        CASE WHEN length(description) > 30
+                             THEN substring(description, 1, 30) || '...'
+                             ELSE description END,
+                        status, NULL
+                 FROM w
+                 ORDER BY assigned_at DESC
+                 LIMIT 10)
+            """, (start, today + timedelta(days=1)))
+            rows = cur.fetchall()
+        
+        counts = {'Pending': 0, 'Accepted': 0, 'Completed': 0}
+        total = 0
         task_list = []
-        for task in (tasks or []):
-            task_list.append({
-                'id': task[0],
-                'assignee': task[1],
-                'description': task[2][:30] + '...' if len(task[2]) > 30 else task[2],
-                'status': task[3]
-            })
+        for kind, task_id, assignee, desc_short, status, count in rows:
+            if kind == 'r':
+                task_list.append({'id': task_id, 'assignee': assignee, 'description': desc_short, 'status': status})
+                continue
+            if status in counts:
+                counts[status] = count
+            total += count
         
         return {
-            'total': total or 0,
-            'pending': pending or 0,
-            'accepted': accepted or 0,
-            'completed': completed or 0,
+            'total': total,
+            'pending': counts['Pending'],
+            'accepted': counts['Accepted'],
+            'completed': counts['Completed'],
             'tasks': task_list,
             'period_label': period_label
         }
     except Exception as e:
-        print(f"Error getting repair task stats: {e}")
+        logger.error("Error getting repair task stats: %s", e)
         return {'total': 0, 'pending': 0, 'accepted': 0, 'completed': 0, 'tasks': [], 'period_label': ''}
 
 
 # ==================== TRANSPORTATION MANAGEMENT ====================
 
-def get_all_transportations(db: DatabaseManager) -> list:
-    """Get all transportations"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, plate_number, name, vehicle_type, description, state, created_by, created_at, updated_at
-            FROM tbl_hotel_transportations 
-            WHERE state = 1
-            ORDER BY name ASC
-        """)
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'plate_number': row[1],
-            'name': row[2],
-            'vehicle_type': row[3],
-            'description': row[4],
-            'state': row[5],
-            'created_by': row[6],
-            'created_at': row[7],
-            'updated_at': row[8]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting transportations: {e}")
-        return []
+def _fetch_dicts(db: DatabaseManager, sql: str, params: tuple = ()) -> list:
+    """Run a read query on a pooled connection, rows keyed by their column aliases"""
+    with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor, autocommit=True) as cur:
+        cur.execute(sql, params)
+        return cur.fetchall()
 
 
-def get_transportation_by_id(db: DatabaseManager, transport_id: int) -> dict:
-    """Get transportation by ID"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, plate_number, name, vehicle_type, description, state, created_by, created_at, updated_at
-            FROM tbl_hotel_transportations WHERE id = %s
-        """, (transport_id,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'plate_number': row[1],
-                'name': row[2],
-                'vehicle_type': row[3],
-                'description': row[4],
-                'state': row[5],
-                'created_by': row[6],
-                'created_at': row[7],
-                'updated_at': row[8]
-            }
-        return None
-    except Exception as e:
-        print(f"Error getting transportation by ID: {e}")
-        return None
+def _fetch_one(db: DatabaseManager, sql: str, params: tuple = ()) -> Optional[dict]:
+    """Run a single-row read query on a pooled connection, None when nothing matches"""
+    with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor, autocommit=True) as cur:
+        cur.execute(sql, params)
+        return cur.fetchone()
 
 
-def create_transportation(db: DatabaseManager, plate_number: str, name: str, vehicle_type: str, description: str, created_by: int) -> int:
-    """Create new transportation"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            INSERT INTO tbl_hotel_transportations (plate_number, name, vehicle_type, description, created_by)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id
-        """, (plate_number, name, vehicle_type, description, created_by))
-        result = cursor.fetchone()[0]
-        db.connection.commit()
-        return result
-    except Exception as e:
-        print(f"Error creating transportation: {e}")
-        return None
+@lru_cache(maxsize=64)
+def _entity_update_sql(table: str, columns: tuple) -> str:
+    """Build the UPDATE statement for one table and set of changed columns"""
+    assignments = ', '.join(f"{column} = %s" for column in columns)
+    return f"UPDATE {table} SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = %s"
 
 
-def update_transportation(db: DatabaseManager, transport_id: int, plate_number: str = None, name: str = None, vehicle_type: str = None, description: str = None) -> bool:
-    """Update transportation"""
-    try:
-        cursor = db.connection.cursor()
-        updates = []
-        params = []
-        
-        if plate_number:
-            updates.append("plate_number = %s")
-            params.append(plate_number)
-        if name:
-            updates.append("name = %s")
-            params.append(name)
-        if vehicle_type:
-            updates.append("vehicle_type = %s")
-            params.append(vehicle_type)
-        if description is not None:
-            updates.append("description = %s")
-            params.append(description)
-        
-        if updates:
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(transport_id)
-            cursor.execute(f"""
-                UPDATE tbl_hotel_transportations 
-                SET {', '.join(updates)}
-                WHERE id = %s
-            """, params)
-            db.connection.commit()
-            return True
-        return False
-    except Exception as e:
-        print(f"Error updating transportation: {e}")
+def _update_entity(db: DatabaseManager, table: str, row_id: int, fields: dict) -> bool:
+    """Update the provided (non-None) fields of a row; no-op updates skip the database"""
+    fields = {column: value for column, value in fields.items() if value is not None}
+    if not fields:
         return False
+    with db.pooled_cursor() as cursor:
+        cursor.execute(_entity_update_sql(table, tuple(fields)), (*fields.values(), row_id))
+    return True
 
 
-def delete_transportation(db: DatabaseManager, transport_id: int) -> bool:
-    """Delete transportation (soft delete)"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_hotel_transportations SET state = 0, updated_at = CURRENT_TIMESTAMP WHERE id = %s
-        """, (transport_id,))
-        db.connection.commit()
-        return True
-    except Exception as e:
-        print(f"Error deleting transportation: {e}")
-        return False
+class _EntityCRUD:
+    """
+    List / by-id / create / update / soft-delete accessors for a simple
+    state-flagged table (state = 1 active, 0 deleted)
+    
+    SQL text is built once per table, so every entity shares one code path.
+    """
+    
+    def __init__(self, table: str, columns: tuple, order_by: str, label: str):
+        self.table = table
+        self.columns = columns
+        self.label = label
+        # Cache group of the module-level get_all_* list for this table
+        self.cache_group = table
+        select = f"SELECT id, {', '.join(columns)}, state, created_by, created_at, updated_at FROM {table}"
+        insert_columns = columns + ('created_by',)
+        self._all_sql = f"{select} WHERE state = 1 ORDER BY {order_by}"
+        self._by_id_sql = f"{select} WHERE id = %s LIMIT 1"
+        self._create_sql = (f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                            f"VALUES ({', '.join(['%s'] * len(insert_columns))}) RETURNING id")
+        self._delete_sql = f"UPDATE {table} SET state = 0, updated_at = CURRENT_TIMESTAMP WHERE id = %s"
+    
+    def get_all(self, db: DatabaseManager) -> list:
+        """Get all active rows as dicts, typed like get_by_id (timestamps are datetime)"""
+        try:
+            return _fetch_dicts(db, self._all_sql)
+        except Exception as e:
+            logger.error("Error getting %s list: %s", self.label, e)
+            return []
+    
+    def get_by_id(self, db: DatabaseManager, row_id: int) -> dict:
+        """Get a row by ID"""
+        try:
+            return _fetch_one(db, self._by_id_sql, (row_id,))
+        except Exception as e:
+            logger.error("Error getting %s by ID: %s", self.label, e)
+            return None
+    
+    def create(self, db: DatabaseManager, *values) -> int:
+        """Create a row from the column values followed by created_by"""
+        try:
+            with db.pooled_cursor() as cursor:
+                cursor.execute(self._create_sql, values)
+                row_id = cursor.fetchone()[0]
+            clear_cache_group(self.cache_group)
+            return row_id
+        except Exception as e:
+            logger.error("Error creating %s: %s", self.label, e)
+            return None
+    
+    def update(self, db: DatabaseManager, row_id: int, *values, **fields) -> bool:
+        """Update the given (non-None) columns, positionally or by name"""
+        fields = dict(zip(self.columns, values), **fields)
+        try:
+            updated = _update_entity(db, self.table, row_id, {column: fields.get(column) for column in self.columns})
+            if updated:
+                clear_cache_group(self.cache_group)
+            return updated
+        except Exception as e:
+            logger.error("Error updating %s: %s", self.label, e)
+            return False
+    
+    def soft_delete(self, db: DatabaseManager, row_id: int) -> bool:
+        """Delete a row (soft delete)"""
+        try:
+            with db.pooled_cursor() as cursor:
+                cursor.execute(self._delete_sql, (row_id,))
+            clear_cache_group(self.cache_group)
+            return True
+        except Exception as e:
+            logger.error("Error deleting %s: %s", self.label, e)
+            return False
+
+
+_transportations = _EntityCRUD(
+    'tbl_hotel_transportations', ('plate_number', 'name', 'vehicle_type', 'description'),
+    order_by='name ASC', label='transportation'
+)
+get_all_transportations = _ttl_cache(ttl=60, group=_transportations.cache_group)(_transportations.get_all)
+get_transportation_by_id = _transportations.get_by_id
+create_transportation = _transportations.create
+update_transportation = _transportations.update
+delete_transportation = _transportations.soft_delete
 
 
 # ==================== STORAGE MANAGEMENT ====================
 
-def get_all_storages(db: DatabaseManager) -> list:
-    """Get all storages"""
+_storages = _EntityCRUD(
+    'tbl_hotel_storages', ('name', 'storage_type', 'description'),
+    order_by='name ASC', label='storage'
+)
+get_all_storages = _ttl_cache(ttl=60, group=_storages.cache_group)(_storages.get_all)
+get_storage_by_id = _storages.get_by_id
+create_storage = _storages.create
+update_storage = _storages.update
+delete_storage = _storages.soft_delete
+
+
+# ==================== EXTERNAL SERVICE CONTACTS MANAGEMENT ====================
+
+_contacts = _EntityCRUD(
+    'tbl_out_contacts', ('name', 'contact_type', 'email', 'whatsapp', 'description'),
+    order_by='contact_type, name ASC', label='contact'
+)
+get_all_contacts = _ttl_cache(ttl=60, group=_contacts.cache_group)(_contacts.get_all)
+get_contact_by_id = _contacts.get_by_id
+create_contact = _contacts.create
+update_contact = _contacts.update
+delete_contact = _contacts.soft_delete
+
+
+# ==================== VEHICLE USAGE MANAGEMENT ====================
+
+def get_available_vehicles(db: DatabaseManager) -> list:
+    """Get all available vehicles (not currently borrowed)"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, name, storage_type, description, state, created_by, created_at, updated_at
-            FROM tbl_hotel_storages 
-            WHERE state = 1
-            ORDER BY name ASC
+        return _fetch_dicts(db, """
+            SELECT t.id, t.plate_number, t.name, t.vehicle_type, t.description
+            FROM tbl_hotel_transportations t
+            WHERE t.state = 1 
+            AND NOT EXISTS (
+                SELECT 1 FROM tbl_vehicle_usage u
+                WHERE u.vehicle_id = t.id AND u.status = 'Borrowed'
+            )
+            ORDER BY t.name ASC
         """)
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'name': row[1],
-            'storage_type': row[2],
-            'description': row[3],
-            'state': row[4],
-            'created_by': row[5],
-            'created_at': row[6],
-            'updated_at': row[7]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting storages: {e}")
+    except Exception as e:
+        logger.error("Error getting available vehicles: %s", e)
         return []
 
 
-def get_storage_by_id(db: DatabaseManager, storage_id: int) -> dict:
-    """Get storage by ID"""
+def get_borrowed_vehicles(db: DatabaseManager) -> list:
+    """Get all currently borrowed vehicles"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, name, storage_type, description, state, created_by, created_at, updated_at
-            FROM tbl_hotel_storages WHERE id = %s
-        """, (storage_id,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'storage_type': row[2],
-                'description': row[3],
-                'state': row[4],
-                'created_by': row[5],
-                'created_at': row[6],
-                'updated_at': row[7]
-            }
-        return None
-    except Exception as e:
-        print(f"Error getting storage by ID: {e}")
-        return None
-
-
-def create_storage(db: DatabaseManager, name: str, storage_type: str, description: str, created_by: int) -> int:
-    """Create new storage"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            INSERT INTO tbl_hotel_storages (name, storage_type, description, created_by)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """, (name, storage_type, description, created_by))
-        result = cursor.fetchone()[0]
-        db.connection.commit()
-        return result
-    except Exception as e:
-        print(f"Error creating storage: {e}")
-        return None
-
-
-def update_storage(db: DatabaseManager, storage_id: int, name: str = None, storage_type: str = None, description: str = None) -> bool:
-    """Update storage"""
-    try:
-        cursor = db.connection.cursor()
-        updates = []
-        params = []
-        
-        if name:
-            updates.append("name = %s")
-            params.append(name)
-        if storage_type:
-            updates.append("storage_type = %s")
-            params.append(storage_type)
-        if description is not None:
-            updates.append("description = %s")
-            params.append(description)
-        
-        if updates:
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(storage_id)
-            cursor.execute(f"""
-                UPDATE tbl_hotel_storages 
-                SET {', '.join(updates)}
-                WHERE id = %s
-            """, params)
-            db.connection.commit()
-            return True
-        return False
-    except Exception as e:
-        print(f"Error updating storage: {e}")
-        return False
-
-
-def delete_storage(db: DatabaseManager, storage_id: int) -> bool:
-    """Delete storage (soft delete)"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_hotel_storages SET state = 0, updated_at = CURRENT_TIMESTAMP WHERE id = %s
-        """, (storage_id,))
-        db.connection.commit()
-        return True
-    except Exception as e:
-        print(f"Error deleting storage: {e}")
-        return False
-
-
-# ==================== EXTERNAL SERVICE CONTACTS MANAGEMENT ====================
-
-def get_all_contacts(db: DatabaseManager) -> list:
-    """Get all external service contacts"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, name, contact_type, email, whatsapp, description, state, created_by, created_at, updated_at
-            FROM tbl_out_contacts 
-            WHERE state = 1
-            ORDER BY contact_type, name ASC
-        """)
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'name': row[1],
-            'contact_type': row[2],
-            'email': row[3],
-            'whatsapp': row[4],
-            'description': row[5],
-            'state': row[6],
-            'created_by': row[7],
-            'created_at': row[8],
-            'updated_at': row[9]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting contacts: {e}")
-        return []
-
-
-def get_contact_by_id(db: DatabaseManager, contact_id: int) -> dict:
-    """Get contact by ID"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT id, name, contact_type, email, whatsapp, description, state, created_by, created_at, updated_at
-            FROM tbl_out_contacts WHERE id = %s
-        """, (contact_id,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'name': row[1],
-                'contact_type': row[2],
-                'email': row[3],
-                'whatsapp': row[4],
-                'description': row[5],
-                'state': row[6],
-                'created_by': row[7],
-                'created_at': row[8],
-                'updated_at': row[9]
-            }
-        return None
-    except Exception as e:
-        print(f"Error getting contact by ID: {e}")
-        return None
-
-
-def create_contact(db: DatabaseManager, name: str, contact_type: str, email: str, whatsapp: str, description: str, created_by: int) -> int:
-    """Create new external service contact"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            INSERT INTO tbl_out_contacts (name, contact_type, email, whatsapp, description, created_by)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (name, contact_type, email, whatsapp, description, created_by))
-        result = cursor.fetchone()[0]
-        db.connection.commit()
-        return result
-    except Exception as e:
-        print(f"Error creating contact: {e}")
-        return None
-
-
-def update_contact(db: DatabaseManager, contact_id: int, name: str = None, contact_type: str = None, email: str = None, whatsapp: str = None, description: str = None) -> bool:
-    """Update contact"""
-    try:
-        cursor = db.connection.cursor()
-        updates = []
-        params = []
-        
-        if name:
-            updates.append("name = %s")
-            params.append(name)
-        if contact_type:
-            updates.append("contact_type = %s")
-            params.append(contact_type)
-        if email:
-            updates.append("email = %s")
-            params.append(email)
-        if whatsapp:
-            updates.append("whatsapp = %s")
-            params.append(whatsapp)
-        if description is not None:
-            updates.append("description = %s")
-            params.append(description)
-        
-        if updates:
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(contact_id)
-            cursor.execute(f"""
-                UPDATE tbl_out_contacts 
-                SET {', '.join(updates)}
-                WHERE id = %s
-            """, params)
-            db.connection.commit()
-            return True
-        return False
-    except Exception as e:
-        print(f"Error updating contact: {e}")
-        return False
-
-
-def delete_contact(db: DatabaseManager, contact_id: int) -> bool:
-    """Delete contact (soft delete)"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_out_contacts SET state = 0, updated_at = CURRENT_TIMESTAMP WHERE id = %s
-        """, (contact_id,))
-        db.connection.commit()
-        return True
-    except Exception as e:
-        print(f"Error deleting contact: {e}")
-        return False
-
-
-# ==================== VEHICLE USAGE MANAGEMENT ====================
-
-def get_available_vehicles(db: DatabaseManager) -> list:
-    """Get all available vehicles (not currently borrowed)"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT t.id, t.plate_number, t.name, t.vehicle_type, t.description
-            FROM tbl_hotel_transportations t
-            WHERE t.state = 1 
-            AND t.id NOT IN (
-                SELECT vehicle_id FROM tbl_vehicle_usage WHERE status = 'Borrowed'
-            )
-            ORDER BY t.name ASC
-        """)
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'plate_number': row[1],
-            'name': row[2],
-            'vehicle_type': row[3],
-            'description': row[4]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting available vehicles: {e}")
-        return []
-
-
-def get_borrowed_vehicles(db: DatabaseManager) -> list:
-    """Get all currently borrowed vehicles"""
-    try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT u.id, u.vehicle_id, t.plate_number, t.name, t.vehicle_type,
+        return _fetch_dicts(db, """
+            SELECT u.id, u.vehicle_id, t.plate_number, t.name AS vehicle_name, t.vehicle_type,
                    u.driver_id, u.driver_name, u.purpose, u.start_mileage,
                    u.borrowed_at, u.created_by
             FROM tbl_vehicle_usage u
@@ -8418,278 +8918,291 @@ def get_borrowed_vehicles(db: DatabaseManager) -> list:
             WHERE u.status = 'Borrowed'
             ORDER BY u.borrowed_at DESC
         """)
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'vehicle_id': row[1],
-            'plate_number': row[2],
-            'vehicle_name': row[3],
-            'vehicle_type': row[4],
-            'driver_id': row[5],
-            'driver_name': row[6],
-            'purpose': row[7],
-            'start_mileage': row[8],
-            'borrowed_at': row[9],
-            'created_by': row[10]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting borrowed vehicles: {e}")
+    except Exception as e:
+        logger.error("Error getting borrowed vehicles: %s", e)
         return []
 
 
 def get_vehicle_usage_by_id(db: DatabaseManager, usage_id: int) -> dict:
     """Get vehicle usage record by ID"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT u.id, u.vehicle_id, t.plate_number, t.name, t.vehicle_type,
+        return _fetch_one(db, """
+            SELECT u.id, u.vehicle_id, t.plate_number, t.name AS vehicle_name, t.vehicle_type,
                    u.driver_id, u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
                    u.borrowed_at, u.returned_at, u.inspection_status, u.inspection_notes,
                    u.inspection_photo, u.status, u.created_by
             FROM tbl_vehicle_usage u
             JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
             WHERE u.id = %s
+            LIMIT 1
         """, (usage_id,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'vehicle_id': row[1],
-                'plate_number': row[2],
-                'vehicle_name': row[3],
-                'vehicle_type': row[4],
-                'driver_id': row[5],
-                'driver_name': row[6],
-                'purpose': row[7],
-                'start_mileage': row[8],
-                'end_mileage': row[9],
-                'borrowed_at': row[10],
-                'returned_at': row[11],
-                'inspection_status': row[12],
-                'inspection_notes': row[13],
-                'inspection_photo': row[14],
-                'status': row[15],
-                'created_by': row[16]
-            }
-        return None
     except Exception as e:
-        print(f"Error getting vehicle usage: {e}")
+        logger.error("Error getting vehicle usage: %s", e)
         return None
 
 
 def create_vehicle_usage(db: DatabaseManager, vehicle_id: int, driver_id: int, driver_name: str, purpose: str, start_mileage: int, created_by: int) -> int:
     """Create new vehicle usage record (borrow vehicle)"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            INSERT INTO tbl_vehicle_usage (vehicle_id, driver_id, driver_name, purpose, start_mileage, created_by)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (vehicle_id, driver_id, driver_name, purpose, start_mileage, created_by))
-        result = cursor.fetchone()[0]
-        db.connection.commit()
-        return result
+        with db.pooled_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO tbl_vehicle_usage (vehicle_id, driver_id, driver_name, purpose, start_mileage, created_by)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (vehicle_id, driver_id, driver_name, purpose, start_mileage, created_by))
+            result = cursor.fetchone()[0]
+            return result
     except Exception as e:
-        print(f"Error creating vehicle usage: {e}")
+        logger.error("Error creating vehicle usage: %s", e)
         return None
 
 
 def return_vehicle(db: DatabaseManager, usage_id: int, end_mileage: int, inspection_status: str, inspection_notes: str, inspection_photo: str = None) -> bool:
     """Return vehicle and complete usage record"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_vehicle_usage 
-            SET status = 'Returned',
-                returned_at = CURRENT_TIMESTAMP,
-                end_mileage = %s,
-                inspection_status = %s,
-                inspection_notes = %s,
-                inspection_photo = %s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (end_mileage, inspection_status, inspection_notes, inspection_photo, usage_id))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cursor:
+            cursor.execute("""
+                UPDATE tbl_vehicle_usage 
+                SET status = 'Returned',
+                    returned_at = CURRENT_TIMESTAMP,
+                    end_mileage = %s,
+                    inspection_status = %s,
+                    inspection_notes = %s,
+                    inspection_photo = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (end_mileage, inspection_status, inspection_notes, inspection_photo, usage_id))
+            return True
     except Exception as e:
-        print(f"Error returning vehicle: {e}")
+        logger.error("Error returning vehicle: %s", e)
         return False
 
 
-def get_vehicle_usage_history(db: DatabaseManager, vehicle_id: int = None, limit: int = 20) -> list:
-    """Get vehicle usage history"""
+def get_vehicle_usage_history(db: DatabaseManager, vehicle_id: int = None, limit: int = 20,
+                              after: tuple = None) -> list:
+    """
+    Get vehicle usage history, newest first
+    
+    Args:
+        vehicle_id: Optional vehicle filter
+        limit: Page size
+        after: (borrowed_at, id) of the last record on the previous page;
+               returns the next (older) page
+    """
     try:
-        cursor = db.connection.cursor()
+        conditions = []
+        params = []
         if vehicle_id:
-            cursor.execute("""
-                SELECT u.id, u.vehicle_id, t.plate_number, t.name, t.vehicle_type,
-                       u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
-                       u.borrowed_at, u.returned_at, u.inspection_status, u.status
-                FROM tbl_vehicle_usage u
-                JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
-                WHERE u.vehicle_id = %s
-                ORDER BY u.borrowed_at DESC
-                LIMIT %s
-            """, (vehicle_id, limit))
-        else:
-            cursor.execute("""
-                SELECT u.id, u.vehicle_id, t.plate_number, t.name, t.vehicle_type,
+            conditions.append("u.vehicle_id = %s")
+            params.append(vehicle_id)
+        if after:
+            conditions.append("(u.borrowed_at, u.id) < (%s, %s)")
+            params.extend(after)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        return _fetch_dicts(db, f"""
+            SELECT u.id, u.vehicle_id, t.plate_number, t.name AS vehicle_name, t.vehicle_type,
+                   u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
+                   u.borrowed_at, u.returned_at, u.inspection_status, u.status
+            FROM tbl_vehicle_usage u
+            JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
+            {where_clause}
+            ORDER BY u.borrowed_at DESC, u.id DESC
+            LIMIT %s
+        """, tuple(params))
+    except Exception as e:
+        logger.error("Error getting vehicle usage history: %s", e)
+        return []
+
+
+def stream_vehicle_usage_history(db: DatabaseManager, vehicle_id: int = None, chunk_size: int = 500):
+    """
+    Yield vehicle usage records, newest first, without loading them all at once
+    
+    Meant for exports over the full history; bot screens should keep using
+    the paginated get_vehicle_usage_history. Rows come from a server-side
+    cursor in batches of `chunk_size`.
+    
+    Yields:
+        Usage dicts (same keys as get_vehicle_usage_history)
+    """
+    conditions = []
+    params = []
+    if vehicle_id:
+        conditions.append("u.vehicle_id = %s")
+        params.append(vehicle_id)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor, name='vehicle_usage_stream') as cur:
+        cur.itersize = chunk_size
+        cur.execute(f"""
+            SELECT u.id, u.vehicle_id, t.plate_number, t.name AS vehicle_name, t.vehicle_type,
+                   u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
+                   u.borrowed_at, u.returned_at, u.inspection_status, u.status
+            FROM tbl_vehicle_usage u
+            JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
+            {where_clause}
+            ORDER BY u.borrowed_at DESC, u.id DESC
+        """, tuple(params))
+        yield from cur
+
+
+def get_vehicle_usage_history_for_vehicles(db: DatabaseManager, vehicle_ids: list, limit: int = 20) -> dict:
+    """
+    Get usage history for several vehicles in one query
+    
+    Args:
+        vehicle_ids: Vehicle IDs to load
+        limit: Maximum records per vehicle
+        
+    Returns:
+        Dict of vehicle_id -> list of usage dicts (same keys as get_vehicle_usage_history)
+    """
+    history = defaultdict(list)
+    if not vehicle_ids:
+        return history
+    try:
+        rows = _fetch_dicts(db, """
+            SELECT id, vehicle_id, plate_number, vehicle_name, vehicle_type,
+                   driver_name, purpose, start_mileage, end_mileage,
+                   borrowed_at, returned_at, inspection_status, status
+            FROM (
+                SELECT u.id, u.vehicle_id, t.plate_number, t.name AS vehicle_name, t.vehicle_type,
                        u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
-                       u.borrowed_at, u.returned_at, u.inspection_status, u.status
+                       u.borrowed_at, u.returned_at, u.inspection_status, u.status,
+                       ROW_NUMBER() OVER (PARTITION BY u.vehicle_id ORDER BY u.borrowed_at DESC) AS rn
                 FROM tbl_vehicle_usage u
                 JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
-                ORDER BY u.borrowed_at DESC
-                LIMIT %s
-            """, (limit,))
-        rows = cursor.fetchall()
-        return [{
-            'id': row[0],
-            'vehicle_id': row[1],
-            'plate_number': row[2],
-            'vehicle_name': row[3],
-            'vehicle_type': row[4],
-            'driver_name': row[5],
-            'purpose': row[6],
-            'start_mileage': row[7],
-            'end_mileage': row[8],
-            'borrowed_at': row[9],
-            'returned_at': row[10],
-            'inspection_status': row[11],
-            'status': row[12]
-        } for row in rows]
-    except Exception as e:
-        print(f"Error getting vehicle usage history: {e}")
-        return []
+                WHERE u.vehicle_id = ANY(%s::int[])
+            ) h
+            WHERE rn <= %s
+            ORDER BY vehicle_id, borrowed_at DESC
+        """, (list(vehicle_ids), limit))
+        for row in rows:
+            history[row['vehicle_id']].append(row)
+        return history
+    except Exception as e:
+        logger.error("Error getting vehicle usage history: %s", e)
+        return history
 
 
 def get_active_vehicle_usage_by_vehicle(db: DatabaseManager, vehicle_id: int) -> dict:
     """Get active usage record for a vehicle"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT u.id, u.vehicle_id, u.driver_id, u.driver_name, u.purpose,
-                   u.start_mileage, u.borrowed_at, u.created_by
-            FROM tbl_vehicle_usage u
-            WHERE u.vehicle_id = %s AND u.status = 'Borrowed'
-        """, (vehicle_id,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'vehicle_id': row[1],
-                'driver_id': row[2],
-                'driver_name': row[3],
-                'purpose': row[4],
-                'start_mileage': row[5],
-                'borrowed_at': row[6],
-                'created_by': row[7]
-            }
-        return None
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor, autocommit=True) as cur:
+            db.execute_prepared('vehicle_usage_active_by_vehicle', """
+                SELECT u.id, u.vehicle_id, u.driver_id, u.driver_name, u.purpose,
+                       u.start_mileage, u.borrowed_at, u.created_by
+                FROM tbl_vehicle_usage u
+                WHERE u.vehicle_id = $1 AND u.status = 'Borrowed'
+                LIMIT 1
+            """, (vehicle_id,), cursor=cur)
+            return cur.fetchone()
     except Exception as e:
-        print(f"Error getting active vehicle usage: {e}")
+        logger.error("Error getting active vehicle usage: %s", e)
         return None
 
 
 def get_active_vehicle_usage(db: DatabaseManager) -> list:
     """Get all active vehicle usage records"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT u.id, t.name, u.driver_name, u.purpose, u.start_mileage, u.borrowed_at
-            FROM tbl_vehicle_usage u
-            JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
-            WHERE u.status = 'Borrowed'
-            ORDER BY u.borrowed_at DESC
-        """)
-        rows = cursor.fetchall()
-        return rows
+        with db.pooled_cursor(autocommit=True) as cursor:
+            cursor.execute("""
+                SELECT u.id, t.name, u.driver_name, u.purpose, u.start_mileage, u.borrowed_at
+                FROM tbl_vehicle_usage u
+                JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
+                WHERE u.status = 'Borrowed'
+                ORDER BY u.borrowed_at DESC
+            """)
+            rows = cursor.fetchall()
+            return rows
     except Exception as e:
-        print(f"Error getting active vehicle usage: {e}")
+        logger.error("Error getting active vehicle usage: %s", e)
         return []
 
 
 def get_available_vehicles(db: DatabaseManager) -> list:
     """Get available vehicles (not currently borrowed)"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT t.id, t.name, t.vehicle_type, t.plate_number
-            FROM tbl_hotel_transportations t
-            WHERE t.state = 1
-            AND t.id NOT IN (
-                SELECT vehicle_id FROM tbl_vehicle_usage WHERE status = 'Borrowed'
-            )
-            ORDER BY t.name
-        """)
-        rows = cursor.fetchall()
-        return rows
+        with db.pooled_cursor(autocommit=True) as cursor:
+            cursor.execute("""
+                SELECT t.id, t.name, t.vehicle_type, t.plate_number
+                FROM tbl_hotel_transportations t
+                WHERE t.state = 1
+                AND NOT EXISTS (
+                    SELECT 1 FROM tbl_vehicle_usage u
+                    WHERE u.vehicle_id = t.id AND u.status = 'Borrowed'
+                )
+                ORDER BY t.name
+            """)
+            rows = cursor.fetchall()
+            return rows
     except Exception as e:
-        print(f"Error getting available vehicles: {e}")
+        logger.error("Error getting available vehicles: %s", e)
         return []
 
 
 def complete_vehicle_usage(db: DatabaseManager, usage_id: int, end_mileage: int, inspection_status: str) -> bool:
     """Complete vehicle return"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_vehicle_usage 
-            SET status = 'Returned',
-                returned_at = CURRENT_TIMESTAMP,
-                end_mileage = %s,
-                inspection_status = %s,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (end_mileage, inspection_status, usage_id))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cursor:
+            cursor.execute("""
+                UPDATE tbl_vehicle_usage 
+                SET status = 'Returned',
+                    returned_at = CURRENT_TIMESTAMP,
+                    end_mileage = %s,
+                    inspection_status = %s,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (end_mileage, inspection_status, usage_id))
+            return True
     except Exception as e:
-        print(f"Error completing vehicle usage: {e}")
+        logger.error("Error completing vehicle usage: %s", e)
         return False
 
 
 def get_vehicle_usage_records(db: DatabaseManager, limit: int = 20) -> list:
     """Get vehicle usage records for history display"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT u.id, t.name, u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
-                   u.status, u.borrowed_at, u.returned_at
-            FROM tbl_vehicle_usage u
-            JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
-            ORDER BY u.borrowed_at DESC
-            LIMIT %s
-        """, (limit,))
-        rows = cursor.fetchall()
-        return rows
+        with db.pooled_cursor(autocommit=True) as cursor:
+            cursor.execute("""
+                SELECT u.id, t.name, u.driver_name, u.purpose, u.start_mileage, u.end_mileage,
+                       u.status, u.borrowed_at, u.returned_at
+                FROM tbl_vehicle_usage u
+                JOIN tbl_hotel_transportations t ON u.vehicle_id = t.id
+                ORDER BY u.borrowed_at DESC
+                LIMIT %s
+            """, (limit,))
+            rows = cursor.fetchall()
+            return rows
     except Exception as e:
-        print(f"Error getting vehicle usage records: {e}")
+        logger.error("Error getting vehicle usage records: %s", e)
         return []
 
 
 # ==================== Reception Shift Management ====================
 
+@_ttl_cache(ttl=300, group='shift_settings')
 def get_shift_settings(db: DatabaseManager) -> dict:
     """Get current shift settings"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("SELECT * FROM tbl_reception_shift WHERE is_active = 1 ORDER BY id DESC LIMIT 1")
-        row = cursor.fetchone()
-        if row:
-            return {
-                'id': row[0],
-                'shift_count': row[1],
-                'shift_1_start': row[2],
-                'shift_1_end': row[3],
-                'shift_2_start': row[4],
-                'shift_2_end': row[5],
-                'shift_3_start': row[6],
-                'shift_3_end': row[7],
-                'shift_4_start': row[8],
-                'shift_4_end': row[9],
-                'is_active': row[10]
-            }
-        return None
+        with db.pooled_cursor() as cursor:
+            cursor.execute("SELECT * FROM tbl_reception_shift WHERE is_active = 1 ORDER BY id DESC LIMIT 1")
+            row = cursor.fetchone()
+            if row:
+                return {
+                    'id': row[0],
+                    'shift_count': row[1],
+                    'shift_1_start': row[2],
+                    'shift_1_end': row[3],
+                    'shift_2_start': row[4],
+                    'shift_2_end': row[5],
+                    'shift_3_start': row[6],
+                    'shift_3_end': row[7],
+                    'shift_4_start': row[8],
+                    'shift_4_end': row[9],
+                    'is_active': row[10]
+                }
+            return None
     except Exception as e:
         print(f"Error getting shift settings: {e}")
         return None
@@ -8705,78 +9218,78 @@ def save_shift_settings(db: DatabaseManager, shift_count: int, shifts: list) ->
     - Automatically calculates end times to ensure 24-hour coverage
     """
     try:
-        cursor = db.connection.cursor()
-        
-        # Force 3-shift configuration
-        if shift_count != 3 or len(shifts) != 3:
-            print("❌ Error: Only 3-shift configuration is supported")
-            return False
-        
-        # Check if there's an active record
-        cursor.execute("SELECT id FROM tbl_reception_shift WHERE is_active = 1 ORDER BY id DESC LIMIT 1")
-        active_record = cursor.fetchone()
-        
-        # Auto-calculate 24-hour coverage
-        # Admin provides start times, we calculate end times automatically
-        shift_1_start = shifts[0][0]  # e.g., "08:00"
-        shift_2_start = shifts[1][0]  # e.g., "16:00"
-        shift_3_start = shifts[2][0]  # e.g., "00:00" or "24:00"
-        
-        # Shift 1 ends when Shift 2 starts
-        shift_1_end = shift_2_start
-        
-        # Shift 2 ends when Shift 3 starts
-        shift_2_end = shift_3_start
-        
-        # Shift 3 ends when Shift 1 starts (next day)
-        shift_3_end = shift_1_start
-        
-        # Not used for 3-shift configuration
-        shift_4_start = None
-        shift_4_end = None
-        
-        if active_record:
-            # Update existing active record
-            record_id = active_record[0]
-            cursor.execute("""
-                UPDATE tbl_reception_shift 
-                SET shift_count = %s,
-                    shift_1_start = %s, shift_1_end = %s,
-                    shift_2_start = %s, shift_2_end = %s,
-                    shift_3_start = %s, shift_3_end = %s,
-                    shift_4_start = %s, shift_4_end = %s,
-                    updated_at = NOW()
-                WHERE id = %s
-            """, (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
-                  shift_3_start, shift_3_end, shift_4_start, shift_4_end, record_id))
-            print(f"✅ Updated existing shift settings (ID: {record_id})")
-        else:
-            # No active record exists, insert new one
-            cursor.execute("""
-                INSERT INTO tbl_reception_shift 
-                (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
-                 shift_3_start, shift_3_end, shift_4_start, shift_4_end, is_active)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 1)
-            """, (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
-                  shift_3_start, shift_3_end, shift_4_start, shift_4_end))
-            print(f"✅ Created new shift settings record")
-        
-        db.connection.commit()
+        with db.pooled_cursor() as cursor:
+            # Force 3-shift configuration
+            if shift_count != 3 or len(shifts) != 3:
+                print("❌ Error: Only 3-shift configuration is supported")
+                return False
+
+            # Check if there's an active record
+            cursor.execute("SELECT id FROM tbl_reception_shift WHERE is_active = 1 ORDER BY id DESC LIMIT 1")
+            active_record = cursor.fetchone()
+
+            # Auto-calculate 24-hour coverage
+            # Admin provides start times, we calculate end times automatically
+            shift_1_start = shifts[0][0]  # e.g., "08:00"
+            shift_2_start = shifts[1][0]  # e.g., "16:00"
+            shift_3_start = shifts[2][0]  # e.g., "00:00" or "24:00"
+
+            # Shift 1 ends when Shift 2 starts
+            shift_1_end = shift_2_start
+
+            # Shift 2 ends when Shift 3 starts
+            shift_2_end = shift_3_start
+
+            # Shift 3 ends when Shift 1 starts (next day)
+            shift_3_end = shift_1_start
+
+            # Not used for 3-shift configuration
+            shift_4_start = None
+            shift_4_end = None
+
+            if active_record:
+                # Update existing active record
+                record_id = active_record[0]
+                cursor.execute("""
+                    UPDATE tbl_reception_shift 
+                    SET shift_count = %s,
+                        shift_1_start = %s, shift_1_end = %s,
+                        shift_2_start = %s, shift_2_end = %s,
+                        shift_3_start = %s, shift_3_end = %s,
+                        shift_4_start = %s, shift_4_end = %s,
+                        updated_at = NOW()
+                    WHERE id = %s
+                """, (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
+                      shift_3_start, shift_3_end, shift_4_start, shift_4_end, record_id))
+                print(f"✅ Updated existing shift settings (ID: {record_id})")
+            else:
+                # No active record exists, insert new one
+                cursor.execute("""
+                    INSERT INTO tbl_reception_shift 
+                    (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
+                     shift_3_start, shift_3_end, shift_4_start, shift_4_end, is_active)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 1)
+                """, (shift_count, shift_1_start, shift_1_end, shift_2_start, shift_2_end,
+                      shift_3_start, shift_3_end, shift_4_start, shift_4_end))
+                print(f"✅ Created new shift settings record")
+
+        clear_cache_group('shift_settings')
         return True
     except Exception as e:
         print(f"Error saving shift settings: {e}")
-        db.connection.rollback()
         return False
 
 
+# Only start times; end times are auto-calculated by save_shift_settings
+_DEFAULT_SHIFTS = (('08:00', None), ('16:00', None), ('00:00', None))
+
+
 def get_default_shifts(shift_count: int) -> list:
     """Get default shift start times for 3-shift configuration
     Returns list of (start_time, None) tuples - end times are auto-calculated
     """
-    if shift_count == 3:
-        # Return only start times, end times will be auto-calculated
-        return [('08:00', None), ('16:00', None), ('00:00', None)]
-    return [('08:00', None), ('16:00', None), ('00:00', None)]
+    # Only the 3-shift configuration is supported, whatever shift_count says
+    return list(_DEFAULT_SHIFTS)
 
 
 def create_shift_report(db: DatabaseManager, shift_number: int, employee_id: str, employee_name: str,
@@ -8787,114 +9300,96 @@ def create_shift_report(db: DatabaseManager, shift_number: int, employee_id: str
                         tool_log_notes: str = None, additional_notes: str = None) -> int:
     """Create a new shift report"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            INSERT INTO tbl_shift_reports 
-            (shift_number, employee_id, employee_name, reservations_count, arrivals_count,
-             departures_count, issues_notes, cash_amount, cash_photo, pos_report_photo,
-             store_stock_notes, restaurant_cash_confirmed, key_log_notes, tool_log_notes,
-             additional_notes, status)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'submitted')
-            RETURNING id
-        """, (shift_number, employee_id, employee_name, reservations_count, arrivals_count,
-              departures_count, issues_notes, cash_amount, cash_photo, pos_report_photo,
-              store_stock_notes, 1 if restaurant_cash_confirmed else 0, key_log_notes,
-              tool_log_notes, additional_notes))
-        result = cursor.fetchone()[0]
-        db.connection.commit()
-        return result
-    except Exception as e:
-        print(f"Error creating shift report: {e}")
-        if db.connection:
-            db.connection.rollback()
-        return None
-
-
-def get_shift_reports(db: DatabaseManager, date: str = None, limit: int = 20) -> list:
-    """Get shift reports, optionally filtered by date"""
-    try:
-        cursor = db.connection.cursor()
-        if date:
-            cursor.execute("""
-                SELECT * FROM tbl_shift_reports 
-                WHERE shift_date = %s
-                ORDER BY shift_number, submitted_at DESC
-            """, (date,))
-        else:
+        with db.pooled_cursor() as cursor:
             cursor.execute("""
-                SELECT * FROM tbl_shift_reports 
-                ORDER BY shift_date DESC, shift_number
-                LIMIT %s
-            """, (limit,))
-        return cursor.fetchall()
+                INSERT INTO tbl_shift_reports 
+                (shift_number, employee_id, employee_name, reservations_count, arrivals_count,
+                 departures_count, issues_notes, cash_amount, cash_photo, pos_report_photo,
+                 store_stock_notes, restaurant_cash_confirmed, key_log_notes, tool_log_notes,
+                 additional_notes, status)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'submitted')
+                RETURNING id
+            """, (shift_number, employee_id, employee_name, reservations_count, arrivals_count,
+                  departures_count, issues_notes, cash_amount, cash_photo, pos_report_photo,
+                  store_stock_notes, 1 if restaurant_cash_confirmed else 0, key_log_notes,
+                  tool_log_notes, additional_notes))
+            result = cursor.fetchone()[0]
+            return result
+    except Exception as e:
+        print(f"Error creating shift report: {e}")
+        return None
+
+
+def get_shift_reports(db: DatabaseManager, date: str = None, limit: int = 20) -> list:
+    """Get shift reports, optionally filtered by date"""
+    try:
+        with db.pooled_cursor() as cursor:
+            if date:
+                cursor.execute("""
+                    SELECT * FROM tbl_shift_reports 
+                    WHERE shift_date = %s
+                    ORDER BY shift_number, submitted_at DESC
+                """, (date,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM tbl_shift_reports 
+                    ORDER BY shift_date DESC, shift_number
+                    LIMIT %s
+                """, (limit,))
+            return cursor.fetchall()
     except Exception as e:
         print(f"Error getting shift reports: {e}")
         return []
 
 
+def stream_shift_reports(db: DatabaseManager, chunk_size: int = 500):
+    """
+    Yield every shift report, newest first, without loading them all at once
+    
+    Meant for exports/archives; the report screens keep using the bounded
+    get_shift_reports. Rows come from a server-side cursor in batches of
+    `chunk_size`.
+    
+    Yields:
+        Shift report dicts keyed by column name
+    """
+    with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor, name='shift_reports_stream') as cur:
+        cur.itersize = chunk_size
+        cur.execute("""
+            SELECT * FROM tbl_shift_reports 
+            ORDER BY shift_date DESC, shift_number, id
+        """)
+        yield from cur
+
+
 def get_shift_reports_by_date(db: DatabaseManager, date: str) -> list:
     """Get all shift reports for a specific date, with full details"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT 
-                id, shift_number, shift_date, employee_id, employee_name,
-                reservations_count, arrivals_count, departures_count,
-                issues_notes, cash_amount, cash_photo, pos_report_photo,
-                store_stock_notes, restaurant_cash_confirmed,
-                key_log_notes, tool_log_notes, additional_notes,
-                status, submitted_at, confirmed_by, confirmed_at
-            FROM tbl_shift_reports 
-            WHERE shift_date = %s
-            ORDER BY submitted_at ASC
-        """, (date,))
-        
-        rows = cursor.fetchall()
-        reports = []
-        
-        for row in rows:
-            reports.append({
-                'id': row[0],
-                'shift_number': row[1],
-                'shift_date': row[2],
-                'employee_id': row[3],
-                'employee_name': row[4],
-                'reservations_count': row[5],
-                'arrivals_count': row[6],
-                'departures_count': row[7],
-                'issues_notes': row[8],
-                'cash_amount': row[9],
-                'cash_photo': row[10],
-                'pos_report_photo': row[11],
-                'store_stock_notes': row[12],
-                'restaurant_cash_confirmed': row[13],
-                'key_log_notes': row[14],
-                'tool_log_notes': row[15],
-                'additional_notes': row[16],
-                'status': row[17],
-                'submitted_at': row[18],
-                'confirmed_by': row[19],
-                'confirmed_at': row[20]
-            })
-        
-        return reports
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("""
+                SELECT 
+                    id, shift_number, shift_date, employee_id, employee_name,
+                    reservations_count, arrivals_count, departures_count,
+                    issues_notes, cash_amount, cash_photo, pos_report_photo,
+                    store_stock_notes, restaurant_cash_confirmed,
+                    key_log_notes, tool_log_notes, additional_notes,
+                    status, submitted_at, confirmed_by, confirmed_at
+                FROM tbl_shift_reports 
+                WHERE shift_date = %s
+                ORDER BY submitted_at ASC
+            """, (date,))
+            return cursor.fetchall()
     except Exception as e:
         print(f"Error getting shift reports by date: {e}")
-        import traceback
-        traceback.print_exc()
         return []
 
 
 def get_shift_report_by_id(db: DatabaseManager, report_id: int) -> dict:
     """Get a specific shift report by ID"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("SELECT * FROM tbl_shift_reports WHERE id = %s", (report_id,))
-        row = cursor.fetchone()
-        if row:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
-        return None
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("SELECT * FROM tbl_shift_reports WHERE id = %s", (report_id,))
+            return cursor.fetchone()
     except Exception as e:
         print(f"Error getting shift report: {e}")
         return None
@@ -8903,15 +9398,13 @@ def get_shift_report_by_id(db: DatabaseManager, report_id: int) -> dict:
 def get_pending_shift_reports(db: DatabaseManager) -> list:
     """Get shift reports that are submitted but not confirmed"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            SELECT * FROM tbl_shift_reports 
-            WHERE status = 'submitted'
-            ORDER BY submitted_at DESC
-        """)
-        rows = cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.execute("""
+                SELECT * FROM tbl_shift_reports 
+                WHERE status = 'submitted'
+                ORDER BY submitted_at DESC
+            """)
+            return cursor.fetchall()
     except Exception as e:
         print(f"Error getting pending shift reports: {e}")
         return []
@@ -8920,14 +9413,13 @@ def get_pending_shift_reports(db: DatabaseManager) -> list:
 def confirm_shift_report(db: DatabaseManager, report_id: int, confirmed_by: int) -> bool:
     """Confirm a shift report"""
     try:
-        cursor = db.connection.cursor()
-        cursor.execute("""
-            UPDATE tbl_shift_reports 
-            SET status = 'confirmed', confirmed_by = %s, confirmed_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (confirmed_by, report_id))
-        db.connection.commit()
-        return cursor.rowcount > 0
+        with db.pooled_cursor() as cursor:
+            cursor.execute("""
+                UPDATE tbl_shift_reports 
+                SET status = 'confirmed', confirmed_by = %s, confirmed_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (confirmed_by, report_id))
+            return cursor.rowcount > 0
     except Exception as e:
         print(f"Error confirming shift report: {e}")
         return False
@@ -8947,27 +9439,28 @@ def create_event(db: DatabaseManager, event_data: dict) -> int:
         Event ID or None on failure
     """
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_hotel_events (
-                event_name, hall, event_date, event_time, end_time, 
-                seats, price, menu, meals_count, notes, created_by
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (
-            event_data.get('event_name'),
-            event_data.get('hall'),
-            event_data.get('event_date'),
-            event_data.get('event_time'),
-            event_data.get('end_time'),
-            event_data.get('seats', 0),
-            event_data.get('price', 0),
-            event_data.get('menu'),
-            event_data.get('meals_count', 0),
-            event_data.get('notes'),
-            event_data.get('created_by')
-        ))
-        event_id = db.cursor.fetchone()[0]
-        db.connection.commit()
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                INSERT INTO tbl_hotel_events (
+                    event_name, hall, event_date, event_time, end_time, 
+                    seats, price, menu, meals_count, notes, created_by
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (
+                event_data.get('event_name'),
+                event_data.get('hall'),
+                event_data.get('event_date'),
+                event_data.get('event_time'),
+                event_data.get('end_time'),
+                event_data.get('seats', 0),
+                event_data.get('price', 0),
+                event_data.get('menu'),
+                event_data.get('meals_count', 0),
+                event_data.get('notes'),
+                event_data.get('created_by')
+            ))
+            event_id = cur.fetchone()[0]
+        clear_cache_group('events')
         print(f"✅ Event created: ID {event_id}")
         return event_id
     except Exception as e:
@@ -8975,24 +9468,24 @@ def create_event(db: DatabaseManager, event_data: dict) -> int:
         return None
 
 
+_EVENTS_SELECT_SQL = """
+    SELECT id, event_name, hall, event_date, event_time, end_time,
+           seats, price, menu, meals_count, notes, status, created_by, created_at
+    FROM tbl_hotel_events
+"""
+_EVENTS_ALL_SQL = _EVENTS_SELECT_SQL + " ORDER BY event_date, event_time"
+_EVENTS_BY_STATUS_SQL = _EVENTS_SELECT_SQL + " WHERE status = %s ORDER BY event_date, event_time"
+
+
 def get_all_events(db: DatabaseManager, status: str = None) -> list:
     """Get all events, optionally filtered by status"""
     try:
-        if status:
-            results = db.cursor.execute("""
-                SELECT id, event_name, hall, event_date, event_time, end_time,
-                       seats, price, menu, meals_count, notes, status, created_by, created_at
-                FROM tbl_hotel_events WHERE status = %s ORDER BY event_date, event_time
-            """, (status,))
-            results = db.cursor.fetchall()
-        else:
-            results = db.cursor.execute("""
-                SELECT id, event_name, hall, event_date, event_time, end_time,
-                       seats, price, menu, meals_count, notes, status, created_by, created_at
-                FROM tbl_hotel_events ORDER BY event_date, event_time
-            """)
-            results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            if status:
+                cur.execute(_EVENTS_BY_STATUS_SQL, (status,))
+            else:
+                cur.execute(_EVENTS_ALL_SQL)
+            return cur.fetchall()
     except Exception as e:
         print(f"❌ Error getting events: {e}")
         return []
@@ -9001,32 +9494,33 @@ def get_all_events(db: DatabaseManager, status: str = None) -> list:
 def get_event_by_id(db: DatabaseManager, event_id: int) -> dict:
     """Get event details by ID"""
     try:
-        db.cursor.execute("""
-            SELECT id, event_name, hall, event_date, event_time, end_time,
-                   seats, price, menu, meals_count, notes, status, created_by, created_at
-            FROM tbl_hotel_events WHERE id = %s
-        """, (event_id,))
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute("""
+                SELECT id, event_name, hall, event_date, event_time, end_time,
+                       seats, price, menu, meals_count, notes, status, created_by, created_at
+                FROM tbl_hotel_events WHERE id = %s
+            """, (event_id,))
 
-        result = db.cursor.fetchone()
-        
-        if result:
-            return {
-                'id': result[0],
-                'event_name': result[1],
-                'hall': result[2],
-                'event_date': result[3],
-                'event_time': result[4],
-                'end_time': result[5],
-                'seats': result[6],
-                'price': result[7],
-                'menu': result[8],
-                'meals_count': result[9],
-                'notes': result[10],
-                'status': result[11],
-                'created_by': result[12],
-                'created_at': result[13]
-            }
-        return None
+            result = cur.fetchone()
+
+            if result:
+                return {
+                    'id': result[0],
+                    'event_name': result[1],
+                    'hall': result[2],
+                    'event_date': result[3],
+                    'event_time': result[4],
+                    'end_time': result[5],
+                    'seats': result[6],
+                    'price': result[7],
+                    'menu': result[8],
+                    'meals_count': result[9],
+                    'notes': result[10],
+                    'status': result[11],
+                    'created_by': result[12],
+                    'created_at': result[13]
+                }
+            return None
     except Exception as e:
         print(f"❌ Error getting event: {e}")
         return None
@@ -9035,29 +9529,32 @@ def get_event_by_id(db: DatabaseManager, event_id: int) -> dict:
 def update_event_status(db: DatabaseManager, event_id: int, status: str) -> bool:
     """Update event status"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_events SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s
-        """, (status, event_id))
-        db.connection.commit()
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_events SET status = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s
+            """, (status, event_id))
+        clear_cache_group('events')
         return True
     except Exception as e:
         print(f"❌ Error updating event status: {e}")
         return False
 
 
+@_ttl_cache(ttl=30, group='events')
 def get_upcoming_events(db: DatabaseManager, days: int = 7) -> list:
     """Get events within next N days (and recent past events still in progress)"""
     try:
-        results = db.cursor.execute("""
-            SELECT id, event_name, hall, event_date, event_time, end_time,
-                   seats, price, menu, meals_count, notes, status, created_by, created_at
-            FROM tbl_hotel_events 
-            WHERE (event_date >= CURRENT_DATE - 7 AND event_date <= CURRENT_DATE + %s)
-            AND status NOT IN ('completed', 'cancelled')
-            ORDER BY event_date DESC, event_time
-        """, (days,))
-        results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            results = cur.execute("""
+                SELECT id, event_name, hall, event_date, event_time, end_time,
+                       seats, price, menu, meals_count, notes, status, created_by, created_at
+                FROM tbl_hotel_events 
+                WHERE (event_date >= CURRENT_DATE - 7 AND event_date <= CURRENT_DATE + %s)
+                AND status NOT IN ('completed', 'cancelled')
+                ORDER BY event_date DESC, event_time
+            """, (days,))
+            results = cur.fetchall()
+            return results
     except Exception as e:
         print(f"❌ Error getting upcoming events: {e}")
         return []
@@ -9066,32 +9563,48 @@ def get_upcoming_events(db: DatabaseManager, days: int = 7) -> list:
 
 def create_event_history(db: DatabaseManager, event_id: int, department: str, alarm_type: str) -> int:
     """Create event history record for alarm tracking"""
+    history_ids = create_event_history_bulk(db, [(event_id, department, alarm_type)])
+    return history_ids[0] if history_ids else None
+
+
+def create_event_history_bulk(db: DatabaseManager, rows: list) -> list:
+    """
+    Create several event history records with a single multi-row INSERT
+    
+    Args:
+        rows: List of (event_id, department, alarm_type) tuples
+        
+    Returns:
+        List of created history IDs, empty list on error
+    """
+    if not rows:
+        return []
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_hotel_event_history (event_id, department, alarm_type, alarm_sent_at)
-            VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
-            RETURNING id
-        """, (event_id, department, alarm_type))
-        result = db.cursor.fetchone()[0]
-        db.connection.commit()
-        return result
+        with db.pooled_cursor() as cur:
+            results = psycopg2.extras.execute_values(cur, """
+                INSERT INTO tbl_hotel_event_history (event_id, department, alarm_type, alarm_sent_at)
+                VALUES %s
+                RETURNING id
+            """, rows, template="(%s, %s, %s, CURRENT_TIMESTAMP)", fetch=True)
+        return [r[0] for r in results]
     except Exception as e:
         print(f"❌ Error creating event history: {e}")
-        return None
+        return []
 
 
 def get_event_history(db: DatabaseManager, event_id: int) -> list:
     """Get event history (all department confirmations)"""
     try:
-        results = db.cursor.execute("""
-            SELECT id, event_id, department, alarm_type, alarm_sent_at,
-                   acknowledged, acknowledged_by, acknowledged_at,
-                   confirmed, confirmed_by, confirmed_at,
-                   ready_confirmed, ready_confirmed_by, ready_confirmed_at, ready_proof, notes
-            FROM tbl_hotel_event_history WHERE event_id = %s ORDER BY created_at DESC
-        """, (event_id,))
-        results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            results = cur.execute("""
+                SELECT id, event_id, department, alarm_type, alarm_sent_at,
+                       acknowledged, acknowledged_by, acknowledged_at,
+                       confirmed, confirmed_by, confirmed_at,
+                       ready_confirmed, ready_confirmed_by, ready_confirmed_at, ready_proof, notes
+                FROM tbl_hotel_event_history WHERE event_id = %s ORDER BY created_at DESC
+            """, (event_id,))
+            results = cur.fetchall()
+            return results
     except Exception as e:
         print(f"❌ Error getting event history: {e}")
         return []
@@ -9100,13 +9613,13 @@ def get_event_history(db: DatabaseManager, event_id: int) -> list:
 def acknowledge_event_alarm(db: DatabaseManager, history_id: int, telegram_user_id: int) -> bool:
     """Acknowledge event alarm"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_history 
-            SET acknowledged = 1, acknowledged_by = %s, acknowledged_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (telegram_user_id, history_id))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_history 
+                SET acknowledged = 1, acknowledged_by = %s, acknowledged_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (telegram_user_id, history_id))
+            return True
     except Exception as e:
         print(f"❌ Error acknowledging event alarm: {e}")
         return False
@@ -9115,13 +9628,13 @@ def acknowledge_event_alarm(db: DatabaseManager, history_id: int, telegram_user_
 def confirm_event_preparation(db: DatabaseManager, history_id: int, telegram_user_id: int, notes: str = None) -> bool:
     """Confirm event preparation (T-1 day confirmation)"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_history 
-            SET confirmed = 1, confirmed_by = %s, confirmed_at = CURRENT_TIMESTAMP, notes = %s
-            WHERE id = %s
-        """, (telegram_user_id, notes, history_id))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_history 
+                SET confirmed = 1, confirmed_by = %s, confirmed_at = CURRENT_TIMESTAMP, notes = %s
+                WHERE id = %s
+            """, (telegram_user_id, notes, history_id))
+            return True
     except Exception as e:
         print(f"❌ Error confirming event preparation: {e}")
         return False
@@ -9130,13 +9643,13 @@ def confirm_event_preparation(db: DatabaseManager, history_id: int, telegram_use
 def confirm_event_ready(db: DatabaseManager, history_id: int, telegram_user_id: int, proof: str = None) -> bool:
     """Confirm READY status with proof (event day)"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_history 
-            SET ready_confirmed = 1, ready_confirmed_by = %s, ready_confirmed_at = CURRENT_TIMESTAMP, ready_proof = %s
-            WHERE id = %s
-        """, (telegram_user_id, proof, history_id))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_history 
+                SET ready_confirmed = 1, ready_confirmed_by = %s, ready_confirmed_at = CURRENT_TIMESTAMP, ready_proof = %s
+                WHERE id = %s
+            """, (telegram_user_id, proof, history_id))
+            return True
     except Exception as e:
         print(f"❌ Error confirming event ready: {e}")
         return False
@@ -9145,34 +9658,34 @@ def confirm_event_ready(db: DatabaseManager, history_id: int, telegram_user_id:
 def get_events_for_alarm(db: DatabaseManager, days_before: int) -> list:
     """Get events that need alarm (T-2 or T-1)"""
     try:
-        db.cursor.execute("""
-            SELECT id, event_name, hall, event_date, event_time, seats, menu, meals_count
-            FROM tbl_hotel_events 
-            WHERE event_date = CURRENT_DATE + INTERVAL '%s days'
-            AND status NOT IN ('completed', 'cancelled')
-        """, (days_before,))
-        results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor, autocommit=True) as cur:
+            db.execute_prepared('events_for_alarm', """
+                SELECT id, event_name, hall, event_date, event_time, seats, menu, meals_count
+                FROM tbl_hotel_events 
+                WHERE event_date = CURRENT_DATE + $1::int
+                AND status NOT IN ('completed', 'cancelled')
+            """, (days_before,), cursor=cur)
+            return cur.fetchall()
     except Exception as e:
         print(f"❌ Error getting events for alarm: {e}")
-        if db.connection:
-            db.connection.rollback()
         return []
 
 
 
+@_ttl_cache(ttl=30, group='events')
 def get_todays_events(db: DatabaseManager) -> list:
     """Get today's events"""
     try:
-        db.cursor.execute("""
-            SELECT id, event_name, hall, event_date, event_time, end_time, seats, menu, meals_count, status
-            FROM tbl_hotel_events 
-            WHERE event_date = CURRENT_DATE
-            AND status NOT IN ('completed', 'cancelled')
-            ORDER BY event_time
-        """)
-        results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute("""
+                SELECT id, event_name, hall, event_date, event_time, end_time, seats, menu, meals_count, status
+                FROM tbl_hotel_events 
+                WHERE event_date = CURRENT_DATE
+                AND status NOT IN ('completed', 'cancelled')
+                ORDER BY event_time
+            """)
+            results = cur.fetchall()
+            return results
     except Exception as e:
         print(f"❌ Error getting today's events: {e}")
         return []
@@ -9181,25 +9694,26 @@ def get_todays_events(db: DatabaseManager) -> list:
 def get_unconfirmed_event_history(db: DatabaseManager, event_id: int, alarm_type: str) -> list:
     """Get unconfirmed departments for an event alarm"""
     try:
-        if alarm_type == 'T-2':
-            results = db.cursor.execute("""
-                SELECT id, department FROM tbl_hotel_event_history 
-                WHERE event_id = %s AND alarm_type = %s AND acknowledged = 0
-            """, (event_id, alarm_type))
-            results = db.cursor.fetchall()
-        elif alarm_type == 'T-1':
-            results = db.cursor.execute("""
-                SELECT id, department FROM tbl_hotel_event_history 
-                WHERE event_id = %s AND alarm_type = %s AND confirmed = 0
-            """, (event_id, alarm_type))
-            results = db.cursor.fetchall()
-        else:  # event_day
-            results = db.cursor.execute("""
-                SELECT id, department FROM tbl_hotel_event_history 
-                WHERE event_id = %s AND alarm_type = %s AND ready_confirmed = 0
-            """, (event_id, alarm_type))
-            results = db.cursor.fetchall()
-        return results
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            if alarm_type == 'T-2':
+                results = cur.execute("""
+                    SELECT id, department FROM tbl_hotel_event_history 
+                    WHERE event_id = %s AND alarm_type = %s AND acknowledged = 0
+                """, (event_id, alarm_type))
+                results = cur.fetchall()
+            elif alarm_type == 'T-1':
+                results = cur.execute("""
+                    SELECT id, department FROM tbl_hotel_event_history 
+                    WHERE event_id = %s AND alarm_type = %s AND confirmed = 0
+                """, (event_id, alarm_type))
+                results = cur.fetchall()
+            else:  # event_day
+                results = cur.execute("""
+                    SELECT id, department FROM tbl_hotel_event_history 
+                    WHERE event_id = %s AND alarm_type = %s AND ready_confirmed = 0
+                """, (event_id, alarm_type))
+                results = cur.fetchall()
+            return results
     except Exception as e:
         print(f"❌ Error getting unconfirmed event history: {e}")
         return []
@@ -9208,13 +9722,13 @@ def get_unconfirmed_event_history(db: DatabaseManager, event_id: int, alarm_type
 def get_alarm_last_sent(db: DatabaseManager, event_id: int, alarm_type: str, department: str) -> str:
     """Get the last alarm sent time for a specific event/department/alarm_type"""
     try:
-        db.cursor.execute("""
-            SELECT alarm_sent_at FROM tbl_hotel_event_history 
-            WHERE event_id = %s AND alarm_type = %s AND department = %s
-        """, (event_id, alarm_type, department))
-
-        result = db.cursor.fetchone()
-        return result[0] if result and result[0] else None
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor, autocommit=True) as cur:
+            db.execute_prepared('event_alarm_last_sent', """
+                SELECT alarm_sent_at FROM tbl_hotel_event_history 
+                WHERE event_id = $1 AND alarm_type = $2 AND department = $3
+            """, (event_id, alarm_type, department), cursor=cur)
+            result = cur.fetchone()
+            return result[0] if result and result[0] else None
     except Exception as e:
         print(f"❌ Error getting alarm last sent: {e}")
         return None
@@ -9223,80 +9737,130 @@ def get_alarm_last_sent(db: DatabaseManager, event_id: int, alarm_type: str, dep
 def update_alarm_sent_time(db: DatabaseManager, event_id: int, alarm_type: str, department: str) -> bool:
     """Update the alarm sent time to current timestamp"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_history 
-            SET alarm_sent_at = CURRENT_TIMESTAMP
-            WHERE event_id = %s AND alarm_type = %s AND department = %s
-        """, (event_id, alarm_type, department))
-        db.connection.commit()
-        return True
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('event_alarm_touch', """
+                UPDATE tbl_hotel_event_history 
+                SET alarm_sent_at = CURRENT_TIMESTAMP
+                WHERE event_id = $1 AND alarm_type = $2 AND department = $3
+            """, (event_id, alarm_type, department), cursor=cur)
+            return True
     except Exception as e:
         print(f"❌ Error updating alarm sent time: {e}")
         return False
 
 
 def should_send_alarm(db: DatabaseManager, event_id: int, alarm_type: str, department: str, interval_seconds: int) -> bool:
-    """Check if alarm should be sent based on last sent time and interval"""
+    """
+    Check if an alarm is due and, if so, claim it
+    
+    Single-department form of departments_needing_alarm. If nothing gets
+    sent, hand the claim back with release_alarm_claim.
+    """
+    return department in departments_needing_alarm(db, event_id, alarm_type, [department], interval_seconds)
+
+
+def departments_needing_alarm(db: DatabaseManager, event_id: int, alarm_type: str,
+                              departments: list, interval_seconds: int) -> dict:
+    """
+    Claim the due alarm for several departments at once
+    
+    A single UPDATE stamps alarm_sent_at only where it is empty or older than
+    interval_seconds, so two scheduler runs cannot both claim the same alarm.
+    The previous alarm_sent_at is returned so a claim whose send reached
+    nobody can be handed back with release_alarm_claim.
+    
+    Returns:
+        Dict {department: previous alarm_sent_at} for the departments whose
+        alarm is due (and now stamped as sent)
+    """
+    if not departments:
+        return {}
     try:
-        db.cursor.execute("""
-            SELECT alarm_sent_at FROM tbl_hotel_event_history 
-            WHERE event_id = %s AND alarm_type = %s AND department = %s
-        """, (event_id, alarm_type, department))
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('event_alarm_claim_many', """
+                UPDATE tbl_hotel_event_history h
+                SET alarm_sent_at = CURRENT_TIMESTAMP
+                FROM tbl_hotel_event_history prev
+                WHERE prev.id = h.id
+                  AND h.event_id = $1 AND h.alarm_type = $2 AND h.department = ANY($3::text[])
+                  AND (h.alarm_sent_at IS NULL OR h.alarm_sent_at < NOW() - make_interval(secs => $4))
+                RETURNING h.department, prev.alarm_sent_at
+            """, (event_id, alarm_type, list(departments), interval_seconds), cursor=cur)
+            return {row[0]: row[1] for row in cur.fetchall()}
+    except Exception as e:
+        print(f"❌ Error checking departments_needing_alarm: {e}")
+        return dict.fromkeys(departments)  # Send on error to be safe
 
-        result = db.cursor.fetchone()
-        
-        if not result or not result[0]:
-            return True  # Never sent, should send
-        
-        # Check if interval has passed
-        from datetime import datetime
-        last_sent_raw = result[0]
-        
-        # Handle both string and datetime object
-        if isinstance(last_sent_raw, datetime):
-            last_sent = last_sent_raw
-        else:
-            last_sent = datetime.strptime(last_sent_raw, '%Y-%m-%d %H:%M:%S')
-        
-        now = datetime.now()
-        elapsed = (now - last_sent).total_seconds()
-        
-        return elapsed >= interval_seconds
+
+def release_alarm_claim(db: DatabaseManager, event_id: int, alarm_type: str, department: str,
+                        previous_sent_at) -> bool:
+    """
+    Undo a departments_needing_alarm claim whose alarm was not delivered
+    
+    Restores the previous alarm_sent_at, so the alarm is retried on the next
+    scheduler check instead of waiting out the full repeat interval.
+    """
+    try:
+        with db.pooled_cursor() as cur:
+            db.execute_prepared('event_alarm_release', """
+                UPDATE tbl_hotel_event_history 
+                SET alarm_sent_at = $4
+                WHERE event_id = $1 AND alarm_type = $2 AND department = $3
+            """, (event_id, alarm_type, department, previous_sent_at), cursor=cur)
+            return True
     except Exception as e:
-        print(f"❌ Error checking should_send_alarm: {e}")
-        return True  # Send on error to be safe
+        print(f"❌ Error releasing alarm claim: {e}")
+        return False
 
 
 def create_event_task(db: DatabaseManager, event_id: int, task_id: int, department: str, 
                       task_type: str, description: str, due_date: str,
                       assigned_to: int = None, assigned_name: str = None) -> int:
     """Create an event-related task record with assignment info"""
+    event_task_ids = create_event_task_bulk(db, [(event_id, task_id, department, task_type,
+                                                  description, due_date, assigned_to, assigned_name)])
+    return event_task_ids[0] if event_task_ids else None
+
+
+def create_event_task_bulk(db: DatabaseManager, rows: list) -> list:
+    """
+    Create several event task records with a single multi-row INSERT
+    
+    Args:
+        rows: List of tuples in create_event_task argument order
+              (event_id, task_id, department, task_type, description, due_date,
+               assigned_to, assigned_name)
+        
+    Returns:
+        List of created event task IDs, empty list on error
+    """
+    if not rows:
+        return []
     try:
-        db.cursor.execute("""
-            INSERT INTO tbl_hotel_event_tasks 
-            (event_id, task_id, department, task_type, description, due_date, assigned_to, assigned_name)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        """, (event_id, task_id, department, task_type, description, due_date, assigned_to, assigned_name))
-        result = db.cursor.fetchone()[0]
-        db.connection.commit()
-        return result
+        with db.pooled_cursor() as cur:
+            results = psycopg2.extras.execute_values(cur, """
+                INSERT INTO tbl_hotel_event_tasks 
+                (event_id, task_id, department, task_type, description, due_date, assigned_to, assigned_name)
+                VALUES %s
+                RETURNING id
+            """, rows, fetch=True)
+        return [r[0] for r in results]
     except Exception as e:
         print(f"❌ Error creating event task: {e}")
-        return None
+        return []
 
 
 def accept_event_task(db: DatabaseManager, event_task_id: int, accepted_by: int) -> bool:
     """Mark event task as accepted"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_tasks 
-            SET status = 'accepted', accepted_at = CURRENT_TIMESTAMP, accepted_by = %s
-            WHERE id = %s
-        """, (accepted_by, event_task_id))
-        db.connection.commit()
-        print(f"✅ Event task {event_task_id} accepted by {accepted_by}")
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_tasks 
+                SET status = 'accepted', accepted_at = CURRENT_TIMESTAMP, accepted_by = %s
+                WHERE id = %s
+            """, (accepted_by, event_task_id))
+            print(f"✅ Event task {event_task_id} accepted by {accepted_by}")
+            return True
     except Exception as e:
         print(f"❌ Error accepting event task: {e}")
         return False
@@ -9305,14 +9869,14 @@ def accept_event_task(db: DatabaseManager, event_task_id: int, accepted_by: int)
 def start_event_task(db: DatabaseManager, event_task_id: int) -> bool:
     """Mark event task as in progress"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_tasks 
-            SET status = 'in_progress', started_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (event_task_id,))
-        db.connection.commit()
-        print(f"✅ Event task {event_task_id} started")
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_tasks 
+                SET status = 'in_progress', started_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (event_task_id,))
+            print(f"✅ Event task {event_task_id} started")
+            return True
     except Exception as e:
         print(f"❌ Error starting event task: {e}")
         return False
@@ -9322,15 +9886,15 @@ def complete_event_task(db: DatabaseManager, event_task_id: int, completed_by: i
                         proof_photo: str = None, report_notes: str = None) -> bool:
     """Mark event task as completed with optional proof"""
     try:
-        db.cursor.execute("""
-            UPDATE tbl_hotel_event_tasks 
-            SET status = 'completed', completed_at = CURRENT_TIMESTAMP, completed_by = %s,
-                proof_photo = %s, report_notes = %s
-            WHERE id = %s
-        """, (completed_by, proof_photo, report_notes, event_task_id))
-        db.connection.commit()
-        print(f"✅ Event task {event_task_id} completed by {completed_by}")
-        return True
+        with db.pooled_cursor() as cur:
+            cur.execute("""
+                UPDATE tbl_hotel_event_tasks 
+                SET status = 'completed', completed_at = CURRENT_TIMESTAMP, completed_by = %s,
+                    proof_photo = %s, report_notes = %s
+                WHERE id = %s
+            """, (completed_by, proof_photo, report_notes, event_task_id))
+            print(f"✅ Event task {event_task_id} completed by {completed_by}")
+            return True
     except Exception as e:
         print(f"❌ Error completing event task: {e}")
         return False
@@ -9339,39 +9903,40 @@ def complete_event_task(db: DatabaseManager, event_task_id: int, completed_by: i
 def get_event_task_by_id(db: DatabaseManager, event_task_id: int) -> dict:
     """Get event task details by ID"""
     try:
-        db.cursor.execute("""
-            SELECT id, event_id, task_id, department, task_type, description, due_date,
-                   assigned_to, assigned_name, status, accepted_at, accepted_by,
-                   started_at, completed_at, completed_by, proof_photo, report_notes, 
-                   created_at, confirmed_at, confirmed_by
-            FROM tbl_hotel_event_tasks WHERE id = %s
-        """, (event_task_id,))
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute("""
+                SELECT id, event_id, task_id, department, task_type, description, due_date,
+                       assigned_to, assigned_name, status, accepted_at, accepted_by,
+                       started_at, completed_at, completed_by, proof_photo, report_notes, 
+                       created_at, confirmed_at, confirmed_by
+                FROM tbl_hotel_event_tasks WHERE id = %s
+            """, (event_task_id,))
 
-        result = db.cursor.fetchone()
-        if result:
-            return {
-                'id': result[0],
-                'event_id': result[1],
-                'task_id': result[2],
-                'department': result[3],
-                'task_type': result[4],
-                'description': result[5],
-                'due_date': result[6],
-                'assigned_to': result[7],
-                'assigned_name': result[8],
-                'status': result[9],
-                'accepted_at': result[10],
-                'accepted_by': result[11],
-                'started_at': result[12],
-                'completed_at': result[13],
-                'completed_by': result[14],
-                'proof_photo': result[15],
-                'report_notes': result[16],
-                'created_at': result[17],
-                'confirmed_at': result[18],
-                'confirmed_by': result[19]
-            }
-        return None
+            result = cur.fetchone()
+            if result:
+                return {
+                    'id': result[0],
+                    'event_id': result[1],
+                    'task_id': result[2],
+                    'department': result[3],
+                    'task_type': result[4],
+                    'description': result[5],
+                    'due_date': result[6],
+                    'assigned_to': result[7],
+                    'assigned_name': result[8],
+                    'status': result[9],
+                    'accepted_at': result[10],
+                    'accepted_by': result[11],
+                    'started_at': result[12],
+                    'completed_at': result[13],
+                    'completed_by': result[14],
+                    'proof_photo': result[15],
+                    'report_notes': result[16],
+                    'created_at': result[17],
+                    'confirmed_at': result[18],
+                    'confirmed_by': result[19]
+                }
+            return None
     except Exception as e:
         print(f"❌ Error getting event task: {e}")
         return None
@@ -9380,36 +9945,37 @@ def get_event_task_by_id(db: DatabaseManager, event_task_id: int) -> dict:
 def get_event_task_by_task_id(db: DatabaseManager, task_id: int) -> dict:
     """Get event task by linked task_id"""
     try:
-        db.cursor.execute("""
-            SELECT id, event_id, task_id, department, task_type, description, due_date,
-                   assigned_to, assigned_name, status, accepted_at, accepted_by,
-                   started_at, completed_at, completed_by, proof_photo, report_notes, created_at
-            FROM tbl_hotel_event_tasks WHERE task_id = %s
-        """, (task_id,))
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute("""
+                SELECT id, event_id, task_id, department, task_type, description, due_date,
+                       assigned_to, assigned_name, status, accepted_at, accepted_by,
+                       started_at, completed_at, completed_by, proof_photo, report_notes, created_at
+                FROM tbl_hotel_event_tasks WHERE task_id = %s
+            """, (task_id,))
 
-        result = db.cursor.fetchone()
-        if result:
-            return {
-                'id': result[0],
-                'event_id': result[1],
-                'task_id': result[2],
-                'department': result[3],
-                'task_type': result[4],
-                'description': result[5],
-                'due_date': result[6],
-                'assigned_to': result[7],
-                'assigned_name': result[8],
-                'status': result[9],
-                'accepted_at': result[10],
-                'accepted_by': result[11],
-                'started_at': result[12],
-                'completed_at': result[13],
-                'completed_by': result[14],
-                'proof_photo': result[15],
-                'report_notes': result[16],
-                'created_at': result[17]
-            }
-        return None
+            result = cur.fetchone()
+            if result:
+                return {
+                    'id': result[0],
+                    'event_id': result[1],
+                    'task_id': result[2],
+                    'department': result[3],
+                    'task_type': result[4],
+                    'description': result[5],
+                    'due_date': result[6],
+                    'assigned_to': result[7],
+                    'assigned_name': result[8],
+                    'status': result[9],
+                    'accepted_at': result[10],
+                    'accepted_by': result[11],
+                    'started_at': result[12],
+                    'completed_at': result[13],
+                    'completed_by': result[14],
+                    'proof_photo': result[15],
+                    'report_notes': result[16],
+                    'created_at': result[17]
+                }
+            return None
     except Exception as e:
         print(f"❌ Error getting event task by task_id: {e}")
         return None
@@ -9440,45 +10006,46 @@ def update_event_task_status_from_task(db: DatabaseManager, task_id: int, new_st
 def get_event_tasks(db: DatabaseManager, event_id: int) -> list:
     """Get all tasks for an event with full status info"""
     try:
-        results = db.cursor.execute("""
-            SELECT et.id, et.event_id, et.task_id, et.department, et.task_type, 
-                   et.description, et.due_date, et.assigned_to, et.assigned_name,
-                   et.status, et.accepted_at, et.accepted_by, et.started_at,
-                   et.completed_at, et.completed_by, et.proof_photo, et.report_notes,
-                   et.created_at, t.is_perform, t.task_status
-            FROM tbl_hotel_event_tasks et
-            LEFT JOIN tbl_tasks t ON et.task_id = t.id
-            WHERE et.event_id = %s
-            ORDER BY et.due_date, et.department
-        """, (event_id,))
-        results = db.cursor.fetchall()
-        
-        # Convert to list of dicts for easier use
-        tasks = []
-        for r in results:
-            tasks.append({
-                'id': r[0],
-                'event_id': r[1],
-                'task_id': r[2],
-                'department': r[3],
-                'task_type': r[4],
-                'description': r[5],
-                'due_date': r[6],
-                'assigned_to': r[7],
-                'assigned_name': r[8],
-                'status': r[9],
-                'accepted_at': r[10],
-                'accepted_by': r[11],
-                'started_at': r[12],
-                'completed_at': r[13],
-                'completed_by': r[14],
-                'proof_photo': r[15],
-                'report_notes': r[16],
-                'created_at': r[17],
-                'is_perform': r[18],
-                'task_status': r[19]
-            })
-        return tasks
+        with db.pooled_cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            results = cur.execute("""
+                SELECT et.id, et.event_id, et.task_id, et.department, et.task_type, 
+                       et.description, et.due_date, et.assigned_to, et.assigned_name,
+                       et.status, et.accepted_at, et.accepted_by, et.started_at,
+                       et.completed_at, et.completed_by, et.proof_photo, et.report_notes,
+                       et.created_at, t.is_perform, t.task_status
+                FROM tbl_hotel_event_tasks et
+                LEFT JOIN tbl_tasks t ON et.task_id = t.id
+                WHERE et.event_id = %s
+                ORDER BY et.due_date, et.department
+            """, (event_id,))
+            results = cur.fetchall()
+
+            # Convert to list of dicts for easier use
+            tasks = []
+            for r in results:
+                tasks.append({
+                    'id': r[0],
+                    'event_id': r[1],
+                    'task_id': r[2],
+                    'department': r[3],
+                    'task_type': r[4],
+                    'description': r[5],
+                    'due_date': r[6],
+                    'assigned_to': r[7],
+                    'assigned_name': r[8],
+                    'status': r[9],
+                    'accepted_at': r[10],
+                    'accepted_by': r[11],
+                    'started_at': r[12],
+                    'completed_at': r[13],
+                    'completed_by': r[14],
+                    'proof_photo': r[15],
+                    'report_notes': r[16],
+                    'created_at': r[17],
+                    'is_perform': r[18],
+                    'task_status': r[19]
+                })
+            return tasks
     except Exception as e:
         print(f"❌ Error getting event tasks: {e}")
         return []
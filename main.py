@@ -96,6 +96,10 @@ def main():
     create_accounting_tasks_table(db)
     insert_sample_accounting_data(db)
     
+    # Initialize delivery tasks table (driver task lists rely on its delivery_status type)
+    from database import create_delivery_tasks_table
+    create_delivery_tasks_table(db)
+    
     # Initialize hotel finance tables and sample data
     from database import upgrade_hotel_accounts_table, create_financial_transactions_table, insert_sample_financial_data
     upgrade_hotel_accounts_table(db)